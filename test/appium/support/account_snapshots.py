@@ -0,0 +1,107 @@
+import hashlib
+import importlib
+import inspect
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from support.utilities import locked_json_state
+
+
+def get_persona(name: str):
+    # personas are kept in tests/users.py, which is not a part of the repo
+    return getattr(importlib.import_module('tests.users'), name)
+
+
+@dataclass
+class SnapshotRecipe:
+    """
+    Account state which is exported to snapshot: persona from tests/users.py recovered by passphrase
+    and steps `step(home, **kwargs)` run on its home view before export.
+    """
+    name: str
+    user: str
+    steps: list = field(default_factory=list)
+
+    def get_hash(self):
+        # changes of persona, steps code or their arguments make snapshot stale
+        content = {'user': get_persona(self.user),
+                   'steps': [(inspect.getsource(step), kwargs) for step, kwargs in self.steps]}
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class AccountSnapshots:
+    """
+    Library of unencrypted account DBs (export.db) made by SignInView.export_db from SnapshotRecipe per app build,
+    so test setup restores account with contacts, communities and messages by SignInView.import_db
+    instead of UI flows of the recipe steps. Restore still pays for one account recovery by passphrase
+    (recover_access, logout and login) before the DB is pushed.
+    Manifest keeps recipe hash and DB checksum of every snapshot;
+    snapshot is stale if recipe is changed, DB is missing or modified, or it was made by another build.
+    Folders are relative to views/dbs, as import_db expects. Generated snapshots are not tracked by git
+    and are not archived by CI, and they are keyed by apk name, so every CI build regenerates them
+    (by the first test which restores the snapshot, or by tests/non_func/test_snapshots.py).
+
+    usage:
+
+    snapshots = AccountSnapshots(build=test_suite_data.apk_name)
+    if not snapshots.is_fresh(recipe):
+        snapshots.prepare(recipe.name)
+        sign_in.export_db(seed_phrase, snapshots.get_db_path(recipe.name), prepare=...)
+        snapshots.save(recipe)
+    sign_in.import_db(seed_phrase, snapshots.get_folder(recipe.name))
+    (see SignInView.restore_snapshot)
+
+    """
+    ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'views', 'dbs')
+    FOLDER = 'snapshots'
+    DB_NAME = 'export.db'
+
+    def __init__(self, build: str, root: str = ROOT):
+        self.build = build
+        self.root = root
+        self.manifest_path = os.path.join(root, self.FOLDER, 'manifest.json')
+
+    def get_folder(self, name):
+        return '%s/%s/%s' % (self.FOLDER, self.build, name)
+
+    def get_db_path(self, name):
+        # path relative to views/dbs, as SignInView.export_db expects
+        return '%s/%s' % (self.get_folder(name), self.DB_NAME)
+
+    def get_full_db_path(self, name):
+        return os.path.join(self.root, self.get_db_path(name))
+
+    def load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return dict()
+        with open(self.manifest_path) as manifest_file:
+            return json.load(manifest_file)
+
+    @staticmethod
+    def get_checksum(path):
+        with open(path, 'rb') as db_file:
+            return hashlib.sha256(db_file.read()).hexdigest()
+
+    def is_fresh(self, recipe: SnapshotRecipe):
+        entry = self.load_manifest().get(recipe.name, dict()).get(self.build)
+        db_path = self.get_full_db_path(recipe.name)
+        return bool(entry) and entry['recipe_hash'] == recipe.get_hash() and os.path.exists(db_path) \
+            and entry['checksum'] == self.get_checksum(db_path)
+
+    def prepare(self, name):
+        # export_db doesn't create folders
+        os.makedirs(os.path.dirname(self.get_full_db_path(name)), exist_ok=True)
+
+    def save(self, recipe: SnapshotRecipe):
+        db_path = self.get_full_db_path(recipe.name)
+        if not os.path.exists(db_path):
+            raise FileNotFoundError("Snapshot '%s' is not exported to %s" % (recipe.name, db_path))
+        entry = {'user': recipe.user,
+                 'recipe_hash': recipe.get_hash(),
+                 'checksum': self.get_checksum(db_path),
+                 'created': datetime.now().isoformat(timespec='seconds')}
+        # snapshots may be regenerated by several workers at once
+        with locked_json_state(self.manifest_path) as manifest:
+            manifest.setdefault(recipe.name, dict())[self.build] = entry
@@ -2,17 +2,22 @@ import hmac
 import json
 import os
 import re
+import logging
 from hashlib import md5
 
+from support.geth_log import GethLogWriter
 from support.test_data import SingleTestData
 
 
 class BaseTestReport:
     TEST_REPORT_DIR = "%s/../report" % os.path.dirname(os.path.abspath(__file__))
+    # auxiliary JSON files saved next to tests JSON, e.g. driver metrics per worker
+    STATS_FILE_SUFFIX = '.stats.json'
 
     def __init__(self):
         self.sauce_username = os.environ.get('SAUCE_USERNAME')
         self.sauce_access_key = os.environ.get('SAUCE_ACCESS_KEY')
+        self.geth_sizes = dict()
         self.init_report()
 
     def init_report(self):
@@ -37,6 +42,13 @@ class BaseTestReport:
             geth_paths[log] = geth_path
         return geth_paths
 
+    def save_geth_log(self, log_name, b64_content, max_size=0, compression='gzip'):
+        geth_path, original_size, saved_size = GethLogWriter(max_size, compression).write(
+            b64_content, os.path.join(self.TEST_REPORT_DIR, log_name))
+        self.geth_sizes[geth_path] = {'original': original_size, 'saved': saved_size}
+        logging.info("%s is saved: %s bytes -> %s bytes" % (log_name, original_size, saved_size))
+        return geth_path
+
     def save_test(self, test, geth: dict = None):
         if geth:
             geth_paths = self.save_geth(geth)
@@ -50,6 +62,8 @@ class BaseTestReport:
             'testrail_case_id': test.testrail_case_id,
             'name': test.name,
             'geth_paths': geth_paths,
+            'geth_sizes': {name: self.geth_sizes[path] for name, path in dict(geth_paths).items()
+                           if path in self.geth_sizes},
             'testruns': list(),
             'group_name': test.group_name
         }
@@ -57,9 +71,24 @@ class BaseTestReport:
             test_dict['testruns'].append(testrun.__dict__)
         json.dump(test_dict, open(file_path, 'w'))
 
+    def save_stats(self, name, data):
+        file_path = os.path.join(self.TEST_REPORT_DIR, name + self.STATS_FILE_SUFFIX)
+        with open(file_path, 'w') as stats_file:
+            json.dump(data, stats_file, indent=2)
+        return file_path
+
+    def get_all_stats(self, name_prefix):
+        stats = dict()
+        for file_name in os.listdir(self.TEST_REPORT_DIR):
+            if file_name.startswith(name_prefix) and file_name.endswith(self.STATS_FILE_SUFFIX):
+                with open(os.path.join(self.TEST_REPORT_DIR, file_name)) as stats_file:
+                    stats[file_name[:-len(self.STATS_FILE_SUFFIX)]] = json.load(stats_file)
+        return stats
+
     def get_all_tests(self):
         tests = list()
-        file_list = [f for f in os.listdir(self.TEST_REPORT_DIR) if f.endswith('json')]
+        file_list = [f for f in os.listdir(self.TEST_REPORT_DIR) if
+                     f.endswith('json') and not f.endswith(self.STATS_FILE_SUFFIX)]
         for file_name in file_list:
             file_path = os.path.join(self.TEST_REPORT_DIR, file_name)
             test_data = json.load(open(file_path))
@@ -70,9 +99,11 @@ class BaseTestReport:
                     jobs=testrun_data['jobs'],
                     error=testrun_data['error'],
                     first_commands=testrun_data['first_commands'],
-                    xfail=testrun_data['xfail']))
+                    xfail=testrun_data['xfail'],
+                    step_commands=testrun_data.get('step_commands')))
             tests.append(SingleTestData(name=test_data['name'],
                                         geth_paths=test_data['geth_paths'],
+                                        geth_sizes=test_data.get('geth_sizes'),
                                         testruns=testruns,
                                         testrail_case_id=test_data['testrail_case_id'],
                                         grop_name=test_data['group_name']))
@@ -103,6 +134,15 @@ class BaseTestReport:
             url += "#%s" % first_command
         return url
 
+    def get_step_url(self, test_run, step):
+        # steps from BaseView.just_fyi are stored as '# STEP: <step>' and marked in Sauce log as 'STEP: <step>'
+        if not step.startswith('# STEP: '):
+            return None
+        for job_id, steps in test_run.step_commands.items():
+            if step[len('# STEP: '):] in steps:
+                return self.get_sauce_job_url(job_id, steps[step[len('# STEP: '):]])
+        return None
+
     @staticmethod
     def get_jenkins_link_to_rerun_e2e(branch_name="develop", pr_id="", tr_case_ids=""):
         return 'https://ci.status.im/job/status-mobile/job/e2e/job/status-app-prs-rerun/parambuild/' \
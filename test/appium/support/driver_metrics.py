@@ -0,0 +1,87 @@
+import math
+import threading
+from collections import defaultdict
+
+
+class DriverMetrics:
+    """
+    Collects latency of WebDriver commands per command type and per device number.
+    Session creation is reported as `newSession`, driver quit as `quit`, implicit wait setup as `setTimeouts`;
+    `mobile:` and `sauce:` scripts are reported by script name.
+    Explicit waits are reported per condition with elapsed time versus timeout,
+    round-trips saved by server side waits are reported per test.
+
+    usage:
+
+    driver_metrics.record('findElement', device=1, seconds=0.42, error=False)
+    driver_metrics.summary()['commands']['findElement']
+    output will be: {'count': 1, 'errors': 0, 'total': 0.42, 'p50': 0.42, 'p95': 0.42, 'p99': 0.42}
+
+    """
+
+    def __init__(self):
+        self.durations = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.waits = defaultdict(list)
+        self.saved_round_trips = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def record(self, command, device, seconds, error=False):
+        with self.lock:
+            self.durations[(command, device)].append(seconds)
+            if error:
+                self.errors[(command, device)] += 1
+
+    def record_wait(self, condition, device, seconds, timeout, timed_out=False):
+        with self.lock:
+            self.waits[condition].append((seconds, timeout, timed_out))
+
+    def record_saved_round_trips(self, test_name, round_trips):
+        with self.lock:
+            self.saved_round_trips[test_name or 'unknown'] += round_trips
+
+    @staticmethod
+    def get_percentile(sorted_values, percentile):
+        index = max(math.ceil(percentile / 100 * len(sorted_values)) - 1, 0)
+        return sorted_values[min(index, len(sorted_values) - 1)]
+
+    def get_stats(self, durations, errors):
+        durations = sorted(durations)
+        return {'count': len(durations),
+                'errors': errors,
+                'total': round(sum(durations), 3),
+                'p50': round(self.get_percentile(durations, 50), 3),
+                'p95': round(self.get_percentile(durations, 95), 3),
+                'p99': round(self.get_percentile(durations, 99), 3)}
+
+    def get_wait_stats(self, waits):
+        elapsed = sorted(i[0] for i in waits)
+        return {'count': len(waits),
+                'timeouts': len([i for i in waits if i[2]]),
+                'total': round(sum(elapsed), 3),
+                'total_timeout': round(sum(i[1] for i in waits), 3),
+                'p50': round(self.get_percentile(elapsed, 50), 3),
+                'p95': round(self.get_percentile(elapsed, 95), 3)}
+
+    def summary(self):
+        with self.lock:
+            by_command, by_device = defaultdict(list), defaultdict(lambda: defaultdict(list))
+            errors_by_command, errors_by_device = defaultdict(int), defaultdict(lambda: defaultdict(int))
+            for (command, device), durations in self.durations.items():
+                errors = self.errors.get((command, device), 0)
+                device = str(device) if device else 'unknown'
+                by_command[command].extend(durations)
+                by_device[device][command].extend(durations)
+                errors_by_command[command] += errors
+                errors_by_device[device][command] += errors
+            waits = {condition: list(waits) for condition, waits in self.waits.items()}
+            saved_round_trips = dict(self.saved_round_trips)
+        return {
+            'commands': {command: self.get_stats(durations, errors_by_command[command])
+                         for command, durations in by_command.items()},
+            'devices': {device: {command: self.get_stats(durations, errors_by_device[device][command])
+                                 for command, durations in commands.items()}
+                        for device, commands in by_device.items()},
+            'waits': {condition: self.get_wait_stats(waits) for condition, waits in waits.items()},
+            'saved_round_trips': saved_round_trips
+        }
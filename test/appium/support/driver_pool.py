@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import MaxRetryError
+
+
+class DriverPool:
+    """
+    Provisions driver sessions concurrently and keeps warm spare sessions to be handed out first
+    next time sessions are needed (e.g. to replace sessions that died in prepare_devices or for the next group
+    of tests run by the same worker).
+    Spares are not used by anyone while they wait, so Sauce closes them after its idle timeout:
+    spares idle for more than `max_idle` seconds are quit instead of being handed out.
+    With `admission` new sessions are created when run-wide session slots are granted (or admission times out),
+    only sessions with granted slot are marked `admitted`; slots of sessions which are not created are returned
+    at once, others are returned by Driver.quit.
+
+    usage:
+
+    pool = DriverPool(spares=1)
+    drivers = loop.run_until_complete(pool.acquire(2, functools.partial(Driver, **kwargs), name='TestGroup'))
+    output will be: {0: <Driver>, 1: <Driver>}, one more session is kept in pool.spares
+
+    """
+
+    # a bit less than idleTimeout of Sauce sessions
+    MAX_IDLE = 900
+
+    def __init__(self, spares: int = 0, retries: int = 3, backoff: int = 10, admission=None,
+                 max_idle: float = MAX_IDLE):
+        self.spares_number = spares
+        self.max_idle = max_idle
+        self.admission = admission
+        self.retries = retries
+        self.backoff = backoff
+        # (driver, time when it became idle)
+        self.spares = list()
+        self.latencies = list()
+
+    async def create_driver(self, factory, name):
+        loop = asyncio.get_event_loop()
+        for attempt in range(self.retries):
+            start_time = time.time()
+            try:
+                driver = await loop.run_in_executor(None, factory)
+            except MaxRetryError:
+                print("MaxRetryError when creating a driver for %s" % name)
+                if attempt == self.retries - 1:
+                    raise
+                # other sessions keep being created while this one is backing off
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+                continue
+            latency = {'session_id': driver.session_id, 'name': name, 'attempts': attempt + 1,
+                       'seconds': round(time.time() - start_time, 1)}
+            self.latencies.append(latency)
+            print("Session %s for %s is created in %ss (attempt %s)" % (
+                latency['session_id'], name, latency['seconds'], latency['attempts']))
+            return driver
+
+    @staticmethod
+    def is_alive(driver):
+        try:
+            return bool(driver.session_id and driver.current_package)
+        except (WebDriverException, MaxRetryError):
+            return False
+
+    @staticmethod
+    def quit(driver):
+        try:
+            driver.quit()
+        except (WebDriverException, MaxRetryError):
+            pass
+
+    async def acquire(self, quantity: int, factory, name: str = ''):
+        loop = asyncio.get_event_loop()
+        drivers = list()
+        while self.spares and len(drivers) < quantity:
+            driver, idle_since = self.spares.pop(0)
+            if time.time() - idle_since < self.max_idle and await loop.run_in_executor(None, self.is_alive, driver):
+                drivers.append(driver)
+            else:
+                await loop.run_in_executor(None, self.quit, driver)
+        missing = quantity - len(drivers) + max(self.spares_number - len(self.spares), 0)
+        granted = 0
+        if self.admission and missing:
+            granted = await loop.run_in_executor(None, self.admission.acquire, missing, name)
+        created = await asyncio.gather(*[self.create_driver(factory, name) for _ in range(missing)],
+                                       return_exceptions=True)
+        errors = [i for i in created if isinstance(i, Exception)]
+        created = [i for i in created if not isinstance(i, Exception)]
+        # slots may be granted for a part of sessions (or none after admission timeout)
+        for driver in created[:granted]:
+            driver.admitted = True
+        if self.admission:
+            self.admission.release(granted - min(granted, len(created)))
+        while created and len(drivers) < quantity:
+            drivers.append(created.pop(0))
+        self.add_spares(created)
+        if errors and len(drivers) < quantity:
+            print("%s of %s sessions for %s are not created: %s" % (len(errors), quantity, name, errors[0]))
+        return {i: driver for i, driver in enumerate(drivers)}
+
+    def add_spares(self, drivers, first=False):
+        spares = [(driver, time.time()) for driver in drivers]
+        self.spares = spares + self.spares if first else self.spares + spares
+
+    def release_spares(self):
+        while self.spares:
+            self.quit(self.spares.pop(0)[0])
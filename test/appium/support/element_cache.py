@@ -0,0 +1,44 @@
+import time
+
+
+class ElementCache:
+    """
+    Found WebElement references of one session keyed by (by, locator), so consecutive actions on the same element
+    (e.g. get coordinates, then swipe) cost one lookup. Driver clears the cache on every command which may change UI
+    (see PageSnapshot.is_read_only); references older than `max_age` seconds are not reused either,
+    as UI may change without commands (incoming messages, animations). `max_age=0` disables the cache.
+
+    usage:
+
+    cache = ElementCache(max_age=2)
+    cache.put('xpath', '//*[@text="Web3"]', element)
+    cache.get('xpath', '//*[@text="Web3"]')
+    output will be: element
+
+    """
+
+    def __init__(self, max_age: float = 2):
+        self.max_age = max_age
+        self.elements = dict()
+
+    def get(self, by, locator):
+        try:
+            element, found_at = self.elements[(by, locator)]
+        except KeyError:
+            return None
+        if time.monotonic() - found_at > self.max_age:
+            del self.elements[(by, locator)]
+            return None
+        return element
+
+    def put(self, by, locator, element):
+        if self.max_age and element is not None:
+            self.elements[(by, locator)] = (element, time.monotonic())
+        return element
+
+    def discard(self, by, locator):
+        # returns True if reference was cached, i.e. lookup is worth retrying after StaleElementReferenceException
+        return self.elements.pop((by, locator), None) is not None
+
+    def clear(self):
+        self.elements.clear()
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class ElementProfiler:
+    """
+    Opt-in (--profile_elements) wall time profiler of BaseElement actions
+    aggregated per element class name, locator strategy and action.
+    Nested calls of the same action on the same element (e.g. overridden `click` calling `super().click()`)
+    are measured once.
+
+    usage:
+
+    with element_profiler.measure(element, 'find_element'):
+        ...
+    element_profiler.get_hot_spots(element_profiler.dump())
+    output will be: ['ChatElement.find_element by xpath: 4,200 calls, 38.2 min total', ...]
+
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.calls = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.durations = defaultdict(float)
+        self.lock = threading.Lock()
+        self._active = threading.local()
+
+    @contextmanager
+    def measure(self, element, action):
+        active = self._active.__dict__.setdefault('measured', set())
+        marker = (id(element), action)
+        if not self.enabled or marker in active:
+            yield
+            return
+        active.add(marker)
+        key = (type(element).__name__, element.by, action)
+        start_time = time.time()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            active.discard(marker)
+            self.record(*key, time.time() - start_time, error)
+
+    def record(self, element_name, by, action, seconds, error=False):
+        key = (element_name, by, action)
+        with self.lock:
+            self.calls[key] += 1
+            self.durations[key] += seconds
+            if error:
+                self.errors[key] += 1
+
+    def dump(self):
+        with self.lock:
+            return [{'element': element, 'by': by, 'action': action, 'calls': self.calls[(element, by, action)],
+                     'errors': self.errors[(element, by, action)],
+                     'total': round(self.durations[(element, by, action)], 3)}
+                    for element, by, action in self.calls]
+
+    @staticmethod
+    def merge(dumps):
+        merged = dict()
+        for dump in dumps:
+            for row in dump:
+                key = (row['element'], row['by'], row['action'])
+                if key not in merged:
+                    merged[key] = dict(row)
+                else:
+                    for field in ('calls', 'errors', 'total'):
+                        merged[key][field] += row[field]
+        return sorted(merged.values(), key=lambda row: row['total'], reverse=True)
+
+    @staticmethod
+    def get_hot_spots(rows, limit=30):
+        hot_spots = list()
+        for row in rows[:limit]:
+            line = '%s.%s by %s: %s calls, %s min total' % (
+                row['element'], row['action'], row['by'], '{:,}'.format(row['calls']), round(row['total'] / 60, 1))
+            if row['errors']:
+                line += ', %s errors' % '{:,}'.format(row['errors'])
+            hot_spots.append(line)
+        return hot_spots
@@ -0,0 +1,73 @@
+from selenium.webdriver.common.actions import interaction
+from selenium.webdriver.common.actions.action_builder import ActionBuilder
+from selenium.webdriver.common.actions.key_input import KeyInput
+from selenium.webdriver.common.actions.pointer_input import PointerInput
+from selenium.webdriver.common.keys import Keys
+
+
+class Gestures:
+    """
+    Multi-step gestures compiled into a single W3C Actions request (or `mobile: longClickGesture`)
+    instead of a TouchAction/press_keycode command per step with sleeps in between;
+    pauses between steps are performed by the device. Durations are in seconds.
+
+    usage:
+
+    Gestures(driver).long_press(x, y).pause(2).tap(x + 25, y - 50).perform()
+    Gestures(driver).press_key(Keys.BACKSPACE, times=20).perform()
+    Gestures(driver).type_text('and more').perform()
+
+    """
+    # same as TouchAction defaults
+    LONG_PRESS_DURATION = 1
+    TAP_DURATION = 0.15
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.actions = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, 'finger'),
+                                     keyboard=KeyInput('keyboard'), duration=0)
+
+    def tap(self, x, y, times: int = 1, duration: float = TAP_DURATION, interval: float = 0.2):
+        pointer = self.actions.pointer_action.move_to_location(x, y)
+        for i in range(times):
+            if i:
+                pointer.pause(interval)
+            pointer.pointer_down().pause(duration).release()
+        return self
+
+    def long_press(self, x, y, duration: float = LONG_PRESS_DURATION):
+        return self.tap(x, y, duration=duration)
+
+    def pause(self, seconds: float):
+        self.actions.pointer_action.pause(seconds)
+        return self
+
+    def press_key(self, key: str = Keys.BACKSPACE, times: int = 1, interval: float = 0.05):
+        keyboard = self.actions.key_action
+        for i in range(times):
+            if i:
+                keyboard.pause(interval)
+            keyboard.key_down(key).key_up(key)
+        return self
+
+    def type_text(self, text: str, interval: float = 0):
+        # one keyDown/keyUp pair per code point, the device maps characters to key events
+        keyboard = self.actions.key_action
+        for i, character in enumerate(text):
+            if i and interval:
+                keyboard.pause(interval)
+            keyboard.key_down(character).key_up(character)
+        return self
+
+    def perform(self):
+        self.actions.perform()
+
+    @staticmethod
+    def long_click(driver, element=None, x=None, y=None, duration: float = LONG_PRESS_DURATION):
+        # long press on element center (or on coordinates) without requesting element rect first
+        params = {'duration': int(duration * 1000)}
+        if element is not None:
+            params['elementId'] = element.id
+        else:
+            params.update({'x': int(x), 'y': int(y)})
+        driver.execute_script('mobile: longClickGesture', params)
@@ -0,0 +1,51 @@
+import base64
+import gzip
+import os
+
+
+class GethLogWriter:
+    """
+    Writes base64-encoded geth.log pulled from device into report dir without decoding it as a whole:
+    content is decoded in chunks, optionally limited to the tail window of `max_size` bytes
+    and streamed into gzip file.
+
+    usage:
+
+    writer = GethLogWriter(max_size=50 * 1024 * 1024, compression='gzip')
+    path, original_size, saved_size = writer.write(driver.pull_file(geth_path), '/path/to/report/test_geth.log')
+    output will be: ('/path/to/report/test_geth.log.gz', 120586240, 7864320)
+
+    """
+    # amount of base64 chars decoded at once, must be multiple of 4
+    CHUNK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, max_size: int = 0, compression: str = 'gzip'):
+        self.max_size = max_size
+        self.compression = compression
+
+    @staticmethod
+    def get_decoded_size(b64_content: str):
+        padding = len(b64_content[-2:]) - len(b64_content[-2:].rstrip('='))
+        return len(b64_content) // 4 * 3 - padding
+
+    def get_start_offset(self, b64_content: str):
+        decoded_size = self.get_decoded_size(b64_content)
+        if not self.max_size or decoded_size <= self.max_size:
+            return 0
+        # every 4 base64 chars are decoded to 3 bytes, so the window starts on the 4 chars boundary
+        return (decoded_size - self.max_size) // 3 * 4
+
+    def open(self, path):
+        if self.compression == 'gzip':
+            return gzip.open(path + '.gz', 'wb'), path + '.gz'
+        return open(path, 'wb'), path
+
+    def write(self, b64_content, path):
+        if isinstance(b64_content, bytes):
+            b64_content = b64_content.decode('ascii')
+        original_size = self.get_decoded_size(b64_content)
+        log_file, log_path = self.open(path)
+        with log_file:
+            for offset in range(self.get_start_offset(b64_content), len(b64_content), self.CHUNK_SIZE):
+                log_file.write(base64.b64decode(b64_content[offset:offset + self.CHUNK_SIZE]))
+        return log_path, original_size, os.path.getsize(log_path)
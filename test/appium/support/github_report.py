@@ -9,6 +9,7 @@ class GithubHtmlReport(BaseTestReport):
 
     def __init__(self):
         super(GithubHtmlReport, self).__init__()
+        self.testrail_report = None
 
     def list_of_failed_testrail_ids(self, tests_data):
         ids_failed_test = []
@@ -17,10 +18,12 @@ class GithubHtmlReport(BaseTestReport):
                 ids_failed_test.append(test.testrail_case_id)
         return ','.join(map(str, ids_failed_test))
 
-    def build_html_report(self, run_id):
+    def build_html_report(self, run_id, testrail_report=None):
         tests = self.get_all_tests()
         passed, failed, xfailed = self.get_tests_by_status()
-        not_executed_tests = TestrailReport().get_not_executed_tests(run_id)
+        # one TestRail client for the whole report: results of the run are fetched once and served from memory
+        self.testrail_report = testrail_report if testrail_report else TestrailReport()
+        not_executed_tests = self.testrail_report.get_not_executed_tests(run_id)
 
         if len(tests) > 0:
             title_html = "## %.0f%% of end-end tests have passed\n" % (len(passed) / len(tests) * 100)
@@ -114,7 +117,7 @@ class GithubHtmlReport(BaseTestReport):
         return html
 
     def build_test_row_html(self, index, test, run_id):
-        test_rail_link = TestrailReport().get_test_result_link(run_id, test.testrail_case_id)
+        test_rail_link = self.testrail_report.get_test_result_link(run_id, test.testrail_case_id)
         if test_rail_link:
             html = "<tr><td><b>%s. <a href=\"%s\">%s</a>, id: %s </b></td></tr>" % (
                 index + 1, test_rail_link, test.name, test.testrail_case_id)
@@ -124,7 +127,11 @@ class GithubHtmlReport(BaseTestReport):
         test_steps_html = list()
         last_testrun = test.testruns[-1]
         for step in last_testrun.steps:
-            test_steps_html.append("<div>%s</div>" % step)
+            step_url = self.get_step_url(last_testrun, step)
+            if step_url:
+                test_steps_html.append("<div><a href=\"%s\">%s</a></div>" % (step_url, step))
+            else:
+                test_steps_html.append("<div>%s</div>" % step)
         if last_testrun.error:
             error = last_testrun.error
             if test_steps_html:
@@ -0,0 +1,149 @@
+import heapq
+import json
+import os
+from collections import OrderedDict, deque
+
+from xdist.scheduler import LoadGroupScheduling
+
+
+def split_group(nodeid):
+    # loadgroup mode adds '@<xdist_group name>' to node ids of grouped tests
+    if nodeid.rfind('@') > nodeid.rfind(']'):
+        return nodeid.rsplit('@', 1)
+    return nodeid, None
+
+
+class GroupDurations:
+    """
+    Durations of tests (setup + call + teardown) and Sauce sessions number of xdist groups from previous runs,
+    stored in JSON file which is kept between runs (report dir is cleaned on start; CI keeps it as build artifact,
+    see --group_durations). New measurements
+    are exponentially smoothed with stored ones. Group is estimated as sum of its tests,
+    tests without history are estimated as mean duration of known tests.
+
+    usage:
+
+    durations = GroupDurations('group_durations.json')
+    nodeid = 'tests/test_a.py::TestA::test_one@group_a'
+    durations.update({nodeid: 310.2}, {nodeid: 2})
+    durations.save()
+    durations.estimate(['tests/test_a.py::TestA::test_one@group_a', 'tests/test_a.py::TestA::test_two@group_a'])
+    output will be: 620.4
+
+    """
+    SMOOTHING = 0.5
+    DEFAULT_TEST_DURATION = 120
+
+    def __init__(self, path):
+        self.path = path
+        self.tests = dict()
+        self.sessions = dict()
+        if os.path.exists(path):
+            with open(path) as durations_file:
+                data = json.load(durations_file)
+            self.tests = data.get('tests', dict())
+            self.sessions = data.get('sessions', dict())
+
+    @property
+    def default_test_duration(self):
+        if self.tests:
+            return sum(self.tests.values()) / len(self.tests)
+        return self.DEFAULT_TEST_DURATION
+
+    def estimate_tests(self, nodeids):
+        default = self.default_test_duration
+        return [self.tests.get(split_group(nodeid)[0], default) for nodeid in nodeids]
+
+    def estimate(self, nodeids):
+        return sum(self.estimate_tests(nodeids))
+
+    def get_sessions(self, group):
+        return self.sessions.get(group, 1)
+
+    def update(self, test_durations: dict, test_sessions: dict = None):
+        # test_durations: node id -> seconds; test_sessions: node id -> number of sessions used by test
+        test_sessions = test_sessions if test_sessions else dict()
+        for nodeid, duration in test_durations.items():
+            test_id, group = split_group(nodeid)
+            previous = self.tests.get(test_id)
+            self.tests[test_id] = round(
+                duration if previous is None else self.SMOOTHING * duration + (1 - self.SMOOTHING) * previous, 1)
+            sessions = test_sessions.get(nodeid)
+            if group and sessions:
+                self.sessions[group] = max(sessions, self.sessions.get(group, 1))
+
+    def save(self):
+        with open(self.path, 'w') as durations_file:
+            json.dump({'tests': self.tests, 'sessions': self.sessions}, durations_file, indent=2, sort_keys=True)
+
+    @staticmethod
+    def get_makespan(work_units, workers):
+        # replays xdist loadscope hand-out of units (lists of test estimates) in given order: every node gets
+        # a unit at start and one more whenever it has 2 or less pending tests (so usually 2 units at start)
+        queue = deque(work_units)
+        nodes = [deque() for _ in range(min(max(workers, 1), len(queue)))]
+        for node in nodes:
+            node.extend(queue.popleft())
+        for node in nodes:
+            if queue and len(node) <= 2:
+                node.extend(queue.popleft())
+        running = [(node[0], i) for i, node in enumerate(nodes) if node]
+        heapq.heapify(running)
+        makespan = 0
+        while running:
+            finish_time, i = heapq.heappop(running)
+            makespan = finish_time
+            nodes[i].popleft()
+            if queue and len(nodes[i]) <= 2:
+                nodes[i].extend(queue.popleft())
+            if nodes[i]:
+                heapq.heappush(running, (finish_time + nodes[i][0], i))
+        return makespan
+
+
+class DurationAwareScheduling(LoadGroupScheduling):
+    """
+    loadgroup scheduling where work units (xdist groups and ungrouped tests) are handed to free workers
+    longest-processing-time-first by estimated duration, so long groups are not left for the end of the run
+    while other workers are idle. With `max_sessions` (see --max_sessions) worker gets the longest unit
+    whose Sauce sessions fit into sessions left by units running on other workers, so it doesn't wait
+    for session admission while a smaller unit could run; the longest unit is taken if none fits.
+    """
+
+    def __init__(self, config, log=None, durations: GroupDurations = None, max_sessions: int = 0):
+        super().__init__(config, log)
+        self.durations = durations
+        self.max_sessions = max_sessions
+        self.is_workqueue_sorted = False
+
+    def get_running_sessions(self):
+        # node runs its units in order of assignment, so only its first unfinished unit holds sessions
+        sessions = 0
+        for workload in self.assigned_work.values():
+            scope = next((scope for scope, work_unit in workload.items() if not all(work_unit.values())), None)
+            if scope is not None:
+                sessions += self.durations.get_sessions(scope)
+        return sessions
+
+    def _assign_work_unit(self, node):
+        if not self.is_workqueue_sorted:
+            self.sort_workqueue()
+        if self.max_sessions:
+            free_sessions = self.max_sessions - self.get_running_sessions()
+            scope = next((scope for scope in self.workqueue if self.durations.get_sessions(scope) <= free_sessions),
+                         None)
+            if scope is not None:
+                self.workqueue.move_to_end(scope, last=False)
+        super()._assign_work_unit(node)
+
+    def sort_workqueue(self):
+        self.is_workqueue_sorted = True
+        tests = {scope: self.durations.estimate_tests(work_unit) for scope, work_unit in self.workqueue.items()}
+        order = sorted(self.workqueue,
+                       key=lambda scope: (sum(tests[scope]), self.durations.get_sessions(scope)), reverse=True)
+        self.workqueue = OrderedDict((scope, self.workqueue[scope]) for scope in order)
+        workers = len(self.nodes)
+        total = sum(sum(i) for i in tests.values())
+        print("\nScheduling %s work units on %s workers longest first: estimated makespan %s min, total/%s %s min" % (
+            len(order), workers, round(self.durations.get_makespan([tests[i] for i in order], workers) / 60, 1),
+            workers, round(total / max(workers, 1) / 60, 1)))
@@ -0,0 +1,69 @@
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class PooledSession(requests.Session):
+    """
+    Keep-alive session with a bounded connection pool, retries of GET requests with exponential backoff
+    for transient server errors and per-call latency counters. POST requests are not retried:
+    TestRail may have applied the request before gateway error, so retry would add results twice.
+
+    usage:
+
+    session = PooledSession(pool_size=10, retries=3, backoff_factor=0.5)
+    session.get('https://ethstatus.testrail.net/index.php?/api/v2/get_run/1')
+    session.latency_summary()
+    output will be: {'get_run': {'calls': 1, 'errors': 0, 'total': 0.31, 'max': 0.31}}
+
+    """
+    RETRY_STATUSES = (429, 502, 503, 504)
+
+    def __init__(self, pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.5):
+        super(PooledSession, self).__init__()
+        retry = Retry(total=retries,
+                      backoff_factor=backoff_factor,
+                      status_forcelist=self.RETRY_STATUSES,
+                      allowed_methods=frozenset(['GET']),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.pool_size = pool_size
+        self.latency = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    @staticmethod
+    def get_endpoint(url):
+        # TestRail-like urls keep API method in query: '...index.php?/api/v2/get_results_for_case/1/2'
+        parts = urlsplit(url)
+        path = parts.query if parts.query.startswith('/') else parts.path
+        segments = [i for i in path.split('&')[0].split('/') if i and not i.isdigit()]
+        return segments[-1] if segments else parts.netloc
+
+    def request(self, method, url, *args, **kwargs):
+        endpoint = self.get_endpoint(url)
+        start_time = time.time()
+        try:
+            response = super(PooledSession, self).request(method, url, *args, **kwargs)
+            if not response.ok:
+                self.errors[endpoint] += 1
+            return response
+        except requests.RequestException:
+            self.errors[endpoint] += 1
+            raise
+        finally:
+            self.latency[endpoint].append(time.time() - start_time)
+
+    def latency_summary(self):
+        summary = dict()
+        for endpoint, durations in self.latency.items():
+            summary[endpoint] = {'calls': len(durations),
+                                 'errors': self.errors[endpoint],
+                                 'total': round(sum(durations), 3),
+                                 'max': round(max(durations), 3)}
+        return summary
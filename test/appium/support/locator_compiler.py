@@ -0,0 +1,45 @@
+from appium.webdriver.common.mobileby import MobileBy
+
+
+class LocatorCompiler:
+    """
+    Compiles full-tree `//*[@text="..."]` XPath locators of translation_id elements
+    into indexed `-android uiautomator` UiSelector lookups when semantics allow:
+    - exact text -> UiSelector().text("...")
+    - text or its uppercase version (`uppercase=True`) -> UiSelector().textMatches("\\Q...\\E|\\Q...\\E")
+    Locators with prefix/suffix (relative XPath) and webview union locators stay XPath.
+
+    usage:
+
+    LocatorCompiler.get_text_selector('Allow', uppercase=True)
+    output will be: 'new UiSelector().textMatches("\\\\QAllow\\\\E|\\\\QALLOW\\\\E")'
+
+    """
+    XPATH = 'xpath'
+    UIAUTOMATOR = 'uiautomator'
+    STRATEGIES = (XPATH, UIAUTOMATOR)
+
+    @staticmethod
+    def quote_regex(text: str):
+        # Java regex literal quotation, "\E" inside of text is closed and re-opened around escaped "\E"
+        return '\\Q' + text.replace('\\E', '\\E\\\\E\\Q') + '\\E'
+
+    @staticmethod
+    def quote_string(value: str):
+        return '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"')
+
+    @classmethod
+    def get_text_selector(cls, text: str, uppercase=False):
+        if uppercase and text != text.upper():
+            pattern = '%s|%s' % (cls.quote_regex(text), cls.quote_regex(text.upper()))
+            return 'new UiSelector().textMatches(%s)' % cls.quote_string(pattern)
+        return 'new UiSelector().text(%s)' % cls.quote_string(text)
+
+    @classmethod
+    def compile(cls, strategy: str, by: str, locator: str, text_selector: str = None):
+        if strategy not in cls.STRATEGIES:
+            raise ValueError("Unknown locator strategy '%s', expected one of: %s" % (
+                strategy, ', '.join(cls.STRATEGIES)))
+        if strategy == cls.UIAUTOMATOR and text_selector:
+            return MobileBy.ANDROID_UIAUTOMATOR, text_selector
+        return by, locator
@@ -0,0 +1,62 @@
+import time
+
+from appium.webdriver.common.mobileby import MobileBy
+from lxml import etree
+
+
+class PageSnapshot:
+    """
+    Parsed page source used to check many elements locally instead of a polling round-trip per element.
+    XPath, accessibility id, id and class name locators are evaluated against the tree;
+    for other strategies (e.g. UiSelector) `is_element_displayed` returns None, so the caller polls the device.
+
+    usage:
+
+    snapshot = PageSnapshot(driver.page_source)
+    snapshot.is_element_displayed('xpath', '//*[@text="Web3"]')
+    output will be: True
+
+    """
+    # commands which don't change UI, all other commands invalidate the snapshot
+    READ_ONLY_COMMANDS = frozenset([
+        'getPageSource', 'findElement', 'findElements', 'findChildElement', 'findChildElements',
+        'getElementText', 'getElementAttribute', 'getElementProperty', 'getElementRect', 'getElementTagName',
+        'getElementLocation', 'getElementSize', 'isElementDisplayed', 'isElementEnabled', 'isElementSelected',
+        'screenshot', 'elementScreenshot', 'getWindowRect', 'getWindowSize', 'getCurrentPackage',
+        'getCurrentActivity', 'setTimeouts', 'getTimeouts', 'getSettings', 'getLog', 'getAvailableLogTypes'])
+    READ_ONLY_SCRIPTS = ('sauce:',)
+
+    def __init__(self, page_source: str):
+        self.tree = etree.fromstring(page_source.encode('utf-8'))
+        self.created_at = time.time()
+
+    @classmethod
+    def is_read_only(cls, driver_command, params=None):
+        if driver_command in cls.READ_ONLY_COMMANDS:
+            return True
+        return bool(params) and str(params.get('script', '')).startswith(cls.READ_ONLY_SCRIPTS)
+
+    @property
+    def age(self):
+        return time.time() - self.created_at
+
+    def find_nodes(self, by, locator):
+        if by == MobileBy.XPATH:
+            try:
+                return [i for i in self.tree.xpath(locator) if isinstance(i, etree._Element)]
+            except etree.XPathError:
+                return None
+        elif by == MobileBy.ACCESSIBILITY_ID:
+            return [i for i in self.tree.iter() if i.get('content-desc') == locator]
+        elif by == MobileBy.ID:
+            return [i for i in self.tree.iter() if i.get('resource-id') == locator or
+                    str(i.get('resource-id')).endswith(':id/' + locator)]
+        elif by == MobileBy.CLASS_NAME:
+            return list(self.tree.iter(locator))
+        return None
+
+    def is_element_displayed(self, by, locator):
+        nodes = self.find_nodes(by, locator)
+        if nodes is None:
+            return None
+        return any(node.get('displayed', 'true') == 'true' for node in nodes)
@@ -0,0 +1,87 @@
+import json
+
+
+class SauceCommandLog:
+    """
+    Index of Sauce Labs job commands log (log.json) built in a single pass.
+    Commands are numbered from 1, the same way as anchors in Sauce job url: https://<apibase>/jobs/<job_id>#<index>
+
+    Indexes markers set by `sauce:context=`:
+    - "Started <test name>" from setup_method of shared device test cases
+    - "STEP: <step>" from BaseView.just_fyi, assigned to the last started test
+
+    usage:
+
+    command_log = SauceCommandLog.from_response(requests_session.get(log_json_url, stream=True))
+    command_log.get_test_start('test_community_navigate_to_channel_when_relaunch')
+    output will be: 1532
+    command_log.get_step('test_community_navigate_to_channel_when_relaunch', 'Relaunch app')
+    output will be: 1580
+
+    """
+    TEST_MARKER = 'Started '
+    STEP_MARKER = 'STEP: '
+
+    def __init__(self):
+        self.test_starts = dict()
+        self.steps = dict()
+        self.commands_count = 0
+        self._current_test = None
+
+    def add(self, index, command):
+        self.commands_count = index
+        try:
+            message = command['message']
+        except (KeyError, TypeError):
+            return
+        if not isinstance(message, str):
+            return
+        if message.startswith(self.TEST_MARKER):
+            self._current_test = message[len(self.TEST_MARKER):]
+            self.test_starts[self._current_test] = index
+        elif message.startswith(self.STEP_MARKER):
+            self.steps.setdefault(self._current_test, dict()).setdefault(message[len(self.STEP_MARKER):], index)
+
+    @staticmethod
+    def iter_commands(chunks):
+        # log.json is a list of commands, objects are decoded one by one as soon as they are received
+        decoder = json.JSONDecoder()
+        buffer = str()
+        for chunk in chunks:
+            buffer += chunk
+            position = 0
+            while True:
+                while position < len(buffer) and buffer[position] in ' \t\r\n,[':
+                    position += 1
+                if position >= len(buffer) or buffer[position] == ']':
+                    break
+                try:
+                    command, position_after = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    # command is not received completely yet
+                    break
+                position = position_after
+                yield command
+            buffer = buffer[position:]
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        command_log = cls()
+        for index, command in enumerate(cls.iter_commands(chunks)):
+            command_log.add(index + 1, command)
+        return command_log
+
+    @classmethod
+    def from_response(cls, response, chunk_size=64 * 1024):
+        if not response.encoding:
+            response.encoding = 'utf-8'
+        return cls.from_chunks(response.iter_content(chunk_size=chunk_size, decode_unicode=True))
+
+    def get_test_start(self, test_name):
+        return self.test_starts.get(test_name)
+
+    def get_steps(self, test_name):
+        return dict(self.steps.get(test_name, dict()))
+
+    def get_step(self, test_name, step):
+        return self.steps.get(test_name, dict()).get(step)
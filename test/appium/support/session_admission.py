@@ -0,0 +1,111 @@
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+
+from support.utilities import locked_json_state
+
+
+class SessionAdmission:
+    """
+    Session slots shared by all xdist workers of a run, so they don't request more Sauce sessions than
+    `max_sessions` at once (otherwise sessions are queued by Sauce until MaxRetryError).
+    State (slots held per worker process and FIFO queue of requests) is kept in JSON file guarded by flock;
+    slots and requests of dead processes are dropped. Group requests all its sessions with one ticket,
+    so it never holds a part of slots while waiting for the rest, and requests are granted in order of arrival.
+    Request is capped by `max_sessions`; `acquire` returns number of granted slots, 0 if admission is disabled
+    or timed out, and only granted slots are to be released.
+    `max_sessions=0` disables admission control.
+
+    usage:
+
+    granted = session_admission.acquire(3, name='TestGroupChat')
+    ...
+    session_admission.release(1)  # after quit of every session with granted slot
+
+    """
+
+    def __init__(self, max_sessions: int = 0, path: str = None, poll: float = 2, timeout: float = 1800):
+        self.max_sessions = max_sessions
+        self.path = path
+        self.poll = poll
+        self.timeout = timeout
+        self.waits = list()
+
+    @property
+    def enabled(self):
+        return bool(self.max_sessions and self.path)
+
+    def state(self):
+        return locked_json_state(self.path, default={'holders': dict(), 'queue': list()})
+
+    @staticmethod
+    def is_process_alive(pid):
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def purge(self, state):
+        state['holders'] = {pid: slots for pid, slots in state['holders'].items() if self.is_process_alive(pid)}
+        state['queue'] = [request for request in state['queue'] if self.is_process_alive(request['pid'])]
+
+    def acquire(self, quantity: int, name: str = ''):
+        if not self.enabled or quantity <= 0:
+            return 0
+        # request for more than max sessions would never be granted
+        quantity = min(quantity, self.max_sessions)
+        ticket, pid = uuid.uuid4().hex, str(os.getpid())
+        with self.state() as state:
+            state['queue'].append({'ticket': ticket, 'pid': pid, 'name': name, 'quantity': quantity})
+        start_time = time.time()
+        granted = None
+        while granted is None:
+            with self.state() as state:
+                self.purge(state)
+                used = sum(state['holders'].values())
+                if state['queue'][0]['ticket'] == ticket and used + quantity <= self.max_sessions:
+                    state['queue'].pop(0)
+                    state['holders'][pid] = state['holders'].get(pid, 0) + quantity
+                    granted = True
+                elif time.time() - start_time > self.timeout:
+                    state['queue'] = [request for request in state['queue'] if request['ticket'] != ticket]
+                    granted = False
+            if granted is None:
+                time.sleep(self.poll)
+        waited = round(time.time() - start_time, 1)
+        self.waits.append({'name': name, 'quantity': quantity, 'seconds': waited, 'granted': granted})
+        if not granted:
+            logging.warning("%s sessions for %s are not admitted in %ss, creating them anyway" % (
+                quantity, name, waited))
+            return 0
+        if waited > self.poll:
+            logging.info("%s sessions for %s are admitted after %ss" % (quantity, name, waited))
+        return quantity
+
+    def release(self, quantity: int = 1):
+        if not self.enabled or quantity <= 0:
+            return
+        pid = str(os.getpid())
+        with self.state() as state:
+            slots = state['holders'].get(pid, 0) - quantity
+            if slots > 0:
+                state['holders'][pid] = slots
+            else:
+                state['holders'].pop(pid, None)
+
+    @staticmethod
+    def get_summary(waits):
+        summary = defaultdict(float)
+        for wait in waits:
+            summary['requests'] += 1
+            summary['sessions'] += wait['quantity']
+            summary['total_wait'] += wait['seconds']
+            summary['max_wait'] = max(summary['max_wait'], wait['seconds'])
+            summary['not_granted'] += 0 if wait['granted'] else 1
+        return dict(summary)
+
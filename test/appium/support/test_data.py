@@ -2,20 +2,24 @@ from typing import Dict
 
 
 class SingleTestData(object):
-    def __init__(self, name, testruns, testrail_case_id, geth_paths, grop_name):
+    def __init__(self, name, testruns, testrail_case_id, geth_paths, grop_name, geth_sizes=None):
         self.testrail_case_id = testrail_case_id
         self.name = name
         self.testruns = testruns
         self.geth_paths = geth_paths
+        self.geth_sizes = geth_sizes if geth_sizes else dict()
         self.group_name = grop_name
 
     class TestRunData(object):
-        def __init__(self, steps, jobs, error, first_commands: Dict[str, int], xfail):
+        def __init__(self, steps, jobs, error, first_commands: Dict[str, int], xfail,
+                     step_commands: Dict[str, Dict[str, int]] = None):
             self.steps = steps
             self.jobs = jobs
             self.error = error
             self.first_commands = first_commands
             self.xfail = xfail
+            # session_id -> {step: index of command in Sauce log}
+            self.step_commands = step_commands if step_commands else dict()
 
     def create_new_testrun(self):
         self.testruns.append(SingleTestData.TestRunData(list(), dict(), None, dict(), xfail=''))
@@ -1,3 +1,8 @@
+import re
+from collections import defaultdict, namedtuple
+
+from support.utilities import locked_json_state
+
 RERUN_ERRORS = [
     "can't receive further commands",
     'Original error: Error: ESOCKETTIMEDOUT',
@@ -19,15 +24,119 @@ RERUN_ERRORS = [
     "http.client.RemoteDisconnected: Remote end closed connection without response",
     "[Errno 110] Connection timed out",
     "replacement transaction underpriced",
-    "StaleElementReferenceException",
     "'GetStartedButton' is not found on the screen",
     "'AccessKeyButton' is not found on the screen",
     "'SignInPhraseText' is not found on the screen"
 ]
 
+# exceptions which mean that session or connection to Sauce/Appium is lost, test code is not involved
+INFRA_EXCEPTIONS = (
+    'MaxRetryError',
+    'RemoteDisconnected',
+    'ProtocolError',
+    'ConnectionResetError',
+    'NewConnectionError',
+    'InvalidSessionIdException',
+)
 
-def should_rerun_test(test_error):
-    for rerun_error in RERUN_ERRORS:
-        if rerun_error in test_error:
+# test or app failures which are still worth rerun, e.g. element is re-rendered by the app between find and action
+RERUNNABLE_EXCEPTIONS = (
+    'StaleElementReferenceException',
+)
+
+Failure = namedtuple('Failure', ['kind', 'rule'])
+
+
+class FailureClassifier:
+    """
+    Classifies test error as `infra` (Sauce, Appium server, network, app start; worth rerun) or `product`
+    by exception type of the failure and by RERUN_ERRORS compiled into one regex,
+    so error text is scanned once instead of once per known error.
+    Product failures by RERUNNABLE_EXCEPTIONS are rerun too, but are not counted as infra ones.
+
+    usage:
+
+    FailureClassifier().classify("E   urllib3.exceptions.MaxRetryError: HTTPSConnectionPool...", 'MaxRetryError')
+    output will be: Failure(kind='infra', rule='MaxRetryError')
+
+    """
+    INFRA, PRODUCT = 'infra', 'product'
+
+    def __init__(self, errors=None, exceptions=INFRA_EXCEPTIONS, rerunnable=RERUNNABLE_EXCEPTIONS):
+        errors = RERUN_ERRORS if errors is None else errors
+        self.errors = errors
+        self.exceptions = exceptions
+        self.rerunnable = rerunnable
+        self.error_pattern = re.compile('|'.join('(%s)' % re.escape(error) for error in errors))
+        self.exception_pattern = re.compile(r'\b(%s)\b' % '|'.join(exceptions))
+        self.rerunnable_pattern = re.compile(r'\b(%s)\b' % '|'.join(rerunnable))
+
+    def classify(self, error: str, exception_type: str = None):
+        if exception_type in self.exceptions:
+            return Failure(self.INFRA, exception_type)
+        match = self.error_pattern.search(error)
+        if match:
+            return Failure(self.INFRA, self.errors[match.lastindex - 1])
+        match = self.exception_pattern.search(error)
+        if match:
+            return Failure(self.INFRA, match.group(1))
+        match = self.rerunnable_pattern.search(error)
+        if match:
+            return Failure(self.PRODUCT, match.group(1))
+        return Failure(self.PRODUCT, exception_type)
+
+    def is_rerunnable(self, failure: Failure):
+        return failure.kind == self.INFRA or failure.rule in self.rerunnable
+
+
+class RerunBudget:
+    """
+    Max number of reruns for the whole run, shared by xdist workers through JSON file guarded by flock,
+    so a broken build or Sauce outage doesn't rerun every test. `max_reruns=0` means no limit.
+    """
+
+    def __init__(self, max_reruns: int = 0, path: str = None):
+        self.max_reruns = max_reruns
+        self.path = path
+        self.used = 0
+
+    def take(self):
+        if not self.max_reruns or not self.path:
+            self.used += 1
             return True
-    return False
+        with locked_json_state(self.path, default={'used': 0}) as state:
+            if state['used'] >= self.max_reruns:
+                return False
+            state['used'] += 1
+        self.used += 1
+        return True
+
+
+class FailureStats:
+    """
+    Failures of a worker by kind and rule, with reruns they caused; saved to report stats and merged by master.
+    """
+
+    def __init__(self):
+        self.failures = list()
+
+    def record(self, test_name: str, failure: Failure, rerun: bool, group: str = None):
+        self.failures.append({'test': test_name, 'group': group, 'kind': failure.kind, 'rule': failure.rule,
+                              'rerun': rerun})
+
+    @staticmethod
+    def get_summary(failures):
+        summary = {'total': len(failures), 'reruns': len([i for i in failures if i['rerun']]),
+                   'kinds': defaultdict(int), 'rules': defaultdict(int)}
+        for failure in failures:
+            summary['kinds'][failure['kind']] += 1
+            if failure['kind'] == FailureClassifier.INFRA:
+                summary['rules'][failure['rule']] += 1
+        return summary
+
+
+failure_classifier = FailureClassifier()
+
+
+def should_rerun_test(test_error):
+    return failure_classifier.is_rerunnable(failure_classifier.classify(test_error))
@@ -3,6 +3,8 @@ import itertools
 import json
 import logging
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from json import JSONDecodeError
 from os import environ
 from sys import argv
@@ -11,11 +13,12 @@ import emoji
 import requests
 
 from support.base_test_report import BaseTestReport
+from support.http_session import PooledSession
 
 
 class TestrailReport(BaseTestReport):
 
-    def __init__(self):
+    def __init__(self, pool_size=10, retries=3, backoff_factor=0.5, upload_workers=8, upload_retries=3):
         super(TestrailReport, self).__init__()
 
         self.password = environ.get('TESTRAIL_PASS')
@@ -36,34 +39,58 @@ class TestrailReport(BaseTestReport):
         self.headers['Content-Type'] = 'application/json'
         self.headers['x-api-ident'] = 'beta'
 
-        self.url = 'https://ethstatus.testrail.net/index.php?/'
+        # can be pointed to a local stub server
+        self.url = environ.get('TESTRAIL_URL', 'https://ethstatus.testrail.net/index.php?/')
         self.api_url = self.url + 'api/v2/'
 
+        self.session = PooledSession(pool_size=pool_size, retries=retries, backoff_factor=backoff_factor)
+        self.test_ids_by_case = dict()
+        self.upload_workers = min(upload_workers, pool_size)
+        self.upload_retries = upload_retries
+
     def get(self, method):
-        rval = requests.get(self.api_url + method, headers=self.headers).json()
+        rval = self.session.get(self.api_url + method, headers=self.headers).json()
         if 'error' in rval:
             logging.error("Failed TestRail request: %s" % rval['error'])
         return rval
 
     def post(self, method, data):
         data = bytes(json.dumps(data), 'utf-8')
-        return requests.post(self.api_url + method, data=data, headers=self.headers).json()
+        return self.session.post(self.api_url + method, data=data, headers=self.headers).json()
 
     def add_attachment(self, method, path):
-        files = {'attachment': (open(path, 'rb'))}
-        result = requests.post(self.api_url + method, headers={'Authorization': self.headers['Authorization']},
-                               files=files)
-        files['attachment'].close()
+        with open(path, 'rb') as attachment:
+            result = self.session.post(self.api_url + method,
+                                       headers={'Authorization': self.headers['Authorization']},
+                                       files={'attachment': attachment})
         try:
             return result.json()
         except JSONDecodeError:
             pass
 
+    def get_all_pages(self, method, key):
+        # API responses are paginated, next page is referenced as '/api/v2/<method>&limit=250&offset=250'
+        items = list()
+        while method:
+            page = self.get(method)
+            items.extend(page[key])
+            next_page = (page.get('_links') or dict()).get('next')
+            method = next_page.split('api/v2/', 1)[-1] if next_page else None
+        return items
+
+    def print_latency_summary(self):
+        summary = self.session.latency_summary()
+        if summary:
+            print("TestRail API calls:")
+            for endpoint, stats in sorted(summary.items(), key=lambda item: -item[1]['total']):
+                print("  %s: %s calls, %s errors, %ss total, %ss max" % (
+                    endpoint, stats['calls'], stats['errors'], stats['total'], stats['max']))
+
     def get_suites(self):
         return self.get('get_suites/%s' % self.project_id)
 
-    def get_tests(self):
-        return self.get('get_tests/%s' % self.run_id)['tests']
+    def get_tests(self, test_run_id=None):
+        return self.get_all_pages('get_tests/%s' % (test_run_id if test_run_id else self.run_id), 'tests')
 
     def get_milestones(self):
         return self.get('get_milestones/%s' % self.project_id)['milestones']
@@ -183,7 +210,8 @@ class TestrailReport(BaseTestReport):
             devices = str()
             last_testrun = test.testruns[-1]
             for step in last_testrun.steps:
-                test_steps += step + "\n"
+                step_url = self.get_step_url(last_testrun, step)
+                test_steps += ("# [%s](%s)" % (step[2:], step_url) if step_url else step) + "\n"
             for i, device in enumerate(last_testrun.jobs):
                 if last_testrun.first_commands:
                     devices += "# [Device %d](%s) \n" % (
@@ -216,30 +244,63 @@ class TestrailReport(BaseTestReport):
         except (IndexError, KeyError):
             print("Got TestRail error when adding results: \n%s" % results)
 
+        try:
+            results_by_session = self.get_results_by_session(results)
+        except (KeyError, TypeError):
+            results_by_session = dict()
+        attachments = list()
         for test in all_tests:
             last_testrun = test.testruns[-1]
             if last_testrun.error:
                 try:
                     device = list(last_testrun.jobs.keys())[0]
-                except IndexError:
+                    geth_paths = test.geth_paths.values()
+                except (IndexError, AttributeError):
                     continue
-                for res in results:
-                    if last_testrun.first_commands:
-                        pattern = r"%s\?auth=.*#%s" % (device, str(last_testrun.first_commands[device]))
-                    else:
-                        pattern = device
-                    if re.findall(pattern, res['comment']):
-                        res_id = res['id']
-                        try:
-                            for geth in test.geth_paths.keys():
-                                self.add_attachment(method='add_attachment_to_result/%s' % str(res_id),
-                                                    path=test.geth_paths[geth])
-                        except (AttributeError, FileNotFoundError):
-                            pass
-                        break
+                # url of the job has no '#<command>' anchor when test starts from the first command (0)
+                first_command = last_testrun.first_commands.get(device) or None
+                res_id = results_by_session.get((device, first_command))
+                if res_id:
+                    attachments.extend([(res_id, path) for path in geth_paths])
+        self.upload_attachments(attachments)
 
         self.change_test_run_description()
 
+    @staticmethod
+    def get_results_by_session(results):
+        # (session_id, first_command) -> result_id, built with a single pass over result comments
+        results_by_session = dict()
+        for res in results:
+            for session_id, first_command in re.findall(r"jobs/([\w-]+)\?auth=\w+(?:#(\d+))?", res['comment']):
+                first_command = int(first_command) if first_command else None
+                results_by_session.setdefault((session_id, first_command), res['id'])
+        return results_by_session
+
+    def upload_attachment(self, result_id, path):
+        for attempt in range(self.upload_retries):
+            try:
+                response = self.add_attachment(method='add_attachment_to_result/%s' % str(result_id), path=path)
+                if response and 'attachment_id' in response:
+                    return True
+            except FileNotFoundError:
+                return True
+            except requests.RequestException:
+                pass
+            if attempt < self.upload_retries - 1:
+                time.sleep(2 ** attempt)
+        return False
+
+    def upload_attachments(self, attachments):
+        if not attachments:
+            return
+        with ThreadPoolExecutor(max_workers=self.upload_workers) as executor:
+            uploaded = list(executor.map(lambda attachment: self.upload_attachment(*attachment), attachments))
+        failed = [attachment for attachment, is_uploaded in zip(attachments, uploaded) if not is_uploaded]
+        if failed:
+            print("Failed to upload %s of %s attachments to TestRail:" % (len(failed), len(attachments)))
+            for result_id, path in failed:
+                print("  result %s: %s" % (result_id, path))
+
     def change_test_run_description(self):
         tests = self.get_all_tests()
         passed, failed, xfailed = self.get_tests_by_status()
@@ -297,7 +358,19 @@ class TestrailReport(BaseTestReport):
         return self.post('update_run/%s' % self.run_id, request_body)
 
     def get_run_results(self, test_run_id=None):
-        return self.get('get_results_for_run/%s' % (test_run_id if test_run_id else self.run_id))['results']
+        return self.get_all_pages('get_results_for_run/%s' % (test_run_id if test_run_id else self.run_id), 'results')
+
+    def get_results_index(self, test_run_id):
+        # case_id -> test_id for all tests having results in the run, loaded once per run
+        if test_run_id not in self.test_ids_by_case:
+            try:
+                tests_with_results = set([result['test_id'] for result in self.get_run_results(test_run_id)])
+                self.test_ids_by_case[test_run_id] = {test['case_id']: test['id'] for test in
+                                                      self.get_tests(test_run_id) if test['id'] in tests_with_results}
+            except (KeyError, JSONDecodeError):
+                print('Cannot load results for run %s' % test_run_id)
+                self.test_ids_by_case[test_run_id] = dict()
+        return self.test_ids_by_case[test_run_id]
 
     def is_run_successful(self):
         for test in self.get_run_results():
@@ -308,7 +381,7 @@ class TestrailReport(BaseTestReport):
 
     def get_test_result_link(self, test_run_id, test_case_id):
         try:
-            test_id = self.get('get_results_for_case/%s/%s' % (test_run_id, test_case_id))['results'][0]['test_id']
+            test_id = self.get_results_index(test_run_id)[test_case_id]
             return '%stests/view/%s' % (self.url, test_id)
         except (KeyError, JSONDecodeError):
             print('Cannot extract result for %s e2e' % test_case_id)
@@ -0,0 +1,77 @@
+import logging
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.wait import WebDriverWait
+
+from support.gestures import Gestures
+
+
+class TextInput:
+    """
+    Enters text with the fastest strategy a field allows, in one or two requests regardless of text length:
+    - set_value: element.send_keys, replaces text of the field (found element is required)
+    - type: `mobile: type`, appends text to the focused field at the cursor
+    - clipboard: set_clipboard_text + KEYCODE_PASTE into the focused field (overwrites device clipboard)
+    - keyevents: one W3C key actions request with real key events per character,
+      for fields which react on key presses (mentions, autocomplete)
+    `auto` uses set_value if element is passed, otherwise `type` with fallback to keyevents
+    for sessions where `mobile: type` is not supported.
+    Strategies which type into the focused field wait for the keyboard to be shown first.
+
+    usage:
+
+    TextInput(driver).send('and more')
+    TextInput(driver).send(passphrase, element=passphrase_edit_box.find_element())
+
+    """
+    STRATEGIES = ('auto', 'set_value', 'type', 'clipboard', 'keyevents')
+    # strategies which don't need found element
+    FOCUSED_FIELD_STRATEGIES = ('auto', 'type', 'clipboard', 'keyevents')
+    PASTE_KEYCODE = 279
+    # sessions where `mobile: type` failed, they don't try it again
+    unsupported_sessions = set()
+
+    def __init__(self, driver, strategy: str = 'auto'):
+        if strategy not in self.STRATEGIES:
+            raise ValueError("Unknown text input strategy '%s', expected one of: %s" % (
+                strategy, ', '.join(self.STRATEGIES)))
+        self.driver = driver
+        self.strategy = strategy
+
+    def get_strategy(self, element=None):
+        if self.strategy != 'auto':
+            return self.strategy
+        if element is not None:
+            return 'set_value'
+        if self.driver.session_id in self.unsupported_sessions:
+            return 'keyevents'
+        return 'type'
+
+    def wait_for_keyboard(self, timeout: float = 3):
+        # focused field receives text only when keyboard is up
+        try:
+            WebDriverWait(self.driver, timeout, 0.2).until(lambda driver: driver.is_keyboard_shown())
+        except TimeoutException:
+            logging.info("Keyboard is not shown in %s sec, text is sent anyway" % timeout)
+
+    def send(self, text: str, element=None):
+        strategy = self.get_strategy(element)
+        if strategy != 'set_value':
+            self.wait_for_keyboard()
+        if strategy == 'set_value':
+            element.send_keys(text)
+        elif strategy == 'type':
+            try:
+                self.driver.execute_script('mobile: type', {'text': text})
+            except WebDriverException as exception:
+                if self.strategy != 'auto':
+                    raise
+                logging.info("`mobile: type` is not available, text is sent as key events: %s" % exception.msg)
+                self.unsupported_sessions.add(self.driver.session_id)
+                return self.send(text, element)
+        elif strategy == 'clipboard':
+            self.driver.set_clipboard_text(text)
+            self.driver.press_keycode(self.PASTE_KEYCODE)
+        else:
+            Gestures(self.driver).type_text(text).perform()
+        return strategy
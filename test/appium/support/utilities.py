@@ -1,3 +1,7 @@
+import fcntl
+import json
+import os
+from contextlib import contextmanager
 from datetime import datetime
 from operator import itemgetter
 from typing import Dict
@@ -44,3 +48,30 @@ def get_merged_txs_list(normal_txs_list, token_events_list) -> Dict[str, Dict[st
 
 def generate_timestamp():
     return datetime.strftime(datetime.now(), '%F %H:%M:%S')
+
+
+@contextmanager
+def locked_json_state(path: str, default=None):
+    """
+    JSON file shared by processes (e.g. xdist workers): state is read and written back under exclusive flock,
+    so changes made inside the block are atomic for all processes using the same path.
+
+    usage:
+
+    with locked_json_state('/tmp/state.json', default={'count': 0}) as state:
+        state['count'] += 1
+
+    """
+    with open(os.open(path, os.O_RDWR | os.O_CREAT), 'r+') as state_file:
+        fcntl.flock(state_file, fcntl.LOCK_EX)
+        try:
+            content = state_file.read()
+            state = json.loads(content) if content else (default if default is not None else dict())
+            yield state
+            state_file.seek(0)
+            state_file.truncate()
+            json.dump(state, state_file, indent=2, sort_keys=True)
+            # written before the lock is released
+            state_file.flush()
+        finally:
+            fcntl.flock(state_file, fcntl.LOCK_UN)
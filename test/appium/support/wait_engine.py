@@ -0,0 +1,145 @@
+import time
+from contextlib import nullcontext
+
+from appium.webdriver.common.mobileby import MobileBy
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
+
+
+class AdaptiveWait(WebDriverWait):
+    """
+    WebDriverWait with exponentially growing poll interval (condition which is met right away is checked
+    once, long waits don't flood the device with requests). Implicit wait is set to 0 inside of the wait
+    (driver's `zero_implicit_wait`), so every poll is a single lookup instead of blocking for the implicit wait.
+    Elapsed time versus timeout of every wait is passed to `metrics.record_wait`.
+
+    usage:
+
+    AdaptiveWait(driver, 10, name='wait_for_element', metrics=driver_metrics).until(
+        expected_conditions.presence_of_element_located((by, locator)))
+
+    """
+
+    def __init__(self, driver, timeout: float, ignored_exceptions=None, name: str = 'wait', metrics=None,
+                 min_poll: float = 0.2, max_poll: float = 2, backoff: float = 1.5):
+        super(AdaptiveWait, self).__init__(driver, timeout, poll_frequency=min_poll,
+                                           ignored_exceptions=ignored_exceptions)
+        self.name = name
+        self.metrics = metrics
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+
+    def get_polls(self):
+        poll = self.min_poll
+        while True:
+            yield poll
+            poll = min(poll * self.backoff, self.max_poll)
+
+    @staticmethod
+    def get_polls_number(seconds: float, min_poll: float = 0.2, max_poll: float = 2, backoff: float = 1.5):
+        # number of checks client polling makes during `seconds`
+        polls, poll, slept = 1, min_poll, 0
+        while slept + poll <= seconds:
+            slept += poll
+            polls += 1
+            poll = min(poll * backoff, max_poll)
+        return polls
+
+    def poll(self, method, expected):
+        zero_implicit_wait = getattr(self._driver, 'zero_implicit_wait', nullcontext)
+        screen, stacktrace = None, None
+        start_time = time.monotonic()
+        end_time = start_time + self._timeout
+        timed_out = False
+        try:
+            with zero_implicit_wait():
+                for poll in self.get_polls():
+                    try:
+                        value = method(self._driver)
+                        if bool(value) == expected:
+                            return value
+                    except self._ignored_exceptions as exc:
+                        if not expected:
+                            return True
+                        screen = getattr(exc, "screen", None)
+                        stacktrace = getattr(exc, "stacktrace", None)
+                    remaining = end_time - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    time.sleep(min(poll, remaining))
+            timed_out = True
+            raise TimeoutException('', screen, stacktrace)
+        finally:
+            if self.metrics:
+                self.metrics.record_wait(self.name, getattr(self._driver, 'device_number', None),
+                                         time.monotonic() - start_time, self._timeout, timed_out)
+
+    def until(self, method, message: str = ""):
+        try:
+            return self.poll(method, expected=True)
+        except TimeoutException as exception:
+            raise TimeoutException(message, exception.screen, exception.stacktrace) from None
+
+    def until_not(self, method, message: str = ""):
+        try:
+            return self.poll(method, expected=False)
+        except TimeoutException:
+            raise TimeoutException(message) from None
+
+
+class ServerSideWait:
+    """
+    Pushes presence and absence waits down to Appium server which runs next to the device:
+    a single findElements call with session implicit wait set to the timeout is polled by the server,
+    so high-latency sessions pay one round-trip instead of one per poll.
+    Absence is waited as presence of the first node of the hierarchy which doesn't contain the element,
+    so it is supported for absolute XPath and accessibility id locators only (`until_absent` returns None otherwise).
+    Round-trips saved compared with client polling (AdaptiveWait) are passed to `metrics.record_saved_round_trips`.
+
+    usage:
+
+    ServerSideWait(driver, 30, name='wait_for_d_aap_to_load').until_absent('xpath', '//android.widget.ProgressBar')
+    output will be: True
+
+    """
+
+    def __init__(self, driver, timeout: float, name: str = 'wait', metrics=None, test_name: str = None):
+        self.driver = driver
+        self.timeout = timeout
+        self.name = name
+        self.metrics = metrics
+        self.test_name = test_name
+
+    @staticmethod
+    def get_absence_xpath(by, locator):
+        if by == MobileBy.XPATH and locator.startswith(('/', '(')):
+            xpath = locator
+        elif by == MobileBy.ACCESSIBILITY_ID and '"' not in locator:
+            xpath = '//*[@content-desc="%s"]' % locator
+        else:
+            return None
+        return '/hierarchy/*[1][not(%s)]' % xpath
+
+    def find_elements(self, by, locator):
+        start_time = time.monotonic()
+        elements = list()
+        try:
+            with self.driver.override_implicit_wait(self.timeout):
+                elements = self.driver.find_elements(by, locator)
+            return elements
+        finally:
+            elapsed = time.monotonic() - start_time
+            if self.metrics:
+                self.metrics.record_wait(self.name, getattr(self.driver, 'device_number', None),
+                                         elapsed, self.timeout, not elements)
+                self.metrics.record_saved_round_trips(self.test_name, AdaptiveWait.get_polls_number(elapsed) - 1)
+
+    def until_present(self, by, locator):
+        return self.find_elements(by, locator)
+
+    def until_absent(self, by, locator):
+        xpath = self.get_absence_xpath(by, locator)
+        if xpath is None:
+            return None
+        return bool(self.find_elements(MobileBy.XPATH, xpath))
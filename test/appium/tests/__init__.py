@@ -3,12 +3,14 @@ import functools
 import json
 import logging
 import os
-import time
 from datetime import datetime
 
 from urllib3.exceptions import MaxRetryError
 
 from support.appium_container import AppiumContainer
+from support.driver_metrics import DriverMetrics
+from support.element_profiler import ElementProfiler
+from support.session_admission import SessionAdmission
 from support.test_data import TestSuiteData
 
 
@@ -27,7 +29,7 @@ async def start_threads(test_name: str, quantity: int, func: type, returns: dict
                 break
             except MaxRetryError:
                 print("MaxRetryError when creating a driver for %s" % test_name)
-                time.sleep(10)
+                await asyncio.sleep(10)
     return returns
 
 
@@ -45,6 +47,56 @@ async def run_in_parallel(funcs):
     return returns
 
 
+async def run_for_each(funcs, timeout=None):
+    # unlike run_in_parallel all funcs are awaited even if some of them fail, exceptions are returned as results
+    loop = asyncio.get_event_loop()
+    return await asyncio.gather(*[asyncio.wait_for(loop.run_in_executor(None, func), timeout) for func in funcs],
+                                return_exceptions=True)
+
+
+def for_each_device(step, views, timeout=300, errors=None, name=None, **kwargs):
+    """
+    Runs step(view, **kwargs) for all views (or any objects with `driver`) concurrently and returns
+    when all of them are finished (or `timeout` seconds passed), results are returned in order of views.
+    Failures are appended to `errors` per device; without `errors` (e.g. in prepare_devices)
+    the first failure is raised after all devices are finished.
+    Step which timed out is not interrupted, its device should not be used until the step ends.
+
+    usage:
+
+    def open_chats(home):
+        home.navigate_back_to_home_view()
+        home.chats_tab.click()
+
+    for_each_device(open_chats, self.homes)
+
+    """
+    name = name if name else getattr(step, '__name__', 'step')
+    logging.info("Run `%s` on %s devices" % (name, len(views)))
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(
+            run_for_each([functools.partial(step, view, **kwargs) for view in views], timeout))
+    finally:
+        loop.close()
+    failures = list()
+    for view, result in zip(views, results):
+        if not isinstance(result, BaseException):
+            continue
+        device = view.driver.device_number
+        if isinstance(result, asyncio.TimeoutError):
+            result = TimeoutError("Device %s: `%s` is not finished in %s seconds" % (device, name, timeout))
+            message = str(result)
+        else:
+            message = "Device %s: `%s` failed: %s" % (device, name, str(result).strip())
+        failures.append(result)
+        if errors is not None:
+            errors.append(message)
+    if failures and errors is None:
+        raise failures[0]
+    return results
+
+
 def get_current_time():
     return datetime.now().strftime('%-m%-d%-H%-M%-S')
 
@@ -58,6 +110,9 @@ appium_root_project_path = os.path.join(os.sep.join(__file__.split(os.sep)[:-1])
 pytest_config_global = dict()
 test_suite_data = TestSuiteData()
 appium_container = AppiumContainer()
+driver_metrics = DriverMetrics()
+element_profiler = ElementProfiler()
+session_admission = SessionAdmission()
 
 common_password = 'qwerty1234'
 unique_password = 'unique' + get_current_time()
@@ -1,10 +1,10 @@
 import pytest
 from selenium.common.exceptions import TimeoutException
 
-from tests import marks, run_in_parallel
+from tests import marks, for_each_device
 from tests.base_test_case import MultipleSharedDeviceTestCase, create_shared_drivers
 from tests.users import transaction_senders
-from views.sign_in_view import SignInView
+from views.sign_in_view import SignInView, onboard_devices
 
 
 @pytest.mark.xdist_group(name="new_two_2")
@@ -15,15 +15,15 @@ class TestActivityCenterContactRequestMultipleDevicePR(MultipleSharedDeviceTestC
         self.drivers, self.loop = create_shared_drivers(2)
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
         self.username_1, self.username_2 = 'sender', 'receiver'
-        self.loop.run_until_complete(run_in_parallel(((self.device_1.create_user, {'enable_notifications': True,
-                                                                                   'username': self.username_1}),
-                                                      (self.device_2.create_user, {'username': self.username_2}))))
-        self.homes = self.home_1, self.home_2 = self.device_1.get_home_view(), self.device_2.get_home_view()
+        self.homes, _ = onboard_devices((self.device_1, self.device_2),
+                                        ({'enable_notifications': True, 'username': self.username_1},
+                                         {'username': self.username_2}))
+        self.home_1, self.home_2 = self.homes
         self.profile_1, self.profile_2 = self.home_1.get_profile_view(), self.home_2.get_profile_view()
         self.public_key_1 = self.home_1.get_public_key()
         self.public_key_2 = self.home_2.get_public_key_via_share_profile_tab()
-        [home.navigate_back_to_home_view() for home in self.homes]
-        [home.chats_tab.click() for home in self.homes]
+
+        for_each_device(lambda home: home.open_chats_tab(), self.homes, name='open_chats_tab')
 
     @marks.testrail_id(702850)
     def test_activity_center_contact_request_decline(self):
@@ -211,14 +211,13 @@ class TestActivityMultipleDevicePR(MultipleSharedDeviceTestCase):
         self.drivers, self.loop = create_shared_drivers(2)
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
         self.username_1, self.username_2 = 'user1', 'user2'
-        self.loop.run_until_complete(
-            run_in_parallel(((self.device_1.create_user, {'username': self.username_1}),
-                             (self.device_2.create_user, {'username': self.username_2}))))
-        self.homes = self.home_1, self.home_2 = self.device_1.get_home_view(), self.device_2.get_home_view()
+        self.homes, _ = onboard_devices((self.device_1, self.device_2),
+                                        ({'username': self.username_1}, {'username': self.username_2}))
+        self.home_1, self.home_2 = self.homes
         self.profile_1, self.profile_2 = self.home_1.get_profile_view(), self.home_2.get_profile_view()
         self.public_key_2 = self.home_2.get_public_key()
         self.home_2.navigate_back_to_home_view()
-        [home.chats_tab.click() for home in self.homes]
+        for_each_device(lambda home: home.chats_tab.click(), self.homes, name='chats_tab.click')
 
         self.home_1.add_contact(self.public_key_2)
         self.home_2.handle_contact_request(self.username_1)
@@ -367,14 +366,13 @@ class TestActivityMultipleDevicePRTwo(MultipleSharedDeviceTestCase):
         self.drivers, self.loop = create_shared_drivers(2)
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
         self.username_1, self.username_2 = 'user1', 'user2'
-        self.loop.run_until_complete(
-            run_in_parallel(((self.device_1.create_user, {'username': self.username_1}),
-                             (self.device_2.create_user, {'username': self.username_2}))))
-        self.homes = self.home_1, self.home_2 = self.device_1.get_home_view(), self.device_2.get_home_view()
+        self.homes, _ = onboard_devices((self.device_1, self.device_2),
+                                        ({'username': self.username_1}, {'username': self.username_2}))
+        self.home_1, self.home_2 = self.homes
         self.profile_1, self.profile_2 = self.home_1.get_profile_view(), self.home_2.get_profile_view()
         self.public_key_2 = self.home_2.get_public_key()
         self.home_2.navigate_back_to_home_view()
-        [home.chats_tab.click() for home in self.homes]
+        for_each_device(lambda home: home.chats_tab.click(), self.homes, name='chats_tab.click')
 
         self.home_1.add_contact(self.public_key_2)
         self.home_2.handle_contact_request(self.username_1)
@@ -1,10 +1,14 @@
 import asyncio
 import base64
+import functools
 import logging
 import re
 import subprocess
 import sys
+import time
+import types
 from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
 from http.client import RemoteDisconnected
 
 import pytest
@@ -18,7 +22,12 @@ from selenium.webdriver.support.wait import WebDriverWait
 from urllib3.exceptions import MaxRetryError, ProtocolError
 
 from support.api.network_api import NetworkApi
-from tests import test_suite_data, start_threads, appium_container, pytest_config_global, transl
+from support.driver_pool import DriverPool
+from support.element_cache import ElementCache
+from support.page_snapshot import PageSnapshot
+from support.sauce_command_log import SauceCommandLog
+from tests import test_suite_data, start_threads, appium_container, pytest_config_global, transl, driver_metrics, \
+    for_each_device, session_admission
 from tests.conftest import sauce_username, sauce_access_key, apibase, github_report
 
 executor_sauce_lab = 'https://%s:%s@ondemand.%s:443/wd/hub' % (sauce_username, sauce_access_key, apibase)
@@ -28,6 +37,13 @@ executor_local = 'http://localhost:4723/wd/hub'
 implicit_wait = 5
 
 
+# keeps spare sessions between groups of tests run by the same worker
+driver_pool = None
+# session of the previous single device test kept for the next one in --reuse_session mode
+reusable_driver = None
+REUSED_SESSION_JOB_NAME = 'Reused session of single device tests'
+
+
 def get_capabilities_local():
     desired_caps = dict()
     if pytest_config_global['docker']:
@@ -60,7 +76,7 @@ def add_local_devices_to_capabilities():
     return updated_capabilities
 
 
-def get_capabilities_sauce_lab():
+def get_capabilities_sauce_lab(name=None):
     caps = dict()
     caps['platformName'] = 'Android'
     caps['idleTimeout'] = 1000
@@ -85,7 +101,7 @@ def get_capabilities_sauce_lab():
     caps['sauce:options']['username'] = sauce_username
     caps['sauce:options']['accessKey'] = sauce_access_key
     caps['sauce:options']['build'] = pytest_config_global['build']
-    caps['sauce:options']['name'] = test_suite_data.current_test.name
+    caps['sauce:options']['name'] = name if name else test_suite_data.current_test.name
     caps['sauce:options']['maxDuration'] = 3600
     caps['sauce:options']['idleTimeout'] = 1000
 
@@ -101,15 +117,55 @@ def get_capabilities_sauce_lab():
 #     return caps
 
 
-def get_app_path():
-    app_folder = 'im.status.ethereum'
+def get_app_package():
+    app_package = 'im.status.ethereum'
     apk = pytest_config_global['apk']
     if re.findall(r'pr\d\d\d\d\d', apk) or re.findall(r'\d\d\d\d\d.apk', apk):
-        app_folder += '.pr'
-    app_path = '/storage/emulated/0/Android/data/%s/files/Download/' % app_folder
+        app_package += '.pr'
+    return app_package
+
+
+def get_app_path():
+    app_path = '/storage/emulated/0/Android/data/%s/files/Download/' % get_app_package()
     return app_path
 
 
+def reset_app(driver):
+    # app data (accounts, settings, geth.log) is wiped as after reinstall, but without new session and apk install
+    app_package = get_app_package()
+    try:
+        driver.execute_script('mobile: clearApp', {'appId': app_package})
+    except WebDriverException:
+        driver.terminate_app(app_package)
+        driver.execute_script('mobile: shell', {'command': 'pm', 'args': ['clear', app_package]})
+    driver.activate_app(app_package)
+
+
+def get_reusable_driver():
+    global reusable_driver
+    driver, reusable_driver = reusable_driver, None
+    if driver is None:
+        return None
+    start_time = time.time()
+    try:
+        if not DriverPool.is_alive(driver):
+            raise WebDriverException("session is not alive")
+        reset_app(driver)
+    except (WebDriverException, MaxRetryError) as e:
+        print("Session %s is not reused: %s" % (driver.session_id, e))
+        DriverPool.quit(driver)
+        return None
+    driver_metrics.record('resetApp', None, time.time() - start_time)
+    return driver
+
+
+def release_reusable_driver():
+    global reusable_driver
+    if reusable_driver is not None:
+        DriverPool.quit(reusable_driver)
+        reusable_driver = None
+
+
 def get_geth_path():
     return get_app_path() + 'geth.log'
 
@@ -119,6 +175,13 @@ def pull_geth(driver):
     return base64.b64decode(result)
 
 
+def pull_geth_to_report(driver, log_name):
+    # geth.log is streamed into report dir as (compressed) file instead of being kept in memory
+    return github_report.save_geth_log(log_name, driver.pull_file(get_geth_path()),
+                                       max_size=int(pytest_config_global['geth_max_size']) * 1024 * 1024,
+                                       compression=pytest_config_global['geth_compression'])
+
+
 class AbstractTestCase:
     __metaclass__ = ABCMeta
 
@@ -130,6 +193,10 @@ class AbstractTestCase:
     def get_translation_by_key(self, key):
         return transl[key]
 
+    def for_each_device(self, step, views, timeout=300, name=None, **kwargs):
+        # failures of the step are collected per device in self.errors
+        return for_each_device(step, views, timeout, errors=self.errors, name=name, **kwargs)
+
     @abstractmethod
     def setup_method(self, method):
         raise NotImplementedError('Should be overridden from a child class')
@@ -163,12 +230,99 @@ class AbstractTestCase:
                                                               test_suite_data.current_test.testruns[-1].error
 
 
+FIND_COMMANDS = ('findElement', 'findElements', 'findChildElement', 'findChildElements')
+
+
 class Driver(webdriver.Remote):
+    # page source snapshot used by BaseView.snapshot(), reset by any command which may change UI
+    snapshot_depth = 0
+    page_snapshot = None
+    # found elements reused by next actions, reset by the same commands as page snapshot
+    element_cache = None
+    # implicit wait requested by test case and the one currently set in session,
+    # explicit waits run with overridden (zero or long-poll) implicit wait which is restored
+    # only before the next lookup outside of them
+    implicit_wait = 0
+    session_implicit_wait = 0
+    zero_wait_depth = 0
+    # session slot granted by session_admission, returned on quit
+    admitted = False
 
     @property
     def number(self):
         return test_suite_data.current_test.testruns[-1].jobs[self.session_id]
 
+    @property
+    def device_number(self):
+        # unlike `number` doesn't fail for sessions which are not registered in current test yet
+        try:
+            return test_suite_data.current_test.testruns[-1].jobs.get(getattr(self, 'session_id', None))
+        except (AttributeError, IndexError):
+            return None
+
+    def implicitly_wait(self, time_to_wait):
+        self.implicit_wait = time_to_wait
+        if not self.zero_wait_depth:
+            self.set_session_implicit_wait(time_to_wait)
+
+    def set_session_implicit_wait(self, time_to_wait):
+        if self.session_implicit_wait != time_to_wait:
+            super(Driver, self).implicitly_wait(time_to_wait)
+            self.session_implicit_wait = time_to_wait
+
+    @contextmanager
+    def override_implicit_wait(self, time_to_wait):
+        previous_implicit_wait = self.session_implicit_wait
+        self.zero_wait_depth += 1
+        try:
+            self.set_session_implicit_wait(time_to_wait)
+            yield
+        finally:
+            self.zero_wait_depth -= 1
+            if self.zero_wait_depth:
+                self.set_session_implicit_wait(previous_implicit_wait)
+
+    def zero_implicit_wait(self):
+        return self.override_implicit_wait(0)
+
+    def get_page_snapshot(self, refresh=False):
+        if refresh or self.page_snapshot is None:
+            self.page_snapshot = PageSnapshot(self.page_source)
+        return self.page_snapshot
+
+    def get_element_cache(self):
+        if self.element_cache is None:
+            self.element_cache = ElementCache(max_age=float(pytest_config_global.get('element_cache_ttl', 2)))
+        return self.element_cache
+
+    def execute(self, driver_command, params=None):
+        if not PageSnapshot.is_read_only(driver_command, params):
+            self.page_snapshot = None
+            if self.element_cache is not None:
+                self.element_cache.clear()
+        if driver_command in FIND_COMMANDS and not self.zero_wait_depth:
+            self.set_session_implicit_wait(self.implicit_wait)
+        command_name = driver_command
+        if params and str(params.get('script', '')).startswith(('mobile:', 'sauce:')):
+            command_name = params['script'].split('=')[0]
+        start_time = time.time()
+        error = False
+        try:
+            return super(Driver, self).execute(driver_command, params)
+        except Exception:
+            error = True
+            raise
+        finally:
+            driver_metrics.record(command_name, self.device_number, time.time() - start_time, error)
+
+    def quit(self):
+        try:
+            super(Driver, self).quit()
+        finally:
+            if self.admitted:
+                self.admitted = False
+                session_admission.release(1)
+
     def info(self, text: str, device=True):
         if device:
             text = 'Device %s: %s ' % (self.number, text)
@@ -198,11 +352,23 @@ class SingleDeviceTestCase(AbstractTestCase):
             appium_container.start_appium_container(pytest_config_global['docker_shared_volume'])
             appium_container.connect_device(pytest_config_global['device_ip'])
 
-        (executor, capabilities) = (executor_sauce_lab, get_capabilities_sauce_lab()) if \
-            self.environment == 'sauce' else (executor_local, get_capabilities_local())
+        # tests with custom capabilities, docker runs (container is stopped after each test)
+        # and upgrade runs (apk is replaced by test) get new session
+        self.reuse_session = pytest_config_global['reuse_session'] and not kwargs and \
+            not pytest_config_global['docker'] and not pytest_config_global['apk_upgrade']
+        # Sauce job of reused session is shared by its tests, they are marked by sauce:context commands
+        if self.environment == 'sauce':
+            executor = executor_sauce_lab
+            capabilities = get_capabilities_sauce_lab(REUSED_SESSION_JOB_NAME if self.reuse_session else None)
+        else:
+            (executor, capabilities) = (executor_local, get_capabilities_local())
         for key, value in kwargs.items():
             capabilities[key] = value
-        self.driver = Driver(executor, capabilities)
+        self.driver = get_reusable_driver() if self.reuse_session else None
+        if self.driver is None:
+            self.driver = self.create_driver(executor, capabilities)
+        if self.reuse_session and self.environment == 'sauce':
+            self.driver.execute_script("sauce:context=Started %s" % method.__name__)
         test_suite_data.current_test.testruns[-1].jobs[self.driver.session_id] = 1
         self.driver.implicitly_wait(implicit_wait)
         self.errors = Errors()
@@ -210,20 +376,36 @@ class SingleDeviceTestCase(AbstractTestCase):
         if pytest_config_global['docker']:
             appium_container.reset_battery_stats()
 
+    def create_driver(self, executor, capabilities):
+        granted = session_admission.acquire(1, test_suite_data.current_test.name) if self.environment == 'sauce' else 0
+        try:
+            driver = Driver(executor, capabilities)
+        except Exception:
+            session_admission.release(granted)
+            raise
+        driver.admitted = bool(granted)
+        return driver
+
     def teardown_method(self, method):
+        global reusable_driver
         if self.environment == 'sauce':
             self.print_sauce_lab_info(self.driver)
+        geth_paths = dict()
         try:
             self.add_alert_text_to_report(self.driver)
-            geth_content = pull_geth(self.driver)
-            self.driver.quit()
+            geth_name = '%s_geth.log' % test_suite_data.current_test.name
+            geth_paths[geth_name] = pull_geth_to_report(self.driver, geth_name)
+            if self.reuse_session:
+                reusable_driver = self.driver
+            else:
+                self.driver.quit()
             if pytest_config_global['docker']:
                 appium_container.stop_container()
         except (WebDriverException, AttributeError):
             pass
         finally:
-            github_report.save_test(test_suite_data.current_test,
-                                    {'%s_geth.log' % test_suite_data.current_test.name: geth_content})
+            test_suite_data.current_test.geth_paths = geth_paths
+            github_report.save_test(test_suite_data.current_test)
 
 
 class LocalMultipleDeviceTestCase(AbstractTestCase):
@@ -271,19 +453,18 @@ class SauceMultipleDeviceTestCase(AbstractTestCase):
                 custom_implicitly_wait if custom_implicitly_wait else implicit_wait)
 
     def teardown_method(self, method):
-        geth_names, geth_contents = [], []
+        geth_paths = dict()
         for driver in self.drivers:
             try:
                 self.print_sauce_lab_info(self.drivers[driver])
                 self.add_alert_text_to_report(self.drivers[driver])
-                geth_names.append(
-                    '%s_geth%s.log' % (test_suite_data.current_test.name, str(self.drivers[driver].number)))
-                geth_contents.append(pull_geth(self.drivers[driver]))
+                geth_name = '%s_geth%s.log' % (test_suite_data.current_test.name, str(self.drivers[driver].number))
+                geth_paths[geth_name] = pull_geth_to_report(self.drivers[driver], geth_name)
                 self.drivers[driver].quit()
             except (WebDriverException, AttributeError):
                 pass
-        geth = {geth_names[i]: geth_contents[i] for i in range(len(geth_names))}
-        github_report.save_test(test_suite_data.current_test, geth)
+        test_suite_data.current_test.geth_paths = geth_paths
+        github_report.save_test(test_suite_data.current_test)
 
     @classmethod
     def teardown_class(cls):
@@ -305,22 +486,60 @@ def create_shared_drivers(quantity):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         print('SC Executor: %s' % executor_sauce_lab)
-        try:
-            drivers = loop.run_until_complete(start_threads(test_suite_data.current_test.name,
-                                                            quantity,
-                                                            Driver,
-                                                            drivers,
-                                                            command_executor=executor_sauce_lab,
-                                                            options=get_capabilities_sauce_lab()))
-            for i in range(quantity):
-                test_suite_data.current_test.testruns[-1].jobs[drivers[i].session_id] = i + 1
-                drivers[i].implicitly_wait(implicit_wait)
-            if len(drivers) < quantity:
-                test_suite_data.current_test.testruns[-1].error = "Not all %s drivers are created" % quantity
-            return drivers, loop
-        except (MaxRetryError, AttributeError) as e:
-            test_suite_data.current_test.testruns[-1].error += str(e)
-            raise e
+        global driver_pool
+        if driver_pool is None:
+            driver_pool = DriverPool(spares=int(pytest_config_global['spare_sessions']), admission=session_admission)
+        factory = functools.partial(Driver, command_executor=executor_sauce_lab, options=get_capabilities_sauce_lab())
+        drivers = loop.run_until_complete(driver_pool.acquire(quantity, factory, test_suite_data.current_test.name))
+        for i, driver in drivers.items():
+            test_suite_data.current_test.testruns[-1].jobs[driver.session_id] = i + 1
+            driver.implicitly_wait(implicit_wait)
+        if len(drivers) < quantity:
+            test_suite_data.current_test.testruns[-1].error = "Not all %s drivers are created" % quantity
+        return drivers, loop
+
+
+def replace_dead_drivers(drivers: dict):
+    # drivers are replaced by spare sessions only if some session died, not when prepare_devices is just failed;
+    # live sessions are returned to the pool with app data cleared and are handed out before spares
+    if not driver_pool or not driver_pool.spares_number or not drivers:
+        return False
+    alive = {index: driver_pool.is_alive(driver) for index, driver in drivers.items()}
+    if all(alive.values()):
+        return False
+    live_drivers = list()
+    for index, driver in drivers.items():
+        if alive[index]:
+            try:
+                reset_app(driver)
+                live_drivers.append(driver)
+                continue
+            except (WebDriverException, MaxRetryError):
+                pass
+        driver_pool.quit(driver)
+    driver_pool.add_spares(live_drivers, first=True)
+    return True
+
+
+def reprovision_shared_devices(cls):
+    # fresh device set for rerun of a test of the group which is followed by the next test of the same class:
+    # class stays set up, so `prepare` fixture is not run again and devices are provisioned here the same way.
+    # Rerun of the last test of the class doesn't get here, class is torn down after it (teardown_class quits
+    # its sessions) and `prepare` provisions devices for the rerun, so they are never provisioned twice
+    for driver in getattr(cls, 'drivers', dict()).values():
+        DriverPool.quit(driver)
+    loop = getattr(cls, 'loop', None)
+    if loop:
+        loop.close()
+    # sessions are created while failed attempt is still current test run: they are not added to its jobs,
+    # rerun gets new test run and registers them in setup_method
+    jobs = test_suite_data.current_test.testruns[-1].jobs
+    failed_jobs = dict(jobs)
+    try:
+        cls.provision_devices(types.SimpleNamespace())
+    finally:
+        jobs.clear()
+        jobs.update(failed_jobs)
 
 
 class LocalSharedMultipleDeviceTestCase(AbstractTestCase):
@@ -339,13 +558,17 @@ class LocalSharedMultipleDeviceTestCase(AbstractTestCase):
             except WebDriverException:
                 pass
 
-    @pytest.fixture(scope='class', autouse=True)
-    def prepare(self, request):
+    @classmethod
+    def provision_devices(cls, state):
         try:
-            request.cls.prepare_devices(request)
+            cls.prepare_devices(state)
         finally:
-            for item, value in request.__dict__.items():
-                setattr(request.cls, item, value)
+            for item, value in state.__dict__.items():
+                setattr(cls, item, value)
+
+    @pytest.fixture(scope='class', autouse=True)
+    def prepare(self, request):
+        request.cls.provision_devices(request)
 
     @classmethod
     def teardown_class(cls):
@@ -371,35 +594,84 @@ class SauceSharedMultipleDeviceTestCase(AbstractTestCase):
         test_suite_data.current_test.group_name = self.__class__.__name__
 
     def teardown_method(self, method):
-        geth_names, geth_contents = [], []
+        geth_paths = dict()
         for driver in self.drivers:
             try:
                 self.print_sauce_lab_info(self.drivers[driver])
                 self.add_alert_text_to_report(self.drivers[driver])
-                geth_names.append(
-                    '%s_geth%s.log' % (test_suite_data.current_test.name, str(self.drivers[driver].number)))
-                geth_contents.append(pull_geth(self.drivers[driver]))
-
+                geth_name = '%s_geth%s.log' % (test_suite_data.current_test.name, str(self.drivers[driver].number))
+                geth_paths[geth_name] = pull_geth_to_report(self.drivers[driver], geth_name)
             except (WebDriverException, AttributeError, RemoteDisconnected, ProtocolError):
                 pass
-            finally:
-                try:
-                    geth = {geth_names[i]: geth_contents[i] for i in range(len(geth_names))}
-                    test_suite_data.current_test.geth_paths = github_report.save_geth(geth)
-                except IndexError:
-                    pass
+        test_suite_data.current_test.geth_paths = geth_paths
+
+    @classmethod
+    def provision_devices(cls, state):
+        # state is request of `prepare` fixture (or namespace of reprovision_shared_devices) used as `self`
+        # of prepare_devices, its attributes become class attributes
+        try:
+            try:
+                cls.prepare_devices(state)
+            except (WebDriverException, MaxRetryError, RemoteDisconnected, ProtocolError):
+                if not replace_dead_drivers(getattr(state, 'drivers', dict())):
+                    raise
+                print("Sessions died in prepare_devices of %s, retrying with spare sessions" % cls.__name__)
+                state.loop.close()
+                test_suite_data.current_test.testruns[-1].jobs.clear()
+                cls.prepare_devices(state)
+        finally:
+            for item, value in state.__dict__.items():
+                setattr(cls, item, value)
 
     @pytest.fixture(scope='class', autouse=True)
     def prepare(self, request):
+        request.cls.provision_devices(request)
+
+    # max time for tearing down all sessions of the group, they are processed concurrently
+    teardown_deadline = 180
+
+    @classmethod
+    def teardown_session(cls, driver, requests_session, geth_name=None):
+        from tests.conftest import sauce
+        session_id = driver.session_id
+        geth_path = None
+        if geth_name:
+            try:
+                geth_path = pull_geth_to_report(driver, geth_name)
+            except (WebDriverException, RemoteDisconnected, ProtocolError):
+                pass
         try:
-            request.cls.prepare_devices(request)
-        finally:
-            for item, value in request.__dict__.items():
-                setattr(request.cls, item, value)
+            sauce.jobs.update_job(username=sauce_username, job_id=session_id, name=cls.__name__)
+        except (RemoteDisconnected, SauceException, requests.exceptions.ConnectionError):
+            pass
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        command_log = SauceCommandLog()
+        url = 'https://api.%s/rest/v1/%s/jobs/%s/assets/%s' % (apibase, sauce_username, session_id, "log.json")
+
+        def get_log_response(_):
+            # available log.json is streamed into parser, responses of other polls are closed
+            # so they return their connections to the pool
+            log_response = requests_session.get(url, stream=True)
+            if log_response.ok:
+                return log_response
+            log_response.close()
+            return False
+
+        try:
+            response = WebDriverWait(driver, 60, 2).until(get_log_response)
+            try:
+                command_log = SauceCommandLog.from_response(response)
+            finally:
+                response.close()
+        except (RemoteDisconnected, requests.exceptions.ConnectionError, TimeoutException, ValueError):
+            pass
+        return session_id, geth_name, geth_path, command_log
 
     @classmethod
     def teardown_class(cls):
-        from tests.conftest import sauce
         requests_session = requests.Session()
         requests_session.auth = (sauce_username, sauce_access_key)
         if test_suite_data.tests[0].testruns[-1].error and 'setup failed' in test_suite_data.tests[0].testruns[
@@ -407,49 +679,39 @@ class SauceSharedMultipleDeviceTestCase(AbstractTestCase):
             group_setup_failed = True
         else:
             group_setup_failed = False
-        geth_contents = list()
+        geth_paths = dict()
+        loop = getattr(cls, 'loop', None) or asyncio.new_event_loop()
         try:
-            for _, driver in cls.drivers.items():
-                if group_setup_failed:
-                    geth_contents.append(pull_geth(driver=driver))
-                session_id = driver.session_id
-                try:
-                    sauce.jobs.update_job(username=sauce_username, job_id=session_id, name=cls.__name__)
-                except (RemoteDisconnected, SauceException, requests.exceptions.ConnectionError):
-                    pass
-                try:
-                    driver.quit()
-                except WebDriverException:
-                    pass
-                url = 'https://api.%s/rest/v1/%s/jobs/%s/assets/%s' % (apibase, sauce_username, session_id, "log.json")
-                try:
-                    WebDriverWait(driver, 60, 2).until(lambda _: requests_session.get(url).status_code == 200)
-                    commands = requests_session.get(url).json()
-                    for command in commands:
-                        try:
-                            if command['message'].startswith("Started "):
-                                for test in test_suite_data.tests:
-                                    if command['message'] == "Started %s" % test.name:
-                                        test.testruns[-1].first_commands[session_id] = commands.index(command) + 1
-                        except KeyError:
-                            continue
-                except (RemoteDisconnected, requests.exceptions.ConnectionError, TimeoutException):
-                    pass
-        except AttributeError:
-            pass
+            sessions = [loop.run_in_executor(None, functools.partial(
+                cls.teardown_session, driver, requests_session,
+                '%s_geth%s.log' % (cls.__name__, i) if group_setup_failed else None))
+                for i, driver in enumerate(getattr(cls, 'drivers', dict()).values())]
+            if sessions:
+                done, pending = loop.run_until_complete(asyncio.wait(sessions, timeout=cls.teardown_deadline))
+                if pending:
+                    print("%s sessions of %s were not torn down in %s seconds" % (
+                        len(pending), cls.__name__, cls.teardown_deadline))
+                for future in done:
+                    try:
+                        session_id, geth_name, geth_path, command_log = future.result()
+                    except Exception as e:
+                        print("Teardown of %s session failed: %s" % (cls.__name__, e))
+                        continue
+                    if geth_path:
+                        geth_paths[geth_name] = geth_path
+                    for test in test_suite_data.tests:
+                        command_index = command_log.get_test_start(test.name)
+                        if command_index:
+                            test.testruns[-1].first_commands[session_id] = command_index
+                        step_commands = command_log.get_steps(test.name)
+                        if step_commands:
+                            test.testruns[-1].step_commands[session_id] = step_commands
         finally:
-            try:
-                cls.loop.close()
-            except AttributeError:
-                pass
-
-        geth_names = ['%s_geth%s.log' % (cls.__name__, i) for i in range(len(geth_contents))]
-        geth = dict(zip(geth_names, geth_contents))
-        geth_paths = github_report.save_geth(geth)
+            loop.close()
 
         for test in test_suite_data.tests:
             if group_setup_failed:
-                test.geth_paths = geth_paths
+                test.geth_paths = dict(sorted(geth_paths.items()))
             github_report.save_test(test)
 
 
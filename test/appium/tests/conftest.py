@@ -1,7 +1,11 @@
 import os
 import re
 import signal
+import sys
+import tempfile
+import uuid
 import requests
+from collections import defaultdict
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
@@ -15,7 +19,9 @@ from requests.exceptions import ConnectionError as c_er
 
 import tests
 from support.device_stats_db import DeviceStatsDB
-from support.test_rerun import should_rerun_test
+from support.locator_compiler import LocatorCompiler
+from support.test_rerun import FailureClassifier, FailureStats, RerunBudget, failure_classifier
+from support.text_input import TextInput
 from tests import test_suite_data, appium_container
 
 sauce_username = environ.get('SAUCE_USERNAME')
@@ -64,6 +70,10 @@ def pytest_addoption(parser):
                      action='store',
                      default=0,
                      help='How many times tests should be re-run if failed')
+    parser.addoption('--rerun_budget',
+                     action='store',
+                     default=0,
+                     help='Max number of reruns of infra failures in the whole run, 0 for no limit')
     parser.addoption("--run_testrail_ids",
                      action="store",
                      metavar="NAME",
@@ -74,6 +84,66 @@ def pytest_addoption(parser):
                      metavar="NAME",
                      default=None,
                      help='Url or local path to apk for upgrade')
+    parser.addoption('--spare_sessions',
+                     action='store',
+                     default=0,
+                     help='For sauce only: number of warm sessions kept by each worker to replace dead ones')
+    parser.addoption('--profile_elements',
+                     action='store_true',
+                     default=False,
+                     help='Profile wall time of element actions per element class, locator strategy and action')
+    parser.addoption('--locator_strategy',
+                     action='store',
+                     default='xpath',
+                     choices=LocatorCompiler.STRATEGIES,
+                     help='Lookup strategy for translation_id elements: xpath or uiautomator (UiSelector by text)')
+    parser.addoption('--locator_benchmark',
+                     action='store_true',
+                     default=False,
+                     help='Compare xpath and uiautomator lookups of translation_id elements on the same screen, '
+                          'results are shown in element actions hot spots')
+    parser.addoption('--wait_backend',
+                     action='store',
+                     default='server',
+                     help='Presence and absence waits: server (one long-poll findElements call polled by Appium '
+                          'server) or client (polling from test runner)')
+    parser.addoption('--group_durations',
+                     action='store',
+                     default=environ.get('GROUP_DURATIONS',
+                                         os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                                      'group_durations.json')),
+                     help='JSON file with tests durations from previous runs, used to start longest xdist groups '
+                          'first and updated at the end of run; not tracked by git, CI restores it from '
+                          'the previous build and archives it as an artifact')
+    parser.addoption('--text_input',
+                     action='store',
+                     default='keyevents',
+                     choices=TextInput.FOCUSED_FIELD_STRATEGIES,
+                     help='Strategy of BaseView.send_as_keyevent: keyevents (W3C key actions), type (mobile: type), '
+                          'clipboard or auto (type with fallback to keyevents)')
+    parser.addoption('--element_cache_ttl',
+                     action='store',
+                     default=2,
+                     help='Max age (in seconds) of found element reused by next actions on the same locator '
+                          'until any UI-changing command, 0 to find element before every action')
+    parser.addoption('--reuse_session',
+                     action='store_true',
+                     default=False,
+                     help='Single device tests reuse session of the previous test of the worker with app data '
+                          'cleared instead of new session with apk install')
+    parser.addoption('--max_sessions',
+                     action='store',
+                     default=0,
+                     help='For sauce only: max number of sessions created at once by all workers of the run, '
+                          'groups wait for free slots in order of requests; 0 for no limit')
+    parser.addoption('--geth_max_size',
+                     action='store',
+                     default=0,
+                     help='Max size of geth.log tail (in MB) saved to report, 0 to save the whole log')
+    parser.addoption('--geth_compression',
+                     action='store',
+                     default='gzip',
+                     help='Compression of geth.log saved to report: gzip/none')
 
     # chat bot
 
@@ -145,6 +215,13 @@ class Option:
 
 option = Option()
 testrail_report = None
+# node id -> duration of all phases of passed tests, collected on master for group scheduling
+test_durations = defaultdict(float)
+# node id -> number of sessions used by test, passed from workers by report user properties
+test_sessions = dict()
+failed_tests = set()
+failure_stats = FailureStats()
+rerun_budget = RerunBudget()
 github_report = None
 apibase = None
 sauce = None
@@ -154,6 +231,15 @@ def is_master(config):
     return not hasattr(config, 'workerinput')
 
 
+def get_run_id(config):
+    # xdist passes the same testrunuid to all workers of the run, master sets it in pytest_configure
+    return config.workerinput['testrunuid'] if hasattr(config, 'workerinput') else config.getoption('testrunuid')
+
+
+def get_worker_id(config):
+    return config.workerinput['workerid'] if hasattr(config, 'workerinput') else 'master'
+
+
 def is_uploaded():
     stored_files = sauce.storage.files()
     for i in range(len(stored_files)):
@@ -222,6 +308,9 @@ def _download_apk(url):
 def pytest_configure(config):
     global option
     option = config.option
+    if is_master(config) and not config.getoption('testrunuid'):
+        # otherwise xdist generates it for workers later, and master doesn't know state files of the run
+        config.option.testrunuid = uuid.uuid4().hex
     from support.testrail_report import TestrailReport
     global testrail_report
     testrail_report = TestrailReport()
@@ -230,6 +319,9 @@ def pytest_configure(config):
     from saucelab_api_client.saucelab_api_client import SauceLab
     github_report = GithubHtmlReport()
     tests.pytest_config_global = vars(config.option)
+    tests.element_profiler.enabled = config.getoption('profile_elements') or config.getoption('locator_benchmark')
+    rerun_budget.max_reruns = int(config.getoption('rerun_budget'))
+    rerun_budget.path = os.path.join(tempfile.gettempdir(), 'e2e_reruns_%s.json' % get_run_id(config))
     config.addinivalue_line("markers", "testrail_id(name): empty")
     global apibase
     if config.getoption('datacenter') == 'us-west-1':
@@ -249,6 +341,8 @@ def pytest_configure(config):
 
     test_suite_data.apk_name = ([i for i in [i for i in config.getoption('apk').split('/')
                                              if '.apk' in i]])[0]
+    if config.getoption('env') == 'sauce':
+        configure_session_admission(config)
     if not is_master(config):
         return
 
@@ -284,14 +378,34 @@ def pytest_configure(config):
 
 
 def pytest_unconfigure(config):
+    base_test_case = sys.modules.get('tests.base_test_case')
+    if base_test_case and base_test_case.driver_pool:
+        base_test_case.driver_pool.release_spares()
+    if base_test_case:
+        base_test_case.release_reusable_driver()
+    if tests.driver_metrics.durations:
+        github_report.save_stats('driver_metrics_%s' % get_worker_id(config), tests.driver_metrics.summary())
+    if failure_stats.failures:
+        github_report.save_stats('failures_%s' % get_worker_id(config), failure_stats.failures)
+    if tests.session_admission.waits:
+        github_report.save_stats('session_admission_%s' % get_worker_id(config), tests.session_admission.waits)
+    if tests.element_profiler.enabled:
+        github_report.save_stats('element_profile_%s' % get_worker_id(config), tests.element_profiler.dump())
+        if is_master(config):
+            print_element_hot_spots()
     if is_master(config):
+        remove_run_state()
+        if test_durations:
+            save_group_durations(config)
+        print_session_admission_summary()
+        print_failures_summary()
         if config.getoption('testrail_report'):
             testrail_report.add_results()
         if config.getoption('pr_number'):
             from github import Github
             repo = Github(github_token).get_user('status-im').get_repo('status-mobile')
             pull = repo.get_pull(int(config.getoption('pr_number')))
-            comment = pull.create_issue_comment(github_report.build_html_report(testrail_report.run_id))
+            comment = pull.create_issue_comment(github_report.build_html_report(testrail_report.run_id, testrail_report))
             if not testrail_report.is_run_successful():
                 pull.get_commits()[0].create_status(state='failure', context='Mobile e2e tests',
                                                     description='Failure - e2e tests are failed',
@@ -300,6 +414,77 @@ def pytest_unconfigure(config):
                 pull.get_commits()[0].create_status(state='success', context='Mobile e2e tests',
                                                     description='Success - e2e tests are passed',
                                                     target_url=comment.html_url)
+        if config.getoption('testrail_report') or config.getoption('pr_number'):
+            testrail_report.print_latency_summary()
+
+
+def configure_session_admission(config):
+    # all workers of the run share the same state file
+    tests.session_admission.max_sessions = int(config.getoption('max_sessions'))
+    tests.session_admission.path = os.path.join(tempfile.gettempdir(),
+                                                'e2e_session_slots_%s.json' % get_run_id(config))
+
+
+def remove_run_state():
+    # state files shared by workers of the run, all workers are finished by now
+    for path in (tests.session_admission.path, rerun_budget.path):
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
+def print_session_admission_summary():
+    waits = [wait for worker_waits in github_report.get_all_stats('session_admission_').values()
+             for wait in worker_waits]
+    if waits:
+        summary = tests.session_admission.get_summary(waits)
+        print("\nSession admission: %s sessions in %s requests, waited %s min in total, max %ss, %s not granted" % (
+            int(summary['sessions']), int(summary['requests']), round(summary['total_wait'] / 60, 1),
+            summary['max_wait'], int(summary['not_granted'])))
+
+
+def print_failures_summary():
+    failures = [failure for worker_failures in github_report.get_all_stats('failures_').values()
+                for failure in worker_failures]
+    if failures:
+        summary = FailureStats.get_summary(failures)
+        kinds = summary['kinds']
+        print("\nFailed attempts: %s, infra %s%%, product %s%%, reruns %s" % (
+            summary['total'], round(100 * kinds[FailureClassifier.INFRA] / summary['total']),
+            round(100 * kinds[FailureClassifier.PRODUCT] / summary['total']), summary['reruns']))
+        for rule, count in sorted(summary['rules'].items(), key=lambda i: i[1], reverse=True)[:5]:
+            print("%s infra failures: %s" % (count, rule))
+
+
+def save_group_durations(config):
+    from support.group_scheduler import GroupDurations
+    durations = GroupDurations(config.getoption('group_durations'))
+    durations.update({nodeid: duration for nodeid, duration in test_durations.items() if nodeid not in failed_tests},
+                     test_sessions)
+    durations.save()
+
+
+def print_element_hot_spots():
+    profiles = github_report.get_all_stats('element_profile_').values()
+    print("\nElement actions hot spots:")
+    for line in tests.element_profiler.get_hot_spots(tests.element_profiler.merge(profiles)):
+        print(line)
+
+
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption('dist') != 'loadgroup':
+        return None
+    from support.group_scheduler import DurationAwareScheduling, GroupDurations
+    max_sessions = int(config.getoption('max_sessions')) if config.getoption('env') == 'sauce' else 0
+    return DurationAwareScheduling(config, log, GroupDurations(config.getoption('group_durations')), max_sessions)
+
+
+def pytest_runtest_logreport(report):
+    test_durations[report.nodeid] += report.duration
+    sessions = dict(report.user_properties).get('sessions')
+    if sessions:
+        test_sessions[report.nodeid] = sessions
+    if report.failed:
+        failed_tests.add(report.nodeid)
 
 
 def should_save_device_stats(config):
@@ -358,6 +543,7 @@ def pytest_runtest_makereport(item, call):
 
     if report.when == 'call':
         current_test = test_suite_data.current_test
+        report.user_properties.append(('sessions', len(current_test.testruns[-1].jobs)))
         error = catch_error()
         if report.failed:
             current_test.testruns[-1].error = error
@@ -366,7 +552,8 @@ def pytest_runtest_makereport(item, call):
             current_test.testruns[-1].xfail = report.wasxfail
             if error:
                 current_test.testruns[-1].error = '%s [[%s]]' % (error, report.wasxfail)
-        if is_sauce_env:
+        # job of reused session is shared by several tests, so it is not renamed and marked by each of them
+        if is_sauce_env and not getattr(item.instance, 'reuse_session', False):
             update_sauce_jobs(current_test.name, current_test.testruns[-1].jobs, report.passed)
         if item.config.getoption('docker'):
             device_stats = appium_container.get_device_stats()
@@ -419,16 +606,41 @@ def pytest_runtest_setup(item):
     test_suite_data.current_test.create_new_testrun()
 
 
+def get_exception_type(report):
+    # e.g. 'selenium.common.exceptions.TimeoutException: Message: ...' -> 'TimeoutException'
+    try:
+        return report.longrepr.reprcrash.message.split(':')[0].split('.')[-1]
+    except AttributeError:
+        return None
+
+
 def pytest_runtest_protocol(item, nextitem):
     rerun_count = int(item.config.getoption('rerun_count'))
-    for i in range(rerun_count):
+    if not rerun_count:
+        return None
+    group = next((mark.kwargs.get('name') for mark in item.iter_markers(name='xdist_group')), None)
+    for attempt in range(rerun_count + 1):
         reports = runtestprotocol(item, nextitem=nextitem)
-        for report in reports:
-            is_in_group = [i for i in item.iter_markers(name='xdist_group')]
-            if report.failed and should_rerun_test(report.longreprtext) and not is_in_group:
-                break  # rerun
-        else:
-            return True  # no need to rerun
+        report = next((report for report in reports if report.failed), None)
+        if not report:
+            return True
+        failure = failure_classifier.classify(report.longreprtext, get_exception_type(report))
+        # test of the group is rerun only if it failed itself, setup of the whole group is not repeated per test
+        rerun = failure_classifier.is_rerunnable(failure) and attempt < rerun_count and \
+            (not group or report.when == 'call') and rerun_budget.take()
+        failure_stats.record(item.name, failure, rerun, group)
+        if not rerun:
+            return True
+        # class stays set up for the next test of the same class, so devices are replaced here before the rerun;
+        # after the last test of the class it is torn down by pytest, and rerun sets it up again by `prepare` fixture
+        if group and nextitem is not None and nextitem.cls is item.cls:
+            from tests.base_test_case import reprovision_shared_devices
+            try:
+                reprovision_shared_devices(item.cls)
+            except Exception as e:
+                print("Devices of %s are not reprovisioned for rerun of %s: %s" % (group, item.name, e))
+                return True
+    return True
 
 
 # @pytest.fixture(scope="session", autouse=False)
@@ -5,9 +5,9 @@ import pytest
 from _pytest.outcomes import Failed
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-from tests import marks, run_in_parallel, transl
+from tests import marks, transl
 from tests.base_test_case import MultipleSharedDeviceTestCase, create_shared_drivers
-from views.sign_in_view import SignInView
+from views.sign_in_view import SignInView, onboard_devices
 
 
 @pytest.mark.xdist_group(name="new_one_2")
@@ -19,12 +19,10 @@ class TestOneToOneChatMultipleSharedDevicesNewUi(MultipleSharedDeviceTestCase):
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
 
         self.username_1, self.username_2 = 'sender', 'receiver'
-        self.loop.run_until_complete(run_in_parallel(((self.device_1.create_user, {'enable_notifications': True,
-                                                                                   'username': self.username_1}),
-                                                      (self.device_2.create_user, {'enable_notifications': True,
-                                                                                   'username': self.username_2}))))
-        self.home_1, self.home_2 = self.device_1.get_home_view(), self.device_2.get_home_view()
-        self.homes = (self.home_1, self.home_2)
+        self.homes, _ = onboard_devices((self.device_1, self.device_2),
+                                        ({'enable_notifications': True, 'username': self.username_1},
+                                         {'enable_notifications': True, 'username': self.username_2}))
+        self.home_1, self.home_2 = self.homes
         self.profile_1, self.profile_2 = (home.get_profile_view() for home in self.homes)
         self.public_key_2 = self.home_2.get_public_key()
 
@@ -525,12 +523,10 @@ class TestOneToOneChatMultipleSharedDevicesNewUiTwo(MultipleSharedDeviceTestCase
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
 
         self.username_1, self.username_2 = 'sender', 'receiver'
-        self.loop.run_until_complete(run_in_parallel(((self.device_1.create_user, {'enable_notifications': True,
-                                                                                   'username': self.username_1}),
-                                                      (self.device_2.create_user, {'enable_notifications': True,
-                                                                                   'username': self.username_2}))))
-        self.home_1, self.home_2 = self.device_1.get_home_view(), self.device_2.get_home_view()
-        self.homes = (self.home_1, self.home_2)
+        self.homes, _ = onboard_devices((self.device_1, self.device_2),
+                                        ({'enable_notifications': True, 'username': self.username_1},
+                                         {'enable_notifications': True, 'username': self.username_2}))
+        self.home_1, self.home_2 = self.homes
         self.profile_1, self.profile_2 = (home.get_profile_view() for home in self.homes)
         self.public_key_2 = self.home_2.get_public_key()
 
@@ -7,7 +7,7 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from tests import marks, run_in_parallel, transl
 from tests.base_test_case import MultipleSharedDeviceTestCase, create_shared_drivers
 from views.chat_view import ChatView
-from views.sign_in_view import SignInView
+from views.sign_in_view import SignInView, onboard_devices
 
 
 @pytest.mark.xdist_group(name="new_one_3")
@@ -21,25 +21,9 @@ class TestGroupChatMultipleDeviceMergedNewUI(MultipleSharedDeviceTestCase):
         self.public_keys, self.usernames, self.chats = {}, {}, {}
         self.sign_in_views = [SignInView(self.drivers[key]) for key in self.drivers]
         self.usernames = ('user admin', 'member_1', 'member_2')
-        self.loop.run_until_complete(
-            run_in_parallel(
-                (
-                    (self.sign_in_views[0].create_user, {'enable_notifications': True, 'username': self.usernames[0]}),
-                    (self.sign_in_views[1].create_user, {'enable_notifications': True, 'username': self.usernames[1]}),
-                    (self.sign_in_views[2].create_user, {'enable_notifications': True, 'username': self.usernames[2]})
-                )
-            )
-        )
-        self.homes = [sign_in.get_home_view() for sign_in in self.sign_in_views]
-        self.public_keys = self.loop.run_until_complete(
-            run_in_parallel(
-                (
-                    (self.homes[0].get_public_key,),
-                    (self.homes[1].get_public_key,),
-                    (self.homes[2].get_public_key,)
-                )
-            )
-        )
+        self.homes, self.public_keys = onboard_devices(
+            self.sign_in_views, [{'enable_notifications': True, 'username': username} for username in self.usernames],
+            get_public_keys=True)
 
         self.homes[0].just_fyi('Admin adds future members to contacts')
 
@@ -6,11 +6,11 @@ import pytest
 from _pytest.outcomes import Failed
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
-from tests import marks, run_in_parallel, pytest_config_global, transl
+from tests import marks, pytest_config_global, transl, for_each_device
 from tests.base_test_case import create_shared_drivers, MultipleSharedDeviceTestCase
 from views.chat_view import CommunityView
 from views.dbs.waku_backup import user as waku_user
-from views.sign_in_view import SignInView
+from views.sign_in_view import SignInView, onboard_devices
 
 
 @pytest.mark.xdist_group(name="new_one_1")
@@ -20,13 +20,14 @@ class TestCommunityOneDeviceMerged(MultipleSharedDeviceTestCase):
     def prepare_devices(self):
         self.drivers, self.loop = create_shared_drivers(1)
         self.sign_in = SignInView(self.drivers[0])
-        self.username = 'first user'
+        # account with closed community is restored from snapshot (see views/dbs/recipes.py),
+        # it has the name given by recover_access
+        self.username = 'Restore user'
 
-        self.home = self.sign_in.create_user(username=self.username)
+        self.home = self.sign_in.restore_snapshot('basic_user_closed_community')
         self.home.communities_tab.click_until_presence_of_element(self.home.plus_community_button)
         self.community_name = "closed community"
         self.channel_name = "cats"
-        self.community = self.home.create_community(community_type="closed")
 
         self.home.get_chat(self.community_name, community=True).click()
         self.community_view = self.home.get_community_view()
@@ -43,9 +44,10 @@ class TestCommunityOneDeviceMerged(MultipleSharedDeviceTestCase):
 
         if len(self.home.community_card_item.find_elements()) > 1:
             contributors_test_community_attributes = "Test Community", 'Open for anyone', 'Web3', 'Software dev'
-            for text in contributors_test_community_attributes:
-                if not self.home.element_by_text(text).is_element_displayed(10):
-                    self.errors.append("'%s' text is not in Discovery!" % text)
+            with self.home.snapshot():
+                for text in contributors_test_community_attributes:
+                    if not self.home.element_by_text(text).is_element_displayed(10):
+                        self.errors.append("'%s' text is not in Discovery!" % text)
             self.home.element_by_text(contributors_test_community_attributes[0]).click()
             element_templates = {
                 self.community_view.join_button: 'discovery_join_button.png',
@@ -64,9 +66,10 @@ class TestCommunityOneDeviceMerged(MultipleSharedDeviceTestCase):
 
         status_ccs_community_attributes = '(old) Status CCs', 'Community for Status CCs', 'Ethereum', \
             'Software dev', 'Web3'
-        for text in status_ccs_community_attributes:
-            if not self.community_view.element_by_text(text).is_element_displayed(10):
-                self.errors.append("'%s' text is not shown for (old) Status CCs!" % text)
+        with self.community_view.snapshot():
+            for text in status_ccs_community_attributes:
+                if not self.community_view.element_by_text(text).is_element_displayed(10):
+                    self.errors.append("'%s' text is not shown for (old) Status CCs!" % text)
         self.errors.verify_no_errors()
 
     @marks.testrail_id(702846)
@@ -281,14 +284,15 @@ class TestCommunityMultipleDeviceMerged(MultipleSharedDeviceTestCase):
         self.drivers, self.loop = create_shared_drivers(2)
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
         self.username_1, self.username_2 = "user_1", "user_2"
-        self.loop.run_until_complete(run_in_parallel(((self.device_1.create_user, {'enable_notifications': True,
-                                                                                   'username': self.username_1}),
-                                                      (self.device_2.create_user, {'username': self.username_2}))))
-        self.homes = self.home_1, self.home_2 = self.device_1.get_home_view(), self.device_2.get_home_view()
+        self.homes, _ = onboard_devices((self.device_1, self.device_2),
+                                        ({'enable_notifications': True, 'username': self.username_1},
+                                         {'username': self.username_2}))
+        self.home_1, self.home_2 = self.homes
         self.public_key_2 = self.home_2.get_public_key_via_share_profile_tab()
         self.profile_1 = self.home_1.get_profile_view()
-        [home.navigate_back_to_home_view() for home in self.homes]
-        [home.chats_tab.click() for home in self.homes]
+
+        for_each_device(lambda home: home.open_chats_tab(), self.homes, name='open_chats_tab')
+
         self.home_1.add_contact(self.public_key_2)
         self.home_2.handle_contact_request(self.username_1)
         self.text_message = 'hello'
@@ -777,15 +781,15 @@ class TestCommunityMultipleDeviceMergedTwo(MultipleSharedDeviceTestCase):
         self.drivers, self.loop = create_shared_drivers(2)
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
         self.username_1, self.username_2 = "user_1", "user_2"
-        self.loop.run_until_complete(run_in_parallel(((self.device_1.create_user, {'enable_notifications': True,
-                                                                                   'username': self.username_1}),
-                                                      (self.device_2.create_user, {'enable_notifications': True,
-                                                                                   'username': self.username_2}))))
-        self.homes = self.home_1, self.home_2 = self.device_1.get_home_view(), self.device_2.get_home_view()
+        self.homes, _ = onboard_devices((self.device_1, self.device_2),
+                                        ({'enable_notifications': True, 'username': self.username_1},
+                                         {'enable_notifications': True, 'username': self.username_2}))
+        self.home_1, self.home_2 = self.homes
         self.public_key_2 = self.home_2.get_public_key()
         self.profile_1 = self.home_1.get_profile_view()
-        [home.navigate_back_to_home_view() for home in self.homes]
-        [home.chats_tab.click() for home in self.homes]
+
+        for_each_device(lambda home: home.open_chats_tab(), self.homes, name='open_chats_tab')
+
         self.home_1.add_contact(self.public_key_2)
         self.home_2.handle_contact_request(self.username_1)
         self.text_message = 'hello'
@@ -912,12 +916,14 @@ class TestCommunityMultipleDeviceMergedTwo(MultipleSharedDeviceTestCase):
             'quote reply (one row)': '>',
         }
 
-        for home in self.homes:
+        def open_channel(home):
             home.navigate_back_to_home_view()
             home.jump_to_communities_home()
             community = home.get_chat(self.community_name, community=True).click()
             community.get_channel(self.channel_name).click()
 
+        for_each_device(open_channel, self.homes)
+
         for message, symbol in markdown.items():
             self.home_1.just_fyi('Checking that "%s" is applied (%s) in community channel' % (message, symbol))
             message_to_send = symbol + message + symbol if 'quote' not in message else symbol + message
@@ -0,0 +1,21 @@
+import pytest
+
+from tests import test_suite_data
+from tests.base_test_case import REUSED_SESSION_JOB_NAME, get_capabilities_sauce_lab
+
+
+class TestSauceCapabilities(object):
+
+    @pytest.fixture(autouse=True)
+    def apk_name(self, monkeypatch):
+        monkeypatch.setattr(test_suite_data, 'apk_name', 'StatusIm-e2e.apk')
+
+    def test_job_is_named_after_test(self):
+        options = get_capabilities_sauce_lab().get_capability('sauce:options')
+        assert options['name'] == test_suite_data.current_test.name
+
+    def test_job_of_reused_session_has_shared_name(self):
+        # as built by SingleDeviceTestCase.setup_method with --reuse_session
+        capabilities = get_capabilities_sauce_lab(REUSED_SESSION_JOB_NAME)
+        assert capabilities.get_capability('sauce:options')['name'] == REUSED_SESSION_JOB_NAME
+        assert capabilities.get_capability('appium:app') == 'sauce-storage:StatusIm-e2e.apk'
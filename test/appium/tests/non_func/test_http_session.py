@@ -0,0 +1,71 @@
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from support.http_session import PooledSession
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # keep-alive, as TestRail API
+    protocol_version = 'HTTP/1.1'
+    # path -> number of first requests answered with 502
+    failures = dict()
+    requests = defaultdict(int)
+    connections = set()
+
+    def respond(self):
+        self.connections.add(self.client_address)
+        self.requests[(self.command, self.path)] += 1
+        length = int(self.headers.get('Content-Length', 0))
+        if length:
+            self.rfile.read(length)
+        status = 502 if self.requests[(self.command, self.path)] <= self.failures.get(self.path, 0) else 200
+        body = b'{}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = respond
+    do_POST = respond
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPooledSession(object):
+
+    @pytest.fixture(autouse=True)
+    def stub_server(self):
+        StubHandler.failures, StubHandler.requests, StubHandler.connections = dict(), defaultdict(int), set()
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.url = 'http://127.0.0.1:%s/index.php?/api/v2/' % server.server_port
+        yield
+        server.shutdown()
+        server.server_close()
+
+    def test_calls_reuse_connection(self):
+        session = PooledSession(pool_size=2, retries=0)
+        for case_id in range(5):
+            session.get(self.url + 'get_results_for_case/1/%s' % case_id)
+        assert len(StubHandler.connections) == 1
+        assert session.latency_summary()['get_results_for_case']['calls'] == 5
+
+    def test_get_is_retried_on_gateway_error(self):
+        StubHandler.failures['/index.php?/api/v2/get_run/1'] = 2
+        response = PooledSession(retries=3, backoff_factor=0).get(self.url + 'get_run/1')
+        assert response.status_code == 200
+        assert StubHandler.requests[('GET', '/index.php?/api/v2/get_run/1')] == 3
+
+    def test_post_is_not_retried(self):
+        # adding results is not idempotent, retry after gateway timeout may duplicate them
+        StubHandler.failures['/index.php?/api/v2/add_results_for_cases/1'] = 1
+        session = PooledSession(retries=3, backoff_factor=0)
+        response = session.post(self.url + 'add_results_for_cases/1', json={'results': []})
+        assert response.status_code == 502
+        assert StubHandler.requests[('POST', '/index.php?/api/v2/add_results_for_cases/1')] == 1
+        assert session.latency_summary()['add_results_for_cases']['errors'] == 1
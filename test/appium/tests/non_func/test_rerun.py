@@ -0,0 +1,72 @@
+from support.test_rerun import FailureClassifier, FailureStats, RerunBudget, should_rerun_test
+
+
+class TestFailureClassifier(object):
+
+    def setup_method(self):
+        self.classifier = FailureClassifier()
+
+    def test_rule_is_error_which_matched(self):
+        # rule is taken by index of matched group of the compiled regex
+        classifier = FailureClassifier(errors=['socket hang up', '502 Bad Gateway', '[Errno 110] Connection timed out'])
+        assert classifier.classify("E   WebDriverException: Message: 502 Bad Gateway") == \
+            (FailureClassifier.INFRA, '502 Bad Gateway')
+        assert classifier.classify("E   OSError: [Errno 110] Connection timed out").rule == \
+            '[Errno 110] Connection timed out'
+
+    def test_known_error_text_is_infra(self):
+        failure = self.classifier.classify("E   ConnectionError: [Errno 104] Connection reset by peer")
+        assert failure == (FailureClassifier.INFRA, '[Errno 104] Connection reset by peer')
+
+    def test_infra_exception_type(self):
+        assert self.classifier.classify("E   Message: session is gone", 'InvalidSessionIdException') == \
+            (FailureClassifier.INFRA, 'InvalidSessionIdException')
+
+    def test_infra_exception_in_error_text(self):
+        error = "E   urllib3.exceptions.NewConnectionError: <urllib3.connection.HTTPSConnection object>"
+        assert self.classifier.classify(error) == (FailureClassifier.INFRA, 'NewConnectionError')
+
+    def test_other_exception_is_product(self):
+        failure = self.classifier.classify("E   TimeoutException: Message: element is not found", 'TimeoutException')
+        assert failure == (FailureClassifier.PRODUCT, 'TimeoutException')
+        assert not self.classifier.is_rerunnable(failure)
+        assert not should_rerun_test("E   AssertionError: message is not delivered")
+
+    def test_stale_element_is_product_failure_which_is_rerun(self):
+        error = "E   selenium.common.exceptions.StaleElementReferenceException: Message: stale element reference"
+        for failure in (self.classifier.classify(error, 'StaleElementReferenceException'),
+                        self.classifier.classify(error)):
+            assert failure == (FailureClassifier.PRODUCT, 'StaleElementReferenceException')
+            assert self.classifier.is_rerunnable(failure)
+        assert should_rerun_test(error)
+
+
+class TestRerunBudget(object):
+
+    def test_budget_is_shared_by_workers(self, tmp_path):
+        path = str(tmp_path / 'reruns.json')
+        worker_1, worker_2 = RerunBudget(max_reruns=3, path=path), RerunBudget(max_reruns=3, path=path)
+        assert worker_1.take() and worker_2.take() and worker_1.take()
+        assert not worker_2.take()
+        assert not worker_1.take()
+        assert (worker_1.used, worker_2.used) == (2, 1)
+
+    def test_no_limit(self, tmp_path):
+        budget = RerunBudget(max_reruns=0, path=str(tmp_path / 'reruns.json'))
+        assert all(budget.take() for _ in range(10))
+        assert budget.used == 10
+
+
+class TestFailureStats(object):
+
+    def test_summary(self):
+        stats = FailureStats()
+        stats.record('test_one', FailureClassifier().classify('', 'MaxRetryError'), rerun=True, group='TestGroup')
+        stats.record('test_one', FailureClassifier().classify('', 'MaxRetryError'), rerun=False, group='TestGroup')
+        stats.record('test_two', FailureClassifier().classify('', 'StaleElementReferenceException'), rerun=True)
+        stats.record('test_three', FailureClassifier().classify('', 'TimeoutException'), rerun=False)
+        summary = FailureStats.get_summary(stats.failures)
+        assert (summary['total'], summary['reruns']) == (4, 2)
+        assert dict(summary['kinds']) == {FailureClassifier.INFRA: 2, FailureClassifier.PRODUCT: 2}
+        # rules are counted for infra failures only
+        assert dict(summary['rules']) == {'MaxRetryError': 2}
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+import uuid
+
+import pytest
+from urllib3.exceptions import MaxRetryError
+
+from support.driver_pool import DriverPool
+from support.session_admission import SessionAdmission
+from support.utilities import locked_json_state
+
+
+class StubDriver:
+    # stands in for Driver: session is created by Sauce, slot is returned on quit
+    admitted = False
+
+    def __init__(self, admission):
+        self.admission = admission
+        self.session_id = uuid.uuid4().hex
+
+    def quit(self):
+        if self.admitted:
+            self.admitted = False
+            self.admission.release(1)
+
+
+class FakeSauce:
+    """
+    Stands in for Sauce shared by processes of the run: counts sessions open at the same time in JSON file
+    and fails session creation with MaxRetryError (as queued Sauce session does) above `concurrency`.
+    """
+
+    def __init__(self, concurrency: int, path: str):
+        self.concurrency = concurrency
+        self.path = path
+
+    def state(self):
+        return locked_json_state(self.path, default={'open': 0, 'max_open': 0, 'rejected': 0})
+
+    def create_session(self):
+        with self.state() as state:
+            rejected = state['open'] >= self.concurrency
+            if rejected:
+                state['rejected'] += 1
+            else:
+                state['open'] += 1
+                state['max_open'] = max(state['max_open'], state['open'])
+        if rejected:
+            raise MaxRetryError(None, '/session', 'Sauce concurrency %s is exceeded' % self.concurrency)
+
+    def quit_session(self):
+        with self.state() as state:
+            state['open'] -= 1
+
+    def get_stats(self):
+        with open(self.path) as state_file:
+            return json.load(state_file)
+
+
+def run_group(admission, sauce, events_path, name, quantity, hold):
+    # test group of a worker process: sessions are created after slots are granted and quit after `hold` seconds
+    granted = admission.acquire(quantity, name)
+    with locked_json_state(events_path, default=list()) as events:
+        events.append({'name': name, 'event': 'granted', 'quantity': granted})
+    sessions = 0
+    try:
+        for _ in range(quantity):
+            sauce.create_session()
+            sessions += 1
+        time.sleep(hold)
+    finally:
+        for _ in range(sessions):
+            sauce.quit_session()
+        with locked_json_state(events_path, default=list()) as events:
+            events.append({'name': name, 'event': 'released', 'quantity': granted})
+        admission.release(granted)
+
+
+class TestSessionAdmission(object):
+
+    @pytest.fixture(autouse=True)
+    def admission(self, tmp_path):
+        self.admission = SessionAdmission(max_sessions=3, path=str(tmp_path / 'slots.json'), poll=0, timeout=0)
+        self.loop = asyncio.new_event_loop()
+        yield
+        self.loop.close()
+
+    def get_held_slots(self):
+        with open(self.admission.path) as state_file:
+            return sum(json.load(state_file)['holders'].values())
+
+    def hold_slots(self, quantity):
+        # slots held by another alive process of the run
+        with self.admission.state() as state:
+            state['holders'][str(os.getppid())] = quantity
+
+    def acquire(self, quantity, factory):
+        pool = DriverPool(admission=self.admission)
+        return self.loop.run_until_complete(pool.acquire(quantity, factory, name='TestGroup'))
+
+    def test_sessions_are_not_admitted_after_timeout(self):
+        self.hold_slots(3)
+        drivers = self.acquire(2, lambda: StubDriver(self.admission))
+        assert len(drivers) == 2
+        assert not any(driver.admitted for driver in drivers.values())
+        for driver in drivers.values():
+            driver.quit()
+        assert self.get_held_slots() == 3
+
+    def test_only_capped_quantity_is_admitted(self):
+        drivers = self.acquire(4, lambda: StubDriver(self.admission))
+        assert len([driver for driver in drivers.values() if driver.admitted]) == 3
+        assert self.get_held_slots() == 3
+        for driver in drivers.values():
+            driver.quit()
+        assert self.get_held_slots() == 0
+
+    def test_slot_of_failed_session_is_returned(self):
+        attempts = list()
+
+        def factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise MaxRetryError(None, '/session', 'Sauce concurrency is exceeded')
+            return StubDriver(self.admission)
+
+        pool = DriverPool(retries=1, admission=self.admission)
+        drivers = self.loop.run_until_complete(pool.acquire(3, factory, name='TestGroup'))
+        assert len(drivers) == 2
+        assert all(driver.admitted for driver in drivers.values())
+        assert self.get_held_slots() == 2
+
+
+class TestAdmissionContention(object):
+
+    @pytest.fixture(autouse=True)
+    def fake_sauce(self, tmp_path):
+        self.admission = SessionAdmission(max_sessions=4, path=str(tmp_path / 'slots.json'), poll=0.05, timeout=60)
+        self.sauce = FakeSauce(concurrency=4, path=str(tmp_path / 'sauce.json'))
+        self.events_path = str(tmp_path / 'events.json')
+        self.context = multiprocessing.get_context('fork')
+        self.processes = list()
+        yield
+        for process in self.processes:
+            process.join(30)
+
+    def start_group(self, name, quantity, hold=0.2):
+        process = self.context.Process(target=run_group,
+                                       args=(self.admission, self.sauce, self.events_path, name, quantity, hold))
+        process.start()
+        self.processes.append(process)
+        return process
+
+    def wait_for_queue(self, length):
+        for _ in range(200):
+            with self.admission.state() as state:
+                if len(state['queue']) == length:
+                    return
+            time.sleep(0.05)
+        pytest.fail("%s requests are not queued" % length)
+
+    def get_events(self, event):
+        if not os.path.exists(self.events_path):
+            return dict()
+        with open(self.events_path) as events_file:
+            return {i['name']: i['quantity'] for i in json.load(events_file) if i['event'] == event}
+
+    def test_sessions_of_competing_workers_never_exceed_max_sessions(self):
+        for i, quantity in enumerate((3, 2, 1, 4, 2, 3, 1, 2)):
+            self.start_group('TestGroup%s' % i, quantity)
+        for process in self.processes:
+            process.join(60)
+            assert process.exitcode == 0
+        stats = self.sauce.get_stats()
+        assert stats['rejected'] == 0
+        assert stats['open'] == 0
+        assert stats['max_open'] <= 4
+        granted = self.get_events('granted')
+        assert len(granted) == 8 and all(granted.values())
+
+    def test_requests_are_granted_in_order_of_arrival(self):
+        assert self.admission.acquire(4, 'TestHolder') == 4
+        self.start_group('TestThreeSessions', 3, hold=0.5)
+        self.wait_for_queue(1)
+        self.start_group('TestOneSession', 1)
+        self.wait_for_queue(2)
+        # one slot would be enough for the second request, but it doesn't overtake the first one
+        self.admission.release(2)
+        time.sleep(0.5)
+        assert self.get_events('granted') == dict()
+        self.admission.release(2)
+        for process in self.processes:
+            process.join(60)
+            assert process.exitcode == 0
+        assert self.get_events('granted') == {'TestThreeSessions': 3, 'TestOneSession': 1}
+        assert self.sauce.get_stats()['rejected'] == 0
@@ -0,0 +1,24 @@
+import pytest
+
+from support.account_snapshots import AccountSnapshots
+from tests import test_suite_data
+from tests.base_test_case import SingleDeviceTestCase
+from views.dbs.recipes import recipes
+from views.sign_in_view import SignInView
+
+
+@pytest.mark.xdist_group(name="account_snapshots")
+class TestAccountSnapshots(SingleDeviceTestCase):
+    """
+    Generates account snapshots for the build under test: python -m pytest tests/non_func/test_snapshots.py --apk=...
+    Fresh snapshots are skipped, use -k to generate some of them.
+    """
+
+    @pytest.mark.parametrize('name', sorted(recipes))
+    def test_generate_snapshot(self, name):
+        snapshots = AccountSnapshots(build=test_suite_data.apk_name)
+        if snapshots.is_fresh(recipes[name]):
+            pytest.skip("Snapshot '%s' is up to date" % name)
+        SignInView(self.driver).generate_snapshot(snapshots, recipes[name])
+        if not snapshots.is_fresh(recipes[name]):
+            self.driver.fail("Snapshot '%s' is not saved" % name)
@@ -5,7 +5,7 @@ import pytest
 from tests import marks, common_password
 from tests.base_test_case import MultipleSharedDeviceTestCase, create_shared_drivers
 from tests.users import transaction_senders, basic_user, ens_user, ens_user_message_sender
-from views.sign_in_view import SignInView
+from views.sign_in_view import SignInView, onboard_devices
 
 
 @pytest.mark.xdist_group(name="four_2")
@@ -16,8 +16,9 @@ class TestCommandsMultipleDevicesMerged(MultipleSharedDeviceTestCase):
         self.drivers, self.loop = create_shared_drivers(2)
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
         self.sender = transaction_senders['ETH_STT_3']
-        self.home_1 = self.device_1.recover_access(passphrase=self.sender['passphrase'], enable_notifications=True)
-        self.home_2 = self.device_2.create_user()
+        (self.home_1, self.home_2), _ = onboard_devices(
+            (self.device_1, self.device_2), ({'passphrase': self.sender['passphrase'], 'enable_notifications': True},
+                                             dict()))
         for home in self.home_1, self.home_2:
             profile = home.profile_button.click()
             profile.profile_notifications_button.scroll_and_click()
@@ -215,8 +216,8 @@ class TestOneToOneChatMultipleSharedDevices(MultipleSharedDeviceTestCase):
     def prepare_devices(self):
         self.drivers, self.loop = create_shared_drivers(2)
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
-        self.home_1 = self.device_1.create_user(enable_notifications=True)
-        self.home_2 = self.device_2.create_user(enable_notifications=True)
+        (self.home_1, self.home_2), _ = onboard_devices(
+            (self.device_1, self.device_2), ({'enable_notifications': True}, {'enable_notifications': True}))
         self.profile_1 = self.home_1.profile_button.click()
         self.default_username_1 = self.profile_1.default_username_text.text
         self.profile_1.home_button.click()
@@ -285,8 +286,9 @@ class TestContactBlockMigrateKeycardMultipleSharedDevices(MultipleSharedDeviceTe
         self.nick = "FFOO_brak!1234"
         self.message = self.device_1.get_random_message()
         self.pub_chat_name = self.device_1.get_random_chat_name()
-        self.home_1 = self.device_1.recover_access(self.sender['passphrase'], keycard=True)
-        self.home_2 = self.device_2.create_user()
+        (self.home_1, self.home_2), _ = onboard_devices((self.device_1, self.device_2),
+                                                        ({'passphrase': self.sender['passphrase'], 'keycard': True},
+                                                         dict()))
         self.profile_2 = self.home_2.profile_button.click()
         self.profile_2.privacy_and_security_button.click()
         self.profile_2.backup_recovery_phrase_button.click()
@@ -571,8 +573,9 @@ class TestEnsStickersMultipleDevicesMerged(MultipleSharedDeviceTestCase):
         self.drivers, self.loop = create_shared_drivers(2)
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
         self.sender, self.reciever = transaction_senders['ETH_3'], ens_user
-        self.home_1 = self.device_1.recover_access(passphrase=self.sender['passphrase'])
-        self.home_2 = self.device_2.recover_access(ens_user['passphrase'], enable_notifications=True)
+        (self.home_1, self.home_2), _ = onboard_devices(
+            (self.device_1, self.device_2), ({'passphrase': self.sender['passphrase']},
+                                             {'passphrase': ens_user['passphrase'], 'enable_notifications': True}))
         self.ens = '@%s' % self.reciever['ens']
         self.pub_chat_name = self.home_1.get_random_chat_name()
         self.chat_1 = self.home_1.join_public_chat(self.pub_chat_name)
@@ -6,7 +6,7 @@ from tests import common_password
 from tests import marks
 from tests.base_test_case import MultipleSharedDeviceTestCase, create_shared_drivers
 from views.chat_view import CommunityView
-from views.sign_in_view import SignInView
+from views.sign_in_view import SignInView, onboard_devices
 
 
 @pytest.mark.xdist_group(name='five_2')
@@ -16,7 +16,8 @@ class TestProfileGapsCommunityMediumMultipleDevicesMerged(MultipleSharedDeviceTe
     def prepare_devices(self):
         self.drivers, self.loop = create_shared_drivers(2)
         self.device_1, self.device_2 = SignInView(self.drivers[0]), SignInView(self.drivers[1])
-        self.home_1, self.home_2 = self.device_1.create_user(enable_notifications=True), self.device_2.create_user(enable_notifications=True)
+        (self.home_1, self.home_2), _ = onboard_devices(
+            (self.device_1, self.device_2), ({'enable_notifications': True}, {'enable_notifications': True}))
         self.public_key_1, self.default_username_1 = self.home_1.get_public_key()
         self.public_key_2, self.default_username_2 = self.home_2.get_public_key()
         [home.home_button.click() for home in (self.home_1, self.home_2)]
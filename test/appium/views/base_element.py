@@ -1,4 +1,5 @@
 import base64
+import functools
 import os
 import time
 from io import BytesIO
@@ -8,15 +9,144 @@ import emoji
 import imagehash
 from PIL import Image, ImageChops, ImageStat
 from appium.webdriver.common.mobileby import MobileBy
-from appium.webdriver.common.touch_action import TouchAction
 from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions
-from selenium.webdriver.support.wait import WebDriverWait
 
-from tests import transl
+from support.gestures import Gestures
+from support.locator_compiler import LocatorCompiler
+from support.wait_engine import AdaptiveWait, ServerSideWait
+from tests import transl, element_profiler, pytest_config_global, driver_metrics, test_suite_data
+
+PROFILED_ACTIONS = ('find_element', 'click', 'scroll_to_element', 'send_keys')
+
+
+def profiled(method):
+    if getattr(method, 'profiled', False):
+        return method
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with element_profiler.measure(self, method.__name__):
+            return method(self, *args, **kwargs)
+
+    wrapper.profiled = True
+    return wrapper
+
+
+class LazyElement(object):
+    """
+    Element declared on view class: it is constructed (and its locator is compiled) on first access
+    and cached per driver, so views don't construct elements which are never used by test.
+
+    usage:
+
+    class HomeView(BaseView):
+        plus_button = LazyElement(Button, accessibility_id="new-chat-button")
+
+    """
+
+    def __init__(self, element_class, **kwargs):
+        self.element_class = element_class
+        self.kwargs = kwargs
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        driver = view.driver
+        try:
+            elements = driver.lazy_elements
+        except AttributeError:
+            elements = driver.lazy_elements = dict()
+        try:
+            return elements[self]
+        except KeyError:
+            element = elements[self] = self.element_class(driver, **self.kwargs)
+            return element
+
+
+class ChildElement(object):
+    """
+    Element located relatively to its parent element, declared once on parent element class.
+    `%s` in XPath template is replaced by parent locator, otherwise template is appended to it;
+    compiled locators are cached per parent locator. Child element class is built once (`name` sets its class name,
+    which is shown in logs). With `relative=True` (for descendant `//...` templates only) child is looked up inside
+    of already found parent WebElement instead of querying the whole tree from the root.
+
+    usage:
+
+    class ChatElementByText(Text):
+        member_photo = ChildElement(Button, "//*[@content-desc='user-avatar']", name='MemberPhoto', relative=True)
+        timestamp_command_message = ChildElement(Button, "(%s//android.widget.TextView)[last()]")
+
+    """
+
+    def __init__(self, element_class, template: str, name: str = None, relative: bool = False,
+                 parent_locator: str = 'locator'):
+        if relative and not template.startswith('//'):
+            raise ValueError("Only descendant XPath can be found inside of parent element, got '%s'" % template)
+        self.element_class = element_class
+        self.template = template
+        self.name = name
+        self.relative = relative
+        self.parent_locator = parent_locator
+        self.locators = dict()
+
+    def __set_name__(self, owner, attr_name):
+        if self.name or self.relative:
+            attrs = {'find_element': self.get_find_element()} if self.relative else dict()
+            self.element_class = type(self.name or self.element_class.__name__, (self.element_class,), attrs)
+
+    def get_find_element(self):
+        base_class, relative_xpath = self.element_class, '.' + self.template
+
+        def find_element(element):
+            parent = getattr(element, 'parent_element', None)
+            if parent is None:
+                return base_class.find_element(element)
+            element_cache = element.driver.get_element_cache()
+            cached_element = element_cache.get(element.by, element.locator)
+            if cached_element is not None:
+                return cached_element
+            element.driver.info("Find `%s` inside of `%s` by `xpath`: `%s`" % (element.name, parent.name, relative_xpath))
+            try:
+                return element_cache.put(element.by, element.locator,
+                                         parent.find_element().find_element(MobileBy.XPATH, relative_xpath))
+            except NoSuchElementException:
+                raise NoSuchElementException(
+                    "Device %s: %s by xpath: `%s` is not found inside of %s" % (
+                        element.driver.number, element.name, relative_xpath, parent.name)) from None
+
+        return find_element
+
+    def get_locator(self, parent_locator):
+        try:
+            return self.locators[parent_locator]
+        except KeyError:
+            if '%s' in self.template:
+                locator = self.template % parent_locator
+            else:
+                locator = parent_locator + self.template
+            self.locators[parent_locator] = locator
+            return locator
+
+    def __get__(self, parent, owner=None):
+        if parent is None:
+            return self
+        element = self.element_class(parent.driver, xpath=self.get_locator(getattr(parent, self.parent_locator)))
+        if self.relative:
+            element.parent_element = parent
+        return element
 
 
 class BaseElement(object):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # overridden actions of page objects (e.g. `click` with navigation) are profiled as well
+        for attr, value in list(cls.__dict__.items()):
+            if callable(value) and (attr in PROFILED_ACTIONS or attr.startswith('wait_for_')):
+                setattr(cls, attr, profiled(value))
+
     def __init__(self, driver, **kwargs):
         self.driver = driver
         self.by = MobileBy.XPATH
@@ -31,6 +161,8 @@ class BaseElement(object):
         self.class_name = None
         self.AndroidUIAutomator = None
         self.webview = None
+        self.text_selector = None
+        self.xpath_locator = None
 
         self.__dict__.update(kwargs)
         self.set_locator()
@@ -48,6 +180,8 @@ class BaseElement(object):
                 self.locator = '//*[@text="%s" or @text="%s"]' % (text, text.upper())
             if self.suffix:
                 self.locator += self.suffix
+            elif not self.prefix:
+                self.text_selector = LocatorCompiler.get_text_selector(text, self.uppercase)
         elif self.id:
             self.by = MobileBy.ID
             self.locator = self.id
@@ -61,6 +195,10 @@ class BaseElement(object):
             self.locator = '//*[@text="{0}"] | //*[@content-desc="{desc}"]'.format(self.webview, desc=self.webview)
         if self.prefix:
             self.locator = self.prefix + self.locator
+        if self.text_selector:
+            self.xpath_locator = self.locator
+            self.by, self.locator = LocatorCompiler.compile(pytest_config_global.get('locator_strategy', 'xpath'),
+                                                            self.by, self.locator, self.text_selector)
         return self
 
     @property
@@ -70,11 +208,19 @@ class BaseElement(object):
     def navigate(self):
         return None
 
+    @profiled
     def find_element(self):
+        element_cache = self.driver.get_element_cache()
+        element = element_cache.get(self.by, self.locator)
+        if element is not None:
+            return element
         for _ in range(3):
             try:
                 self.driver.info("Find `%s` by `%s`: `%s`" % (self.name, self.by, self.exclude_emoji(self.locator)))
-                return self.driver.find_element(self.by, self.locator)
+                element = self.driver.find_element(self.by, self.locator)
+                if self.text_selector and pytest_config_global.get('locator_benchmark'):
+                    self.benchmark_locators()
+                return element_cache.put(self.by, self.locator, element)
             except NoSuchElementException:
                 raise NoSuchElementException(
                     "Device %s: %s by %s: `%s` is not found on the screen" % (
@@ -86,8 +232,28 @@ class BaseElement(object):
     def find_elements(self):
         return self.driver.find_elements(self.by, self.locator)
 
+    def with_element(self, action):
+        # cached element may be re-rendered since it was found, then it is found again once
+        try:
+            return action(self.find_element())
+        except StaleElementReferenceException:
+            if not self.driver.get_element_cache().discard(self.by, self.locator):
+                raise
+            return action(self.find_element())
+
+    def benchmark_locators(self):
+        # compares both strategies on the same screen, results are aggregated by element profiler
+        found = dict()
+        for by, locator in ((MobileBy.XPATH, self.xpath_locator), (MobileBy.ANDROID_UIAUTOMATOR, self.text_selector)):
+            start_time = time.time()
+            found[by] = len(self.driver.find_elements(by, locator))
+            element_profiler.record(self.__class__.__name__, by, 'benchmark_find_elements', time.time() - start_time)
+        if len(set(found.values())) > 1:
+            self.driver.info("Locator strategies found different elements for `%s`: %s" % (self.name, found))
+
+    @profiled
     def click(self):
-        self.find_element().click()
+        self.with_element(lambda element: element.click())
         self.driver.info('Tap on found: %s' % self.name)
         return self.navigate()
 
@@ -113,42 +279,84 @@ class BaseElement(object):
         self.driver.info('Double tap on: %s' % self.name)
         [self.find_element().click() for _ in range(2)]
 
+    def wait(self, seconds, ignored_exceptions=None, name='wait'):
+        return AdaptiveWait(self.driver, seconds, ignored_exceptions=ignored_exceptions, name=name,
+                            metrics=driver_metrics)
+
+    def server_side_wait(self, seconds, name='wait'):
+        if pytest_config_global.get('wait_backend', 'server') != 'server':
+            return None
+        current_test = test_suite_data.current_test
+        return ServerSideWait(self.driver, seconds, name=name + ':server', metrics=driver_metrics,
+                              test_name=current_test.name if current_test else None)
+
+    def wait_for_presence(self, seconds, name):
+        server_side_wait = self.server_side_wait(seconds, name)
+        if server_side_wait:
+            elements = server_side_wait.until_present(self.by, self.locator)
+            if not elements:
+                raise TimeoutException()
+            return elements
+        return self.wait(seconds, name=name) \
+            .until(expected_conditions.presence_of_all_elements_located((self.by, self.locator)))
+
+    @profiled
     def wait_for_element(self, seconds=10):
         try:
-            return WebDriverWait(self.driver, seconds) \
-                .until(expected_conditions.presence_of_element_located((self.by, self.locator)))
+            element = self.wait_for_presence(seconds, name='wait_for_element')[0]
+            return self.driver.get_element_cache().put(self.by, self.locator, element)
         except TimeoutException:
             raise TimeoutException(
                 "Device `%s`: `%s` by` %s`: `%s` is not found on the screen after wait_for_element" % (
                     self.driver.number, self.name, self.by, self.locator)) from None
 
+    @profiled
     def wait_for_elements(self, seconds=10):
         try:
-            return WebDriverWait(self.driver, seconds) \
-                .until(expected_conditions.presence_of_all_elements_located((self.by, self.locator)))
+            return self.wait_for_presence(seconds, name='wait_for_elements')
         except TimeoutException:
             raise TimeoutException(
                 "Device %s:  %s by %s:`%s` is not found on the screen after wait_for_elements" % (
                     self.driver.number, self.name, self.by, self.locator)) from None
 
+    @profiled
     def wait_for_visibility_of_element(self, seconds=10, ignored_exceptions=None):
         try:
-            return WebDriverWait(self.driver, seconds, ignored_exceptions=ignored_exceptions) \
+            element = self.wait(seconds, ignored_exceptions, name='wait_for_visibility_of_element') \
                 .until(expected_conditions.visibility_of_element_located((self.by, self.locator)))
+            return self.driver.get_element_cache().put(self.by, self.locator, element)
         except TimeoutException:
             raise TimeoutException(
                 "Device %s: %s by %s:`%s` is not found on the screen after wait_for_visibility_of_element" % (
                     self.driver.number, self.name, self.by, self.locator)) from None
 
+    @profiled
     def wait_for_invisibility_of_element(self, seconds=10):
         try:
-            return WebDriverWait(self.driver, seconds) \
+            return self.wait(seconds, name='wait_for_invisibility_of_element') \
                 .until(expected_conditions.invisibility_of_element_located((self.by, self.locator)))
         except TimeoutException:
             raise TimeoutException(
                 "Device %s: %s by %s: `%s`  is still visible on the screen after %s seconds after wait_for_invisibility_of_element" % (
                     self.driver.number, self.name, self.by, self.locator, seconds)) from None
 
+    @profiled
+    def wait_for_absence_of_element(self, seconds=10):
+        server_side_wait = self.server_side_wait(seconds, name='wait_for_absence_of_element')
+        absent = server_side_wait.until_absent(self.by, self.locator) if server_side_wait else None
+        if absent is None:
+            try:
+                absent = self.wait(seconds, name='wait_for_absence_of_element') \
+                    .until(lambda driver: not driver.find_elements(self.by, self.locator))
+            except TimeoutException:
+                absent = False
+        if not absent:
+            raise TimeoutException(
+                "Device %s: %s by %s: `%s` is still on the screen after %s seconds after wait_for_absence_of_element" % (
+                    self.driver.number, self.name, self.by, self.locator, seconds))
+        return absent
+
+    @profiled
     def wait_for_rendering_ended_and_click(self, attempts=3):
         for i in range(attempts):
             try:
@@ -161,26 +369,26 @@ class BaseElement(object):
             msg="Device %s: continuous rendering, can't click an element by %s: %s" % (
                 self.driver.number, self.by, self.locator))
 
+    @profiled
     def wait_for_element_text(self, text, wait_time=30, message=None):
         if not isinstance(text, str):
             text = str(text)
         self.driver.info("Wait for text element `%s` to be equal to `%s`" % (self.name, text))
         element_text = str()
-        counter = 0
-        while counter < wait_time:
-            try:
-                element_text = self.find_element().text.strip()
-            except StaleElementReferenceException:
-                time.sleep(1)
-                element_text = self.find_element().text.strip()
-            if element_text == text:
-                self.driver.info('Element %s text is equal to %s' % (self.name, text))
-                return
-            counter += 10
-            time.sleep(10)
-        self.driver.fail(message if message else "`%s` is not equal to expected `%s` in %s sec" % (
-            element_text, text, wait_time))
 
+        def is_text_equal(driver):
+            nonlocal element_text
+            element_text = driver.find_element(self.by, self.locator).text.strip()
+            return element_text == text
+
+        try:
+            self.wait(wait_time, StaleElementReferenceException, name='wait_for_element_text').until(is_text_equal)
+        except TimeoutException:
+            self.driver.fail(message if message else "`%s` is not equal to expected `%s` in %s sec" % (
+                element_text, text, wait_time))
+        self.driver.info('Element %s text is equal to %s' % (self.name, text))
+
+    @profiled
     def scroll_to_element(self, depth: int = 9, direction='down'):
         self.driver.info('Scrolling %s to %s' % (direction, self.name))
         for _ in range(depth):
@@ -207,7 +415,22 @@ class BaseElement(object):
     #     except TimeoutException:
     #         return False
 
+    def is_element_displayed_in_snapshot(self, sec=5):
+        end_time = time.time() + sec
+        snapshot = self.driver.get_page_snapshot()
+        while True:
+            displayed = snapshot.is_element_displayed(self.by, self.locator)
+            if displayed is not False or time.time() >= end_time:
+                return displayed
+            time.sleep(1)
+            snapshot = self.driver.get_page_snapshot(refresh=True)
+
     def is_element_displayed(self, sec=5, ignored_exceptions=None):
+        if getattr(self.driver, 'snapshot_depth', 0):
+            displayed = self.is_element_displayed_in_snapshot(sec)
+            if displayed is not None:
+                self.driver.info("`%s` is %sdisplayed in page snapshot" % (self.name, '' if displayed else 'not '))
+                return displayed
         try:
             return self.wait_for_visibility_of_element(sec, ignored_exceptions=ignored_exceptions)
         except TimeoutException:
@@ -225,7 +448,7 @@ class BaseElement(object):
 
     @property
     def text(self):
-        return self.find_element().text
+        return self.with_element(lambda element: element.text)
 
     @property
     def template(self):
@@ -240,10 +463,10 @@ class BaseElement(object):
 
     @property
     def image(self):
-        return Image.open(BytesIO(base64.b64decode(self.find_element().screenshot_as_base64)))
+        return Image.open(BytesIO(base64.b64decode(self.with_element(lambda element: element.screenshot_as_base64))))
 
     def attribute_value(self, value):
-        attribute_value = self.find_element().get_attribute(value)
+        attribute_value = self.with_element(lambda element: element.get_attribute(value))
         if attribute_value.lower() == 'true':
             attribute_state = True
         elif attribute_value.lower() == 'false':
@@ -255,7 +478,7 @@ class BaseElement(object):
     # Method-helper for renew screenshots in case if changed
     def save_new_screenshot_of_element(self, name: str):
         full_path_to_file = os.sep.join(__file__.split(os.sep)[:-1]) + '/elements_templates/%s' % name
-        screen = Image.open(BytesIO(base64.b64decode(self.find_element().screenshot_as_base64)))
+        screen = Image.open(BytesIO(base64.b64decode(self.with_element(lambda element: element.screenshot_as_base64))))
         screen.save(full_path_to_file)
 
     def is_element_image_equals_template(self, file_name: str = ''):
@@ -282,10 +505,9 @@ class BaseElement(object):
         return not bool(template - element_image)
 
     def get_element_coordinates(self):
-        element = self.find_element()
-        location = element.location
-        size = element.size
-        return location, size
+        # location and size in one request
+        rect = self.with_element(lambda element: element.rect)
+        return {'x': rect['x'], 'y': rect['y']}, {'width': rect['width'], 'height': rect['height']}
 
     def swipe_left_on_element(self):
         self.driver.info("Swiping left on element %s" % self.name)
@@ -302,34 +524,27 @@ class BaseElement(object):
         self.driver.swipe(start_x=x, start_y=y + height / 2, end_x=x + width * width_percentage, end_y=y + height / 2)
 
     def swipe_to_web_element(self, depth=700):
-        element = self.find_element()
-        location = element.location
+        location, _ = self.get_element_coordinates()
         x, y = location['x'], location['y']
         self.driver.swipe(start_x=x, start_y=y, end_x=x, end_y=depth)
 
     def long_press_element(self):
-        element = self.find_element()
         self.driver.info("Long press on `%s`" % self.name)
-        action = TouchAction(self.driver)
-        action.long_press(element).release().perform()
+        self.with_element(lambda element: Gestures.long_click(self.driver, element))
 
     def long_press_until_element_is_shown(self, expected_element):
         element = self.find_element()
         self.driver.info("Long press on `%s` until expected element is shown" % self.name)
-        action = TouchAction(self.driver)
         for _ in range(3):
-            action.long_press(element).release().perform()
+            Gestures.long_click(self.driver, element)
             if expected_element.is_element_displayed():
                 return
 
     def long_press_element_by_coordinate(self, rel_x=0.8, rel_y=0.8):
-        element = self.find_element()
-        location = element.location
-        size = element.size
+        location, size = self.get_element_coordinates()
         x = int(location['x'] + size['width'] * rel_x)
         y = int(location['y'] + size['height'] * rel_y)
-        action = TouchAction(self.driver)
-        action.long_press(x=x, y=y).release().perform()
+        Gestures.long_click(self.driver, x=x, y=y)
 
     def measure_time_before_element_appears(self, max_wait_time=30):
         def wrapper():
@@ -347,7 +562,7 @@ class BaseElement(object):
         location, size = self.get_element_coordinates()
         x = int(location['x'] + size['width'] * rel_x)
         y = int(location['y'] + size['height'] * rel_y)
-        [self.driver.tap([(x, y)], 150) for _ in range(times_to_click)]
+        Gestures(self.driver).tap(x, y, times=times_to_click).perform()
 
     @staticmethod
     def get_translation_by_key(key):
@@ -364,37 +579,31 @@ class EditBox(BaseElement):
         super(EditBox, self).__init__(driver, **kwargs)
 
     def send_keys(self, value):
-        self.find_element().send_keys(value)
+        self.with_element(lambda element: element.send_keys(value))
         self.driver.info("Type `%s` to `%s`" % (self.exclude_emoji(value), self.name))
 
     def clear(self):
-        self.find_element().clear()
+        self.with_element(lambda element: element.clear())
         self.driver.info("Clear text in `%s`" % self.name)
 
     def delete_last_symbols(self, number_of_symbols_to_delete: int):
         self.driver.info("Delete last `%s` symbols from `%s`" % (number_of_symbols_to_delete, self.name))
         self.click()
-        for _ in range(number_of_symbols_to_delete):
-            time.sleep(1)
-            self.driver.press_keycode(67)
+        Gestures(self.driver).press_key(Keys.BACKSPACE, times=number_of_symbols_to_delete).perform()
 
     def paste_text_from_clipboard(self):
         self.driver.info("Paste text from clipboard into `%s`" % self.name)
-        self.long_press_element()
-        time.sleep(2)
-        action = TouchAction(self.driver)
-        location = self.find_element().location
+        location, size = self.get_element_coordinates()
         x, y = location['x'], location['y']
-        action.press(x=x + 25, y=y - 50).release().perform()
+        # long press in the middle of the field, then tap 'Paste' in context menu above it
+        Gestures(self.driver).long_press(x + size['width'] / 2, y + size['height'] / 2).pause(2) \
+            .tap(x + 25, y - 50).perform()
 
     def cut_text(self):
         self.driver.info("Cut text in `%s`" % self.name)
-        location = self.find_element().location
+        location, _ = self.get_element_coordinates()
         x, y = location['x'], location['y']
-        action = TouchAction(self.driver)
-        action.long_press(x=x, y=y).release().perform()
-        time.sleep(2)
-        action.press(x=x + 50, y=y - 50).release().perform()
+        Gestures(self.driver).long_press(x, y).pause(2).tap(x + 50, y - 50).perform()
 
 
 class Text(BaseElement):
@@ -403,7 +612,7 @@ class Text(BaseElement):
 
     @property
     def text(self):
-        text = self.find_element().text
+        text = self.with_element(lambda element: element.text)
         self.driver.info("`%s` is `%s`" % (self.name, text))
         return text
 
@@ -427,9 +636,13 @@ class Button(BaseElement):
 
 class SilentButton(Button):
     def find_element(self):
+        element_cache = self.driver.get_element_cache()
+        element = element_cache.get(self.by, self.locator)
+        if element is not None:
+            return element
         for _ in range(3):
             try:
-                return self.driver.find_element(self.by, self.locator)
+                return element_cache.put(self.by, self.locator, self.driver.find_element(self.by, self.locator))
             except NoSuchElementException:
                 raise NoSuchElementException(
                     "Device %s: `%s` by `%s`:`%s` not found on the screen" % (
@@ -439,12 +652,12 @@ class SilentButton(Button):
                     continue
 
     def click(self):
-        self.find_element().click()
+        self.with_element(lambda element: element.click())
         return self.navigate()
 
     @property
     def text(self):
-        text = self.find_element().text
+        text = self.with_element(lambda element: element.text)
         return text
 
 
@@ -3,6 +3,7 @@ import random
 import re
 import string
 import time
+from contextlib import contextmanager
 from datetime import datetime
 
 from appium.webdriver import WebElement
@@ -12,8 +13,9 @@ from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.wait import WebDriverWait
 
 from support.device_apps import start_web_browser
+from support.text_input import TextInput
 from tests import common_password, pytest_config_global, transl
-from views.base_element import Button, BaseElement, EditBox, Text, CheckBox
+from views.base_element import Button, BaseElement, EditBox, Text, CheckBox, LazyElement
 
 
 class BackButton(Button):
@@ -239,87 +241,90 @@ class SignInPhraseText(Text):
 
 
 class BaseView(object):
+    send_message_button = LazyElement(SendMessageButton)
+    send_contact_request_button = LazyElement(Button, translation_id="send-request")
+    password_input = LazyElement(EditBox, accessibility_id="password-input")
+
+    # Old UI Tabs
+    home_button = LazyElement(HomeButton)
+    wallet_button = LazyElement(WalletButton)
+    profile_button = LazyElement(ProfileButton)
+    dapp_tab_button = LazyElement(DappTabButton)
+    status_button = LazyElement(StatusButton)
+
+    # New UI Tabs
+    communities_tab = LazyElement(CommunitiesTab)
+    chats_tab = LazyElement(ChatsTab)
+    browser_tab = LazyElement(BrowserTab)
+    wallet_tab = LazyElement(WalletTab)
+
+    # Floating screens (introduced by https://github.com/status-im/status-mobile/pull/16438)
+    chat_floating_screen = LazyElement(BaseElement, accessibility_id=":chat-floating-screen")
+    community_floating_screen = LazyElement(BaseElement, accessibility_id=":community-overview-floating-screen")
+    discover_communities_floating_screen = LazyElement(BaseElement,
+                                                       accessibility_id=":discover-communities-floating-screen")
+
+    jump_to_button = LazyElement(Button, accessibility_id="jump-to")
+
+    yes_button = LazyElement(Button, xpath="//*[@text='YES' or @text='GOT IT']")
+    no_button = LazyElement(Button, translation_id="no")
+    back_button = LazyElement(BackButton)
+    allow_button = LazyElement(AllowButton)
+    allow_all_the_time = LazyElement(Button, xpath="//*[@text='Allow all the time']")
+    deny_button = LazyElement(Button, translation_id="deny", uppercase=True)
+    continue_button = LazyElement(Button, translation_id="continue", uppercase=True)
+    ok_button = LazyElement(Button, xpath="//*[@text='OK' or @text='Ok']")
+    next_button = LazyElement(Button, translation_id="next")
+    add_button = LazyElement(Button, translation_id="add")
+    save_button = LazyElement(Button, translation_id="save")
+    done_button = LazyElement(Button, translation_id="done")
+    delete_button = LazyElement(Button, translation_id="delete", uppercase=True)
+    ok_continue_button = LazyElement(Button, xpath="//*[@text='OK, CONTINUE' or @text='Okay, continue']")
+    discard_button = LazyElement(Button, xpath="//*[@text='DISCARD']")
+    confirm_button = LazyElement(Button, translation_id='confirm', uppercase=True)
+
+    cross_icon = LazyElement(Button, xpath="(//android.widget.ImageView[@content-desc='icon'])[1]")
+    close_sticker_view_icon = LazyElement(Button, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
+    native_close_button = LazyElement(Button, id="android:id/aerr_close")
+    close_button = LazyElement(Button, accessibility_id="back-button")
+    navigate_up_button = LazyElement(Button, accessibility_id="Navigate Up")
+    show_roots_button = LazyElement(Button, accessibility_id="Show roots")
+    get_started_button = LazyElement(Button, translation_id="get-started")
+    ok_got_it_button = LazyElement(Button, translation_id="ok-got-it")
+    cross_icon_inside_welcome_screen_button = LazyElement(Button, accessibility_id='hide-home-button')
+    status_in_background_button = LazyElement(Button, xpath="//*[contains(@content-desc,'Status')]")
+    cancel_button = LazyElement(Button, translation_id="cancel", uppercase=True)
+    search_input = LazyElement(EditBox, accessibility_id="search-input")
+    share_button = LazyElement(Button, accessibility_id="share-my-contact-code-button")
+    qr_code_image = LazyElement(Button, accessibility_id="qr-code-image")
+    sign_in_phrase = LazyElement(SignInPhraseText)
+    toast_content_element = LazyElement(BaseElement, accessibility_id="toast-content")
+
+    # checkboxes and toggles
+    checkbox_button = LazyElement(CheckBox, accessibility_id="checkbox-off")
+
+    # external browser
+    open_in_status_button = LazyElement(OpenInStatusButton)
+
+    apps_button = LazyElement(Button, accessibility_id="Apps")
+    status_app_icon = LazyElement(Button, translation_id="status")
+    airplane_mode_button = LazyElement(AirplaneModeButton)
+    enter_qr_edit_box = LazyElement(EnterQRcodeEditBox)
+
+    element_types = {
+        'base': BaseElement,
+        'button': Button,
+        'edit_box': EditBox,
+        'text': Text
+    }
+
     def __init__(self, driver):
         self.driver = driver
-        self.send_message_button = SendMessageButton(self.driver)
-        self.send_contact_request_button = Button(self.driver, translation_id="send-request")
-        self.password_input = EditBox(self.driver, accessibility_id="password-input")
+
+    @property
+    def login_button(self):
         from views.sign_in_view import LogInButton
-        self.login_button = LogInButton(self.driver)
-
-        # Old UI Tabs
-        self.home_button = HomeButton(self.driver)
-        self.wallet_button = WalletButton(self.driver)
-        self.profile_button = ProfileButton(self.driver)
-        self.dapp_tab_button = DappTabButton(self.driver)
-        self.status_button = StatusButton(self.driver)
-
-        # New UI Tabs
-        self.communities_tab = CommunitiesTab(self.driver)
-        self.chats_tab = ChatsTab(self.driver)
-        self.browser_tab = BrowserTab(self.driver)
-        self.wallet_tab = WalletTab(self.driver)
-
-        # Floating screens (introduced by https://github.com/status-im/status-mobile/pull/16438)
-        self.chat_floating_screen = BaseElement(self.driver, accessibility_id=":chat-floating-screen")
-        self.community_floating_screen = BaseElement(self.driver,
-                                                     accessibility_id=":community-overview-floating-screen")
-        self.discover_communities_floating_screen = BaseElement(self.driver,
-                                                                accessibility_id=":discover-communities-floating-screen")
-
-        self.jump_to_button = Button(self.driver, accessibility_id="jump-to")
-
-        self.yes_button = Button(self.driver, xpath="//*[@text='YES' or @text='GOT IT']")
-        self.no_button = Button(self.driver, translation_id="no")
-        self.back_button = BackButton(self.driver)
-        self.allow_button = AllowButton(self.driver)
-        self.allow_all_the_time = Button(self.driver, xpath="//*[@text='Allow all the time']")
-        self.deny_button = Button(self.driver, translation_id="deny", uppercase=True)
-        self.continue_button = Button(self.driver, translation_id="continue", uppercase=True)
-        self.ok_button = Button(self.driver, xpath="//*[@text='OK' or @text='Ok']")
-        self.next_button = Button(self.driver, translation_id="next")
-        self.add_button = Button(self.driver, translation_id="add")
-        self.save_button = Button(self.driver, translation_id="save")
-        self.done_button = Button(self.driver, translation_id="done")
-        self.delete_button = Button(self.driver, translation_id="delete", uppercase=True)
-        self.ok_continue_button = Button(self.driver, xpath="//*[@text='OK, CONTINUE' or @text='Okay, continue']")
-        self.discard_button = Button(self.driver, xpath="//*[@text='DISCARD']")
-        self.confirm_button = Button(self.driver, translation_id='confirm', uppercase=True)
-
-        self.cross_icon = Button(self.driver, xpath="(//android.widget.ImageView[@content-desc='icon'])[1]")
-        self.close_sticker_view_icon = Button(self.driver, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
-        self.native_close_button = Button(self.driver, id="android:id/aerr_close")
-        self.close_button = Button(self.driver, accessibility_id="back-button")
-        self.navigate_up_button = Button(self.driver, accessibility_id="Navigate Up")
-        self.show_roots_button = Button(self.driver, accessibility_id="Show roots")
-        self.get_started_button = Button(self.driver, translation_id="get-started")
-        self.ok_got_it_button = Button(self.driver, translation_id="ok-got-it")
-        self.cross_icon_inside_welcome_screen_button = Button(self.driver, accessibility_id='hide-home-button')
-        self.status_in_background_button = Button(self.driver, xpath="//*[contains(@content-desc,'Status')]")
-        self.cancel_button = Button(self.driver, translation_id="cancel", uppercase=True)
-        self.search_input = EditBox(self.driver, accessibility_id="search-input")
-        self.share_button = Button(self.driver, accessibility_id="share-my-contact-code-button")
-        self.qr_code_image = Button(self.driver, accessibility_id="qr-code-image")
-        self.sign_in_phrase = SignInPhraseText(self.driver)
-        self.toast_content_element = BaseElement(self.driver, accessibility_id="toast-content")
-
-        # checkboxes and toggles
-        self.checkbox_button = CheckBox(self.driver, accessibility_id="checkbox-off")
-
-        # external browser
-        self.open_in_status_button = OpenInStatusButton(self.driver)
-
-        self.apps_button = Button(self.driver, accessibility_id="Apps")
-        self.status_app_icon = Button(self.driver, translation_id="status")
-        self.airplane_mode_button = AirplaneModeButton(self.driver)
-        self.enter_qr_edit_box = EnterQRcodeEditBox(self.driver)
-
-        self.element_types = {
-            'base': BaseElement,
-            'button': Button,
-            'edit_box': EditBox,
-            'text': Text
-        }
+        return LogInButton(self.driver)
 
     @property
     def status_account_name(self):
@@ -408,6 +413,10 @@ class BaseView(object):
         else:
             self.driver.info("Could not reach home view by pressing system back button")
 
+    def open_chats_tab(self):
+        self.navigate_back_to_home_view()
+        self.chats_tab.click()
+
     def navigate_back_to_chat_view(self, attempts=3):
         counter = 0
         element = self.get_chat_view().chat_message_input
@@ -452,24 +461,28 @@ class BaseView(object):
         self.driver.press_keycode(279)
 
     def send_as_keyevent(self, keyevent):
+        # appended to the focused field at cursor, unlike EditBox.send_keys which replaces field text
         self.driver.info("Sending as keyevent `%s`" % keyevent)
-        keys = {'0': 7, '1': 8, '2': 9, '3': 10, '4': 11, '5': 12, '6': 13, '7': 14, '8': 15, '9': 16,
-
-                ',': 55, '-': 69, '+': 81, '.': 56, '/': 76, '\\': 73, ';': 74, ' ': 62,
-                '[': 71, ']': 72, '=': 70, '\n': 66, '_': [69, 5], ':': [74, 5],
-
-                'a': 29, 'b': 30, 'c': 31, 'd': 32, 'e': 33, 'f': 34, 'g': 35, 'h': 36, 'i': 37, 'j': 38,
-                'k': 39, 'l': 40, 'm': 41, 'n': 42, 'o': 43, 'p': 44, 'q': 45, 'r': 46, 's': 47, 't': 48,
-                'u': 49, 'v': 50, 'w': 51, 'x': 52, 'y': 53, 'z': 54}
-        time.sleep(3)
-        for i in keyevent:
-            if i.isalpha() and i.isupper():
-                keycode, metastate = keys[i.lower()], 64  # META_SHIFT_LEFT_ON Constant Value: 64. Example: i='n' -> 'N'
-            elif type(keys[i]) is list:
-                keycode, metastate = keys[i][0], keys[i][1]
-            else:
-                keycode, metastate = keys[i], None
-            self.driver.press_keycode(keycode=keycode, metastate=metastate)
+        # real key events by default, callers rely on key presses (mentions, autocomplete)
+        TextInput(self.driver, pytest_config_global.get('text_input', 'keyevents')).send(keyevent)
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Elements displayed checks inside of the block are evaluated against one page source
+        which is refreshed only when element is not found there while its wait time is not over:
+
+        with self.home.snapshot():
+            for text in ('Web3', 'Software dev'):
+                self.home.element_by_text(text).is_element_displayed(10)
+        """
+        self.driver.snapshot_depth += 1
+        try:
+            yield self
+        finally:
+            self.driver.snapshot_depth -= 1
+            if not self.driver.snapshot_depth:
+                self.driver.page_snapshot = None
 
     def element_by_text(self, text, element_type='button'):
         element = self.element_types[element_type](self.driver)
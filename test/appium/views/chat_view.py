@@ -4,12 +4,12 @@ from datetime import datetime, timedelta
 from time import sleep
 
 import dateutil.parser
-from appium.webdriver.common.touch_action import TouchAction
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException, \
     InvalidElementStateException
 
-from tests import emojis, common_password
-from views.base_element import Button, EditBox, Text, BaseElement, SilentButton
+from support.gestures import Gestures
+from tests import emojis, common_password, pytest_config_global
+from views.base_element import Button, EditBox, Text, BaseElement, SilentButton, LazyElement, ChildElement
 from views.base_view import BaseView
 from views.home_view import HomeView
 from views.profile_view import ProfilePictureElement
@@ -126,6 +126,20 @@ class ChatElementByText(Text):
             self.message_locator = "//*[starts-with(@text,'%s')]" % text
         super().__init__(driver, prefix=self.message_locator, xpath="/ancestor::%s" % self.chat_item_locator)
 
+    image_in_reply = ChildElement(BaseElement, "//android.widget.ImageView", name='ImageInReply', relative=True)
+    timestamp_command_message = ChildElement(Button, "(%s//android.widget.TextView)[last()]", name='TimeStampText')
+    timestamp_text = ChildElement(Button, "%s//*[@content-desc='message-timestamp']", name='TimeStampText')
+    member_photo = ChildElement(Button, "//*[@content-desc='user-avatar']", name='MemberPhoto', relative=True)
+    username = ChildElement(Text, "/android.view.ViewGroup/android.widget.TextView[1]", name='Username')
+    collapse_icon = ChildElement(Button, "/../../..//android.widget.ImageView[@content-desc='icon']", name='Collapse')
+    sent_status_checkmark = ChildElement(Text, "//*[@content-desc='sent']")
+    replied_message = ChildElement(Text, "/preceding::android.widget.TextView[@content-desc='quoted-message']",
+                                   name='RepliedMessageText', parent_locator='message_locator')
+    replied_to_username = ChildElement(Text, "/preceding-sibling::*[1]/android.widget.TextView[1]",
+                                       name='RepliedToUsernameText', parent_locator='message_locator')
+    pinned_by_label = ChildElement(Text, "/../..//android.view.ViewGroup[@content-desc='pinned-by']",
+                                   name='PinnedByLabelText')
+
     def find_element(self):
         for _ in range(2):
             try:
@@ -133,49 +147,9 @@ class ChatElementByText(Text):
             except NoSuchElementException:
                 self.wait_for_visibility_of_element(20)
 
-    @property
-    def image_in_reply(self):
-        class ImageInReply(BaseElement):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator, xpath="//android.widget.ImageView")
-
-        try:
-            return ImageInReply(self.driver, self.locator)
-        except NoSuchElementException:
-            return ''
-
-    @property
-    def timestamp_command_message(self):
-        class TimeStampText(Button):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, xpath="(%s//android.widget.TextView)[last()]" % parent_locator)
-
-        return TimeStampText(self.driver, self.locator)
-
     @property
     def timestamp(self):
-        class TimeStampText(Button):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, xpath="%s//*[@content-desc='message-timestamp']" % parent_locator)
-
-        return TimeStampText(self.driver, self.locator).text
-
-    @property
-    def member_photo(self):
-        class MemberPhoto(Button):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator, xpath="//*[@content-desc='user-avatar']")
-
-        return MemberPhoto(self.driver, self.locator)
-
-    @property
-    def username(self):
-        class Username(Text):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator,
-                                 xpath="/android.view.ViewGroup/android.widget.TextView[1]")
-
-        return Username(self.driver, self.locator)
+        return self.timestamp_text.text
 
     @property
     def message_body(self):
@@ -199,12 +173,7 @@ class ChatElementByText(Text):
 
     @property
     def uncollapse(self) -> bool:
-        class Collapse(Button):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator,
-                                 xpath="/../../..//android.widget.ImageView[@content-desc='icon']")
-
-        return Collapse(self.driver, self.locator).is_element_displayed()
+        return self.collapse_icon.is_element_displayed()
 
     @property
     def status(self) -> str:
@@ -231,39 +200,40 @@ class ChatElementByText(Text):
     def wait_for_status_to_be(self, expected_status: str, timeout: int = 30):
         self.driver.info("Waiting for message to be sent for %s sec" % timeout)
         start_time = time.time()
-        current_status = 'not set'
-        while time.time() - start_time <= timeout:
+        if pytest_config_global.get('wait_backend', 'server') == 'server':
+            if expected_status == 'Sending':
+                status_xpath = "//*[@content-desc='message-sending']"
+            else:
+                Text(self.driver, xpath=self.locator).click()
+                status_xpath = "//*[@content-desc='message-status']/android.widget.TextView[@text='%s']" % expected_status
+            try:
+                # the rest of timeout is left for client polling
+                Text(self.driver, prefix=self.locator, xpath=status_xpath).wait_for_element(max(timeout // 2, 1))
+                return
+            except TimeoutException:
+                # status may be hidden until message is tapped again, checked by client polling
+                pass
+        # status is checked at least once, even if server side wait took the whole timeout
+        while True:
             current_status = self.status
             if current_status == expected_status:
                 return
+            if time.time() - start_time > timeout:
+                break
             time.sleep(1)
         raise TimeoutException("Message status was not changed to %s, it's %s" % (expected_status, current_status))
 
-    @property
-    def sent_status_checkmark(self) -> object:
-        return Text(self.driver, prefix=self.locator, xpath="//*[@content-desc='sent']")
-
     @property
     def replied_message_text(self):
-        class RepliedMessageText(Text):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator,
-                                 xpath="/preceding::android.widget.TextView[@content-desc='quoted-message']")
-
         try:
-            return RepliedMessageText(self.driver, self.message_locator).text
+            return self.replied_message.text
         except NoSuchElementException:
             return ''
 
     @property
     def replied_to_username_text(self):
-        class RepliedToUsernameText(Text):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator,
-                                 xpath="/preceding-sibling::*[1]/android.widget.TextView[1]")
-
         try:
-            return RepliedToUsernameText(self.driver, self.message_locator).text
+            return self.replied_to_username.text
         except NoSuchElementException:
             return ''
 
@@ -312,14 +282,6 @@ class ChatElementByText(Text):
         except NoSuchElementException:
             self.driver.fail("No image container is found in message!")
 
-    @property
-    def pinned_by_label(self):
-        class PinnedByLabelText(Text):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator,
-                                 xpath="/../..//android.view.ViewGroup[@content-desc='pinned-by']")
-
-        return PinnedByLabelText(self.driver, self.locator)
 
     @property
     def view_community_button(self):
@@ -374,53 +336,53 @@ class GroupChatInfoView(BaseView):
 
 
 class CommunityView(HomeView):
+    community_create_a_channel_button = LazyElement(Button, accessibility_id="community-create-channel")
+    channel_name_edit_box = LazyElement(EditBox, translation_id="name-your-channel-placeholder")
+    community_options_button = LazyElement(Button, accessibility_id="community-menu-button")
+    view_members_button = LazyElement(Button, accessibility_id="view-members")
+    community_info_button = LazyElement(Button, translation_id="community-info")
+    invite_button = LazyElement(Button, accessibility_id="community-invite-people")
+
+    # Community info page
+    community_membership_request_value = LazyElement(
+        Text, translation_id="members-label",
+        suffix='/following-sibling::android.view.ViewGroup/android.widget.TextView')
+    members_button = LazyElement(Button, translation_id="members-label")
+    community_info_picture = LazyElement(Button, accessibility_id="chat-icon")
+    leave_community_button = LazyElement(Button, translation_id="leave-community")
+    edit_community_button = LazyElement(Button, translation_id="edit-community")
+    share_community_button = LazyElement(Button, accessibility_id="share-community")
+    share_community_link_button = LazyElement(Button, accessibility_id="share-community-link")
+
+    # Members
+    invite_people_button = LazyElement(Button, accessibility_id="community-invite-people")
+    membership_requests_button = LazyElement(Button, translation_id="membership-requests")
+    share_invite_button = LazyElement(Button, accessibility_id="share-community-link")
+
+    # Requesting access to community / joining community
+    request_access_button = LazyElement(Button, translation_id="request-access")
+    membership_request_pending_text = LazyElement(Text, translation_id="membership-request-pending")
+    join_button = LazyElement(Button, accessibility_id="show-request-to-join-screen-button")
+    join_community_button = LazyElement(Button, accessibility_id="join-community-button")
+    follow_button = LazyElement(Button, translation_id="follow")
+    community_tags = LazyElement(BaseElement,
+                                 xpath="//*[@content-desc='chat-name-text']/../android.widget.HorizontalScrollView")
+
+    #### NEW UI
+    # Communities initial page
+    close_community_view_button = LazyElement(
+        Button, xpath="//*[@content-desc='community-options-for-community']/../*[1]//android.widget.ImageView")
+    community_description_text = LazyElement(Text, accessibility_id="community-description-text")
+    community_status_joined = LazyElement(Text, accessibility_id="status-tag-positive")
+    community_status_pending = LazyElement(Text, accessibility_id="status-tag-pending")
+
     def __init__(self, driver):
         super().__init__(driver)
 
         #### OLD UI
         # Main community page (list with channels)
         self.add_channel_button = HomeView(self.driver).plus_button
-        self.community_create_a_channel_button = Button(self.driver, accessibility_id="community-create-channel")
-        self.channel_name_edit_box = EditBox(self.driver, translation_id="name-your-channel-placeholder")
         self.channel_descripton = ChatView(self.driver).community_description_edit_box
-        self.community_options_button = Button(self.driver, accessibility_id="community-menu-button")
-        self.view_members_button = Button(self.driver, accessibility_id="view-members")
-        self.community_info_button = Button(self.driver, translation_id="community-info")
-        self.invite_button = Button(self.driver, accessibility_id="community-invite-people")
-
-        # Community info page
-        self.community_membership_request_value = Text(
-            self.driver, translation_id="members-label",
-            suffix='/following-sibling::android.view.ViewGroup/android.widget.TextView')
-        self.members_button = Button(self.driver, translation_id="members-label")
-        self.community_info_picture = Button(self.driver, accessibility_id="chat-icon")
-        self.leave_community_button = Button(self.driver, translation_id="leave-community")
-        self.edit_community_button = Button(self.driver, translation_id="edit-community")
-        self.share_community_button = Button(self.driver, accessibility_id="share-community")
-        self.share_community_link_button = Button(self.driver, accessibility_id="share-community-link")
-
-        # Members
-        self.invite_people_button = Button(self.driver, accessibility_id="community-invite-people")
-        self.membership_requests_button = Button(self.driver, translation_id="membership-requests")
-        self.share_invite_button = Button(self.driver, accessibility_id="share-community-link")
-
-        # Requesting access to community / joining community
-        self.request_access_button = Button(self.driver, translation_id="request-access")
-        self.membership_request_pending_text = Text(self.driver, translation_id="membership-request-pending")
-        self.join_button = Button(self.driver, accessibility_id="show-request-to-join-screen-button")
-        self.join_community_button = Button(self.driver, accessibility_id="join-community-button")
-        self.follow_button = Button(self.driver, translation_id="follow")
-        self.community_tags = BaseElement(
-            self.driver, xpath="//*[@content-desc='chat-name-text']/../android.widget.HorizontalScrollView")
-
-        #### NEW UI
-        # Communities initial page
-        self.close_community_view_button = Button(
-            self.driver,
-            xpath="//*[@content-desc='community-options-for-community']/../*[1]//android.widget.ImageView")
-        self.community_description_text = Text(self.driver, accessibility_id="community-description-text")
-        self.community_status_joined = Text(self.driver, accessibility_id="status-tag-positive")
-        self.community_status_pending = Text(self.driver, accessibility_id="status-tag-pending")
 
     def join_community(self, password=common_password, open_community=True):
         self.driver.info("Joining community")
@@ -517,6 +479,11 @@ class PreviewMessage(ChatElementByText):
     def __init__(self, driver, text: str):
         super().__init__(driver, text=text)
 
+    preview_image_element = ChildElement(SilentButton, "//*[@content-desc='thumbnail']", name='PreviewImage')
+    preview_title_element = ChildElement(SilentButton, "//*[@content-desc='title']", name='PreviewTitle')
+    preview_subtitle_element = ChildElement(SilentButton, "//*[@content-desc='description']", name='PreviewSubTitle')
+    preview_link_element = ChildElement(SilentButton, "//*[@content-desc='link']", name='PreviewLink')
+
     @staticmethod
     def return_element_or_empty(obj):
         try:
@@ -526,35 +493,19 @@ class PreviewMessage(ChatElementByText):
 
     @property
     def preview_image(self):
-        class PreviewImage(SilentButton):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator, xpath="//*[@content-desc='thumbnail']")
-
-        return PreviewMessage.return_element_or_empty(PreviewImage(self.driver, self.locator))
+        return PreviewMessage.return_element_or_empty(self.preview_image_element)
 
     @property
     def preview_title(self):
-        class PreviewTitle(SilentButton):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator, xpath="//*[@content-desc='title']")
-
-        return PreviewMessage.return_element_or_empty(PreviewTitle(self.driver, self.locator))
+        return PreviewMessage.return_element_or_empty(self.preview_title_element)
 
     @property
     def preview_subtitle(self):
-        class PreviewSubTitle(SilentButton):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator, xpath="//*[@content-desc='description']")
-
-        return PreviewMessage.return_element_or_empty(PreviewSubTitle(self.driver, self.locator))
+        return PreviewMessage.return_element_or_empty(self.preview_subtitle_element)
 
     @property
     def preview_link(self):
-        class PreviewLink(SilentButton):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator, xpath="//*[@content-desc='link']")
-
-        return PreviewMessage.return_element_or_empty(PreviewLink(self.driver, self.locator))
+        return PreviewMessage.return_element_or_empty(self.preview_link_element)
 
 
 class CommunityLinkPreviewMessage(ChatElementByText):
@@ -611,13 +562,7 @@ class TransactionMessage(ChatElementByText):
         self.pending = self.get_translation_by_key("pending")
         self.declined = self.get_translation_by_key("transaction-declined")
 
-    @property
-    def transaction_status(self):
-        class TransactionStatus(SilentButton):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, prefix=parent_locator, xpath="/*[1]/*[1]/*[5]/android.widget.TextView")
-
-        return TransactionStatus(self.driver, self.locator)
+    transaction_status = ChildElement(SilentButton, "/*[1]/*[1]/*[5]/android.widget.TextView", name='TransactionStatus')
 
     @property
     def decline_transaction(self):
@@ -737,158 +682,148 @@ class ChatMessageInput(EditBox):
         super().__init__(driver, accessibility_id="chat-message-input")
 
     def paste_text_from_clipboard(self):
-        action = TouchAction(self.driver)
-        location = self.find_element().location
+        location, _ = self.get_element_coordinates()
         x, y = location['x'], location['y']
-        action.long_press(x=x + 250, y=y).release().perform()  # long press
-        action.tap(x=x + 50, y=y - 50).release().perform()  # tap Paste
+        Gestures(self.driver).long_press(x + 250, y).pause(2).tap(x + 50, y - 50).perform()  # long press, tap Paste
 
     def click_inside(self):
-        action = TouchAction(self.driver)
-        location = self.find_element().location
+        location, _ = self.get_element_coordinates()
         x, y = location['x'], location['y']
-        action.tap(x=x + 250, y=y).release().perform()
+        Gestures(self.driver).tap(x + 250, y).perform()
 
 
 class ChatView(BaseView):
+    # Start new chat
+    public_key_edit_box = LazyElement(EditBox, accessibility_id="enter-contact-code-input")
+    scan_contact_code_button = LazyElement(Button, accessibility_id="scan-contact-code-button")
+    view_profile_new_contact_button = LazyElement(Button, accessibility_id="new-contact-button")
+
+    # Chat header
+    add_to_contacts = LazyElement(Button, accessibility_id="add-to-contacts-button")
+    ## Options
+    chat_options = LazyElement(ChatOptionsButton)
+    delete_chat_button = LazyElement(Button, translation_id="delete-chat")
+    clear_history_button = LazyElement(Button, translation_id="clear-history")
+    reply_message_button = LazyElement(Button, translation_id="message-reply")
+    share_chat_button = LazyElement(Button, accessibility_id="share-chat-button")
+    clear_button = LazyElement(Button, translation_id="clear-history")
+    view_profile_button = LazyElement(ViewProfileButton)
+    view_profile_by_avatar_button = LazyElement(Button, accessibility_id="member-photo")
+    user_options = LazyElement(Button, accessibility_id="options")
+    open_in_status_button = LazyElement(OpenInStatusButton)
+    close_modal_view_from_chat_button = LazyElement(Button, xpath="//androidx.appcompat.widget.LinearLayoutCompat")
+
+    # Chat input
+    chat_message_input = LazyElement(ChatMessageInput)
+    cancel_reply_button = LazyElement(Button, accessibility_id="reply-cancel-button")
+    url_preview_composer = LazyElement(Button, accessibility_id="url-preview")
+    url_preview_composer_text = LazyElement(Text, xpath='//*[@content-desc="url-preview"]//*[@content-desc="title"]')
+    quote_username_in_message_input = LazyElement(
+        EditBox, xpath="//*[@content-desc='reply-cancel-button']/preceding::android.widget.TextView[3]")
+    chat_item = LazyElement(Button, xpath="(//*[@content-desc='chat-item'])[1]")
+    chat_name_editbox = LazyElement(EditBox, accessibility_id="chat-name-input")
+    commands_button = LazyElement(CommandsButton)
+    send_command = LazyElement(SendCommand)
+    request_command = LazyElement(RequestCommand)
+
+    # General chat view
+    history_start_icon = LazyElement(Button, accessibility_id="history-chat")
+    unpin_message_popup = LazyElement(UnpinMessagePopUp)
+    contact_request_button = LazyElement(Button, accessibility_id="contact-request--button")
+
+    # Stickers
+    show_stickers_button = LazyElement(Button, accessibility_id="show-stickers-icon")
+    get_stickers = LazyElement(Button, translation_id="get-stickers")
+    sticker_icon = LazyElement(Button, accessibility_id="sticker-icon")
+    sticker_message = LazyElement(Button, accessibility_id="sticker-message")
+
+    # Images
+    show_images_button = LazyElement(Button, accessibility_id="open-images-button")
+    take_photo_button = LazyElement(Button, accessibility_id="camera-button")
+    snap_button = LazyElement(Button, accessibility_id="snap")
+    image_from_gallery_button = LazyElement(Button, accessibility_id="open-gallery")
+    images_confirm_selection_button = LazyElement(Button, accessibility_id="confirm-selection")
+    images_area_in_gallery = LazyElement(
+        Button, xpath="//*[@content-desc='open-gallery']/following-sibling::android.view.ViewGroup[1]")
+    image_message_in_chat = LazyElement(Button, accessibility_id="image-message")
+    save_image_button = LazyElement(Button, translation_id="save")
+    recent_image_in_gallery = LazyElement(Button, xpath="//*[contains(@resource-id,'thumbnail')]")
+    cancel_send_image_button = LazyElement(Button, accessibility_id="cancel-send-image")
+    share_image_icon_button = LazyElement(Button, accessibility_id="share-image")
+    view_image_options_button = LazyElement(Button, accessibility_id="image-options")
+    save_image_icon_button = LazyElement(Button, accessibility_id="save-image")
+    image_in_android_messenger = LazyElement(Button, accessibility_id="Image")
+
+    # Audio
+    audio_message_in_chat = LazyElement(Button, accessibility_id="audio-message")
+    audio_message_button = LazyElement(Button, accessibility_id="show-audio-message-icon")
+    record_audio_button = LazyElement(Button, accessibility_id="start-stop-audio-recording-button")
+    cancel_audio_message_button = LazyElement(Button, accessibility_id="cancel-message-button")
+    send_audio_message_button = LazyElement(Button, accessibility_id="send-message-button")
+    play_pause_audio_message_button = LazyElement(Button, accessibility_id="play-pause-audio-message-button")
+    audio_message_in_chat_timer = LazyElement(
+        Text, xpath="//*[@content-desc='play-pause-audio-message-button']/../..//android.widget.TextView[1]")
+    audio_message_recorded_time = LazyElement(Text, accessibility_id="audio-message-recorded-time")
+
+    # Group chats
+    group_info = LazyElement(GroupInfoButton)
+    leave_chat_button = LazyElement(Button, accessibility_id="leave-chat-button")
+    leave_button = LazyElement(Button, translation_id="leave", uppercase=True)
+    join_chat_button = LazyElement(Button, accessibility_id="join-chat-button")
+    decline_invitation_button = LazyElement(Button, translation_id="group-chat-decline-invitation")
+    remove_user_button = LazyElement(Button, accessibility_id="remove-from-chat")
+    make_admin_button = LazyElement(Button, accessibility_id="make-admin")
+    edit_group_chat_name_button = LazyElement(Button, accessibility_id="edit-button")
+    edit_group_chat_name_edit_box = LazyElement(EditBox, accessibility_id="new-chat-name")
+    done_button = LazyElement(Button, accessibility_id="done")
+    create_button = LazyElement(Button, accessibility_id="create-group-chat-button")
+    ## Group invites
+    group_invite_button = LazyElement(Button, accessibility_id="invite-chat-button")
+    group_invite_link_text = LazyElement(Text, xpath="//*[@content-desc='invitation-link']/android.widget.TextView")
+    introduce_yourself_edit_box = LazyElement(EditBox, accessibility_id="introduce-yourself-input")
+    request_membership_button = LazyElement(Button, translation_id="request-membership")
+    group_membership_request_button = LazyElement(Button, accessibility_id="invitation-requests-button")
+    accept_group_invitation_button = LazyElement(Button, accessibility_id="accept-invitation-button")
+    decline_group_invitation_button = LazyElement(Button, accessibility_id="decline-invitation-button")
+    retry_group_invite_button = LazyElement(Button, accessibility_id="retry-button")
+    remove_group_invite_button = LazyElement(Button, accessibility_id="remove-group-button")
+
+    # Contact's profile
+    contact_profile_picture = LazyElement(ProfilePictureElement)
+    profile_send_message_button = LazyElement(ProfileSendMessageButton)
+    profile_block_contact_button = LazyElement(ProfileBlockContactButton)
+    confirm_block_contact_button = LazyElement(Button, accessibility_id="block-contact-confirm")
+    unblock_contact_button = LazyElement(UnblockContactButton)
+    profile_mute_contact = LazyElement(Button, accessibility_id="Mute-item-button")
+    profile_unmute_contact = LazyElement(Button, accessibility_id="Unmute-item-button")
+    profile_add_to_contacts_button = LazyElement(Button, accessibility_id="Add to contacts-item-button")
+    profile_remove_from_contacts = LazyElement(Button, accessibility_id="Remove from contacts-item-button")
+    profile_details = LazyElement(Button, accessibility_id="share-button")
+    profile_nickname = LazyElement(Text, xpath="//*[@content-desc='profile-nickname-item']/android.widget.TextView[2]")
+    profile_nickname_button = LazyElement(Button, accessibility_id="profile-nickname-item")
+    pinned_messages_button = LazyElement(PinnedMessagesOnProfileButton)
+    nickname_input_field = LazyElement(EditBox, accessibility_id="nickname-input")
+    remove_from_contacts = LazyElement(Button, accessibility_id="Remove from contacts-item-button")
+
+    # Communities
+    create_community_button = LazyElement(Button, translation_id="create-community")
+    community_name_edit_box = LazyElement(EditBox, translation_id="name-your-community-placeholder")
+    set_community_image_button = LazyElement(Button, translation_id='community-thumbnail-image',
+                                             suffix='/following-sibling::android.view.ViewGroup')
+    confirm_create_in_community_button = LazyElement(Button, translation_id="create")
+    mentions_list = LazyElement(BaseElement, accessibility_id="mentions-list")
+
+    # New UI
+    pinned_messages_count = LazyElement(Button, xpath="//*[@content-desc='pins-count']//android.widget.TextView")
+    pinned_messages_list = LazyElement(PinnedMessagesList)
+    pin_limit_popover = LazyElement(BaseElement, translation_id="pin-limit-reached")
+    view_pinned_messages_button = LazyElement(Button, accessibility_id="pinned-banner")
+
     def __init__(self, driver):
         super().__init__(driver)
-
-        # Start new chat
-        self.public_key_edit_box = EditBox(self.driver, accessibility_id="enter-contact-code-input")
-        self.scan_contact_code_button = Button(self.driver, accessibility_id="scan-contact-code-button")
-        self.view_profile_new_contact_button = Button(self.driver, accessibility_id="new-contact-button")
-
-        # Chat header
-        self.add_to_contacts = Button(self.driver, accessibility_id="add-to-contacts-button")
-        ## Options
-        self.chat_options = ChatOptionsButton(self.driver)
-        self.delete_chat_button = Button(self.driver, translation_id="delete-chat")
-        self.clear_history_button = Button(self.driver, translation_id="clear-history")
-        self.reply_message_button = Button(self.driver, translation_id="message-reply")
-        self.share_chat_button = Button(self.driver, accessibility_id="share-chat-button")
-        self.clear_button = Button(self.driver, translation_id="clear-history")
-        self.view_profile_button = ViewProfileButton(self.driver)
-        self.view_profile_by_avatar_button = Button(self.driver, accessibility_id="member-photo")
-        self.user_options = Button(self.driver, accessibility_id="options")
-        self.open_in_status_button = OpenInStatusButton(self.driver)
-        self.close_modal_view_from_chat_button = Button(self.driver,
-                                                        xpath="//androidx.appcompat.widget.LinearLayoutCompat")
-
-        # Chat input
-        self.chat_message_input = ChatMessageInput(self.driver)
-        self.cancel_reply_button = Button(self.driver, accessibility_id="reply-cancel-button")
-        self.url_preview_composer = Button(self.driver, accessibility_id="url-preview")
-        self.url_preview_composer_text = Text(self.driver,
-                                              xpath='//*[@content-desc="url-preview"]//*[@content-desc="title"]')
-        self.quote_username_in_message_input = EditBox(
-            self.driver,
-            xpath="//*[@content-desc='reply-cancel-button']/preceding::android.widget.TextView[3]")
-        self.chat_item = Button(self.driver, xpath="(//*[@content-desc='chat-item'])[1]")
-        self.chat_name_editbox = EditBox(self.driver, accessibility_id="chat-name-input")
-        self.commands_button = CommandsButton(self.driver)
-        self.send_command = SendCommand(self.driver)
-        self.request_command = RequestCommand(self.driver)
-
-        # General chat view
-        self.history_start_icon = Button(self.driver, accessibility_id="history-chat")
-        self.unpin_message_popup = UnpinMessagePopUp(self.driver)
-        self.contact_request_button = Button(self.driver, accessibility_id="contact-request--button")
-
-        # Stickers
-        self.show_stickers_button = Button(self.driver, accessibility_id="show-stickers-icon")
-        self.get_stickers = Button(self.driver, translation_id="get-stickers")
-        self.sticker_icon = Button(self.driver, accessibility_id="sticker-icon")
-        self.sticker_message = Button(self.driver, accessibility_id="sticker-message")
-
-        # Images
-        self.show_images_button = Button(self.driver, accessibility_id="open-images-button")
-        self.take_photo_button = Button(self.driver, accessibility_id="camera-button")
-        self.snap_button = Button(self.driver, accessibility_id="snap")
-        self.image_from_gallery_button = Button(self.driver, accessibility_id="open-gallery")
-        self.images_confirm_selection_button = Button(self.driver, accessibility_id="confirm-selection")
-        self.images_area_in_gallery = Button(self.driver,
-                                             xpath="//*[@content-desc='open-gallery']/following-sibling::android.view.ViewGroup[1]")
-        self.image_message_in_chat = Button(self.driver, accessibility_id="image-message")
-        self.save_image_button = Button(self.driver, translation_id="save")
-        self.recent_image_in_gallery = Button(self.driver,
-                                              xpath="//*[contains(@resource-id,'thumbnail')]")
-        self.cancel_send_image_button = Button(self.driver, accessibility_id="cancel-send-image")
-        self.share_image_icon_button = Button(self.driver, accessibility_id="share-image")
-        self.view_image_options_button = Button(self.driver, accessibility_id="image-options")
-        self.save_image_icon_button = Button(self.driver, accessibility_id="save-image")
-        self.image_in_android_messenger = Button(self.driver, accessibility_id="Image")
-
-        # Audio
-        self.audio_message_in_chat = Button(self.driver, accessibility_id="audio-message")
-        self.audio_message_button = Button(self.driver, accessibility_id="show-audio-message-icon")
-        self.record_audio_button = Button(self.driver, accessibility_id="start-stop-audio-recording-button")
-        self.cancel_audio_message_button = Button(self.driver, accessibility_id="cancel-message-button")
-        self.send_audio_message_button = Button(self.driver, accessibility_id="send-message-button")
-        self.play_pause_audio_message_button = Button(self.driver, accessibility_id="play-pause-audio-message-button")
-        self.audio_message_in_chat_timer = Text(self.driver,
-                                                xpath="//*[@content-desc='play-pause-audio-message-button']/../..//android.widget.TextView[1]")
-        self.audio_message_recorded_time = Text(self.driver, accessibility_id="audio-message-recorded-time")
-
-        # Group chats
-        self.group_info = GroupInfoButton(self.driver)
-        self.leave_chat_button = Button(self.driver, accessibility_id="leave-chat-button")
-        self.leave_button = Button(self.driver, translation_id="leave", uppercase=True)
-        self.join_chat_button = Button(self.driver, accessibility_id="join-chat-button")
-        self.decline_invitation_button = Button(self.driver, translation_id="group-chat-decline-invitation")
-        self.remove_user_button = Button(self.driver, accessibility_id="remove-from-chat")
-        self.make_admin_button = Button(self.driver, accessibility_id="make-admin")
-        self.edit_group_chat_name_button = Button(self.driver, accessibility_id="edit-button")
-        self.edit_group_chat_name_edit_box = EditBox(self.driver, accessibility_id="new-chat-name")
-        self.done_button = Button(self.driver, accessibility_id="done")
-        self.create_button = Button(self.driver, accessibility_id="create-group-chat-button")
-        ## Group invites
-        self.group_invite_button = Button(self.driver, accessibility_id="invite-chat-button")
-        self.group_invite_link_text = Text(self.driver,
-                                           xpath="//*[@content-desc='invitation-link']/android.widget.TextView")
-        self.introduce_yourself_edit_box = EditBox(self.driver, accessibility_id="introduce-yourself-input")
-        self.request_membership_button = Button(self.driver, translation_id="request-membership")
-        self.group_membership_request_button = Button(self.driver, accessibility_id="invitation-requests-button")
-        self.accept_group_invitation_button = Button(self.driver, accessibility_id="accept-invitation-button")
-        self.decline_group_invitation_button = Button(self.driver, accessibility_id="decline-invitation-button")
-        self.retry_group_invite_button = Button(self.driver, accessibility_id="retry-button")
-        self.remove_group_invite_button = Button(self.driver, accessibility_id="remove-group-button")
-
-        # Contact's profile
-        self.contact_profile_picture = ProfilePictureElement(self.driver)
-        self.profile_send_message_button = ProfileSendMessageButton(self.driver)
-        self.profile_block_contact_button = ProfileBlockContactButton(self.driver)
-        self.confirm_block_contact_button = Button(self.driver, accessibility_id="block-contact-confirm")
-        self.unblock_contact_button = UnblockContactButton(self.driver)
-        self.profile_mute_contact = Button(self.driver, accessibility_id="Mute-item-button")
-        self.profile_unmute_contact = Button(self.driver, accessibility_id="Unmute-item-button")
-        self.profile_add_to_contacts_button = Button(self.driver, accessibility_id="Add to contacts-item-button")
-        self.profile_remove_from_contacts = Button(self.driver, accessibility_id="Remove from contacts-item-button")
-        self.profile_details = Button(self.driver, accessibility_id="share-button")
-        self.profile_nickname = Text(self.driver,
-                                     xpath="//*[@content-desc='profile-nickname-item']/android.widget.TextView[2]")
-        self.profile_nickname_button = Button(self.driver, accessibility_id="profile-nickname-item")
-        self.pinned_messages_button = PinnedMessagesOnProfileButton(self.driver)
-        self.nickname_input_field = EditBox(self.driver, accessibility_id="nickname-input")
-        self.remove_from_contacts = Button(self.driver, accessibility_id="Remove from contacts-item-button")
-
-        # Communities
-        self.create_community_button = Button(self.driver, translation_id="create-community")
-        self.community_name_edit_box = EditBox(self.driver, translation_id="name-your-community-placeholder")
         self.community_description_edit_box = EditBox(self.driver, xpath='//android.widget.EditText[@text="%s"]' %
                                                                          self.get_translation_by_key(
                                                                              "give-a-short-description-community"))
-        self.set_community_image_button = Button(self.driver, translation_id='community-thumbnail-image',
-                                                 suffix='/following-sibling::android.view.ViewGroup')
-        self.confirm_create_in_community_button = Button(self.driver, translation_id="create")
-        self.mentions_list = BaseElement(self.driver, accessibility_id="mentions-list")
-
-        # New UI
-        self.pinned_messages_count = Button(self.driver,
-                                            xpath="//*[@content-desc='pins-count']//android.widget.TextView")
-        self.pinned_messages_list = PinnedMessagesList(self.driver)
-        self.pin_limit_popover = BaseElement(self.driver, translation_id="pin-limit-reached")
-        self.view_pinned_messages_button = Button(self.driver, accessibility_id="pinned-banner")
 
     def get_outgoing_transaction(self, account=None, transaction_value=None) -> object:
         if account is None:
@@ -0,0 +1,40 @@
+from support.account_snapshots import SnapshotRecipe, get_persona
+
+snapshot_community_name = 'snapshot community'
+
+
+def add_contacts(home, users: tuple):
+    for user in users:
+        home.add_contact(get_persona(user)['public_key'])
+
+
+def create_community(home, name: str = snapshot_community_name):
+    home.create_community_e2e(name, require_approval=False)
+    home.navigate_back_to_home_view()
+
+
+def create_closed_community(home):
+    # "closed community" with "cats" channel, as made by create_community
+    home.communities_tab.click_until_presence_of_element(home.plus_community_button)
+    home.create_community(community_type='closed')
+    home.navigate_back_to_home_view()
+
+
+def send_messages(home, number: int, community_name: str = snapshot_community_name):
+    channel = home.get_to_community_channel_from_home(community_name)
+    for i in range(number):
+        channel.send_message('snapshot message %s' % i)
+    home.navigate_back_to_home_view()
+
+
+recipes = {recipe.name: recipe for recipe in (
+    SnapshotRecipe('basic_user', user='basic_user'),
+    SnapshotRecipe('basic_user_contacts', user='basic_user',
+                   steps=[(add_contacts, {'users': ('ens_user', 'ens_user_message_sender')})]),
+    SnapshotRecipe('basic_user_community', user='basic_user',
+                   steps=[(create_community, {})]),
+    SnapshotRecipe('basic_user_messages', user='basic_user',
+                   steps=[(create_community, {}), (send_messages, {'number': 20})]),
+    SnapshotRecipe('basic_user_closed_community', user='basic_user',
+                   steps=[(create_closed_community, {})]),
+)}
@@ -5,7 +5,8 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from typing_extensions import Literal
 
 from tests import test_dapp_url
-from views.base_element import Button, Text, BaseElement, SilentButton, CheckBox, EditBox
+from views.base_element import Button, Text, BaseElement, SilentButton, CheckBox, EditBox, LazyElement, \
+    ChildElement
 from views.base_view import BaseView, UnreadMessagesCountText
 
 
@@ -76,42 +77,20 @@ class ChatElement(SilentButton):
                     e.msg = 'Device %s: Unable to find chat with name %s' % (self.driver.number, self.username)
                     raise e
 
+    new_message_counter_text = ChildElement(Text, "//*[@content-desc='new-message-counter']/android.widget.TextView",
+                                            name='NewMessageCounterText', relative=True)
+    chat_preview = ChildElement(Text, "//*[@content-desc='chat-message-text']", name='PreveiewMessageText',
+                                relative=True)
+    no_message_preview = ChildElement(Text, "//*[@content-desc='no-messages-text']", name='NoMessageText',
+                                      relative=True)
+    new_messages_grey_dot = ChildElement(BaseElement, "/*[@content-desc='unviewed-messages-public']",
+                                         name='UnreadMessagesPublicChat')
+
     @property
     def new_messages_counter(self):
         if self.community:
             return UnreadMessagesCountText(self.driver, self.locator)
-
-        class NewMessageCounterText(Text):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(
-                    driver,
-                    xpath="%s//*[@content-desc='new-message-counter']/android.widget.TextView" % parent_locator)
-
-        return NewMessageCounterText(self.driver, self.locator)
-
-    @property
-    def chat_preview(self):
-        class PreveiewMessageText(Text):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, xpath="%s//*[@content-desc='chat-message-text']" % parent_locator)
-
-        return PreveiewMessageText(self.driver, self.locator)
-
-    @property
-    def no_message_preview(self):
-        class NoMessageText(Text):
-            def __init__(self, driver, parent_locator: str):
-                super().__init__(driver, xpath="%s//*[@content-desc='no-messages-text']" % parent_locator)
-
-        return NoMessageText(self.driver, self.locator)
-
-    @property
-    def new_messages_grey_dot(self):
-        class UnreadMessagesPublicChat(BaseElement):
-            def __init__(self, driver, parent_locator):
-                super().__init__(driver, xpath="%s/*[@content-desc='unviewed-messages-public']" % parent_locator)
-
-        return UnreadMessagesPublicChat(self.driver, self.locator)
+        return self.new_message_counter_text
 
     @property
     def chat_image(self):
@@ -128,32 +107,21 @@ class ActivityCenterElement(SilentButton):
         super().__init__(driver,
                          xpath="//*[contains(@text, '%s')]/ancestor::*[@content-desc='activity']" % username)
 
-    @property
-    def title(self):
-        return Button(self.driver, xpath=self.locator + '//*[@content-desc="activity-title"]')
-
-    @property
-    def unread_indicator(self):
-        return Button(self.driver, xpath=self.locator + '//*[@content-desc="activity-unread-indicator"]')
-
-    @property
-    def message_body(self):
-        return Button(self.driver, xpath=self.locator + '//*[@content-desc="activity-message-body"]')
-
-    def handle_cr(self, element_accessibility: str):
-        Button(
-            self.driver,
-            xpath=self.locator + '/*[@content-desc="%s"]' % element_accessibility
-        ).wait_for_rendering_ended_and_click()
+    title = ChildElement(Button, '//*[@content-desc="activity-title"]', relative=True)
+    unread_indicator = ChildElement(Button, '//*[@content-desc="activity-unread-indicator"]', relative=True)
+    message_body = ChildElement(Button, '//*[@content-desc="activity-message-body"]', relative=True)
+    accept_contact_request_button = ChildElement(Button, '/*[@content-desc="accept-contact-request"]')
+    decline_contact_request_button = ChildElement(Button, '/*[@content-desc="decline-contact-request"]')
+    cancel_contact_request_button = ChildElement(Button, '/*[@content-desc="cancel-contact-request"]')
 
     def accept_contact_request(self):
-        self.handle_cr("accept-contact-request")
+        self.accept_contact_request_button.wait_for_rendering_ended_and_click()
 
     def decline_contact_request(self):
-        self.handle_cr("decline-contact-request")
+        self.decline_contact_request_button.wait_for_rendering_ended_and_click()
 
     def cancel_contact_request(self):
-        self.handle_cr("cancel-contact-request")
+        self.cancel_contact_request_button.wait_for_rendering_ended_and_click()
 
 
 class PushNotificationElement(SilentButton):
@@ -218,125 +186,116 @@ class MuteButton(Button):
 
 
 class HomeView(BaseView):
-    def __init__(self, driver):
-        super().__init__(driver)
-
-        self.plus_button = Button(self.driver, accessibility_id="new-chat-button")
-        self.plus_community_button = Button(self.driver, accessibility_id="new-communities-button")
-        self.chat_name_text = Text(self.driver, accessibility_id="chat-name-text")
-        self.start_new_chat_button = ChatButton(self.driver, accessibility_id="start-1-1-chat-button")
-        self.new_group_chat_button = ChatButton(self.driver, accessibility_id="start-group-chat-button")
-        self.join_public_chat_button = ChatButton(self.driver, accessibility_id="join-public-chat-button")
-        self.universal_qr_scanner_button = Button(self.driver, accessibility_id="universal-qr-scanner")
-        self.invite_friends_button = Button(self.driver, accessibility_id="invite-friends-button")
-        self.stop_status_service_button = Button(self.driver, accessibility_id="STOP")
-        self.my_profile_on_start_new_chat_button = Button(self.driver,
-                                                          xpath="//*[@content-desc='current-account-photo']")
-        self.communities_button = ChatButton(self.driver, accessibility_id="create-community")
-        self.create_closed_community_button = ChatButton(self.driver, accessibility_id="create-closed-community")
-        self.create_open_community_button = ChatButton(self.driver, accessibility_id="create-open-community")
-        self.create_token_gated_community_button = ChatButton(self.driver,
-                                                              accessibility_id="create-token-gated-community")
-        self.ens_banner_close_button = Button(self.driver, accessibility_id=":ens-banner-close-button")
-        self.user_name_text = Text(
-            self.driver,
-            xpath="//*[@content-desc='new-contact-button']/preceding-sibling::*[1]/*[@content-desc='user-avatar']" + \
-                  "/following-sibling::android.widget.TextView[1]")
-
-        # Notification centre
-        self.notifications_button = Button(self.driver, accessibility_id="notifications-button")
-        self.notifications_unread_badge = BaseElement(self.driver, accessibility_id="activity-center-unread-count")
-        self.show_qr_code_button = Button(self.driver, accessibility_id="show-qr-button")
-        self.open_activity_center_button = Button(self.driver, accessibility_id="open-activity-center-button")
-        self.close_activity_centre = Button(self.driver, accessibility_id="close-activity-center")
-
-        self.notifications_select_button = Button(self.driver, translation_id="select")
-        self.notifications_reject_and_delete_button = Button(self.driver, accessibility_id="reject-and-delete"
-                                                                                           "-activity-center")
-        self.notifications_accept_and_add_button = Button(self.driver,
-                                                          accessibility_id="accept-and-add-activity-center")
-        self.notifications_select_all = Button(self.driver, xpath="(//android.widget.CheckBox["
-                                                                  "@content-desc='checkbox-off'])[1]")
-
-        # Tabs and elements on messages home view
-        self.recent_tab = Button(self.driver, accessibility_id="tab-recent")
-        self.groups_tab = Button(self.driver, accessibility_id="tab-groups")
-        self.contacts_tab = Button(self.driver, accessibility_id="tab-contacts")
-        self.contact_new_badge = Button(self.driver, accessibility_id="notification-dot")
-        self.pending_contact_request_button = Button(self.driver,
-                                                     accessibility_id="open-activity-center-contact-requests")
-        self.pending_contact_request_text = Text(
-            self.driver,
-            xpath='//*[@content-desc="pending-contact-requests-count"]/android.widget.TextView')
-
-        # Tabs and elements on community home view
-        self.pending_communities_tab = Button(self.driver, accessibility_id="pending-tab")
-        self.joined_communities_tab = Button(self.driver, accessibility_id="joined-tab")
-        self.opened_communities_tab = Button(self.driver, accessibility_id="opened-tab")
-
-        # Options on long tap
-        self.chats_menu_invite_friends_button = Button(self.driver, accessibility_id="chats-menu-invite-friends-button")
-        self.delete_chat_button = Button(self.driver, translation_id="delete-chat")
-        self.clear_history_button = Button(self.driver, accessibility_id="clear-history")
-        self.mute_chat_button = MuteButton(self.driver, accessibility_id="mute-chat")
-        self.mute_community_button = MuteButton(self.driver, accessibility_id="mute-community")
-        self.unmute_community_button = MuteButton(self.driver, accessibility_id="unmute-community")
-        self.mute_channel_button = MuteButton(self.driver, accessibility_id="chat-toggle-muted")
-        self.mark_all_messages_as_read_button = Button(self.driver, accessibility_id="mark-as-read")
-
-        # Connection icons
-        self.mobile_connection_off_icon = Button(self.driver, accessibility_id="conn-button-mobile-sync-off")
-        self.mobile_connection_on_icon = Button(self.driver, accessibility_id="conn-button-mobile-sync")
-        self.connection_offline_icon = Button(self.driver, accessibility_id="conn-button-offline")
-
-        # Sync using mobile data bottom sheet
-        self.continue_syncing_button = Button(self.driver, accessibility_id="mobile-network-continue-syncing")
-        self.stop_syncing_button = Button(self.driver, accessibility_id="mobile-network-stop-syncing")
-        self.remember_my_choice_checkbox = CheckBox(self.driver, accessibility_id=":checkbox-on")
-
-        # Connection status bottom sheet
-        self.connected_to_n_peers_text = Text(self.driver, accessibility_id="connected-to-n-peers")
-        self.connected_to_node_text = Text(self.driver, accessibility_id="connected-to-mailserver")
-        self.waiting_for_wi_fi = Text(self.driver, accessibility_id="waiting-wi-fi")
-        self.use_mobile_data_switch = Button(self.driver, accessibility_id="mobile-network-use-mobile")
-        self.connection_settings_button = Button(self.driver, accessibility_id="settings")
-        self.not_connected_to_node_text = Text(self.driver, accessibility_id="not-connected-nodes")
-        self.not_connected_to_peers_text = Text(self.driver, accessibility_id="not-connected-to-peers")
-
-        # New UI
-        self.new_chat_button = Button(self.driver, accessibility_id="new-chat-button")
-        self.discover_communities_button = Button(self.driver, accessibility_id="communities-home-discover-card")
-
-        # New UI bottom sheet
-        self.start_a_new_chat_bottom_sheet_button = Button(self.driver, accessibility_id="start-a-new-chat")
-        self.add_a_contact_chat_bottom_sheet_button = Button(self.driver, accessibility_id="add-a-contact")
-        self.setup_chat_button = Button(self.driver, accessibility_id="next-button")
-
-        # Activity centre
-        self.all_activity_tab_button = ActivityTabButton(self.driver, translation_id="all")
-        self.mention_activity_tab_button = ActivityTabButton(self.driver, accessibility_id="tab-mention")
-        self.reply_activity_tab_button = ActivityTabButton(self.driver, accessibility_id="tab-reply")
-        self.activity_notification_swipe_button = Button(self.driver, accessibility_id="notification-swipe")
-        self.activity_unread_filter_button = Button(self.driver, accessibility_id="selector-filter")
-        self.more_options_activity_button = Button(self.driver, accessibility_id="activity-center-open-more")
-        self.mark_all_read_activity_button = Button(self.driver, translation_id="mark-all-notifications-as-read")
-
-        # Share tab
-        self.link_to_profile_text = Text(
-            self.driver,
-            xpath="(//*[@content-desc='link-to-profile']/preceding-sibling::*[1]/android.widget.TextView)[1]")
-
-        # Discover communities
-        self.community_card_item = BaseElement(self.driver, accessibility_id="community-card-item")
+    plus_button = LazyElement(Button, accessibility_id="new-chat-button")
+    plus_community_button = LazyElement(Button, accessibility_id="new-communities-button")
+    chat_name_text = LazyElement(Text, accessibility_id="chat-name-text")
+    start_new_chat_button = LazyElement(ChatButton, accessibility_id="start-1-1-chat-button")
+    new_group_chat_button = LazyElement(ChatButton, accessibility_id="start-group-chat-button")
+    join_public_chat_button = LazyElement(ChatButton, accessibility_id="join-public-chat-button")
+    universal_qr_scanner_button = LazyElement(Button, accessibility_id="universal-qr-scanner")
+    invite_friends_button = LazyElement(Button, accessibility_id="invite-friends-button")
+    stop_status_service_button = LazyElement(Button, accessibility_id="STOP")
+    my_profile_on_start_new_chat_button = LazyElement(Button, xpath="//*[@content-desc='current-account-photo']")
+    communities_button = LazyElement(ChatButton, accessibility_id="create-community")
+    create_closed_community_button = LazyElement(ChatButton, accessibility_id="create-closed-community")
+    create_open_community_button = LazyElement(ChatButton, accessibility_id="create-open-community")
+    create_token_gated_community_button = LazyElement(ChatButton, accessibility_id="create-token-gated-community")
+    ens_banner_close_button = LazyElement(Button, accessibility_id=":ens-banner-close-button")
+    user_name_text = LazyElement(
+        Text,
+        xpath="//*[@content-desc='new-contact-button']/preceding-sibling::*[1]/*[@content-desc='user-avatar']" +
+              "/following-sibling::android.widget.TextView[1]")
+
+    # Notification centre
+    notifications_button = LazyElement(Button, accessibility_id="notifications-button")
+    notifications_unread_badge = LazyElement(BaseElement, accessibility_id="activity-center-unread-count")
+    show_qr_code_button = LazyElement(Button, accessibility_id="show-qr-button")
+    open_activity_center_button = LazyElement(Button, accessibility_id="open-activity-center-button")
+    close_activity_centre = LazyElement(Button, accessibility_id="close-activity-center")
+
+    notifications_select_button = LazyElement(Button, translation_id="select")
+    notifications_reject_and_delete_button = LazyElement(Button, accessibility_id="reject-and-delete-activity-center")
+    notifications_accept_and_add_button = LazyElement(Button, accessibility_id="accept-and-add-activity-center")
+    notifications_select_all = LazyElement(Button, xpath="(//android.widget.CheckBox[@content-desc='checkbox-off'])[1]")
+
+    # Tabs and elements on messages home view
+    recent_tab = LazyElement(Button, accessibility_id="tab-recent")
+    groups_tab = LazyElement(Button, accessibility_id="tab-groups")
+    contacts_tab = LazyElement(Button, accessibility_id="tab-contacts")
+    contact_new_badge = LazyElement(Button, accessibility_id="notification-dot")
+    pending_contact_request_button = LazyElement(Button, accessibility_id="open-activity-center-contact-requests")
+    pending_contact_request_text = LazyElement(
+        Text, xpath='//*[@content-desc="pending-contact-requests-count"]/android.widget.TextView')
+
+    # Tabs and elements on community home view
+    pending_communities_tab = LazyElement(Button, accessibility_id="pending-tab")
+    joined_communities_tab = LazyElement(Button, accessibility_id="joined-tab")
+    opened_communities_tab = LazyElement(Button, accessibility_id="opened-tab")
+
+    # Options on long tap
+    chats_menu_invite_friends_button = LazyElement(Button, accessibility_id="chats-menu-invite-friends-button")
+    delete_chat_button = LazyElement(Button, translation_id="delete-chat")
+    clear_history_button = LazyElement(Button, accessibility_id="clear-history")
+    mute_chat_button = LazyElement(MuteButton, accessibility_id="mute-chat")
+    mute_community_button = LazyElement(MuteButton, accessibility_id="mute-community")
+    unmute_community_button = LazyElement(MuteButton, accessibility_id="unmute-community")
+    mute_channel_button = LazyElement(MuteButton, accessibility_id="chat-toggle-muted")
+    mark_all_messages_as_read_button = LazyElement(Button, accessibility_id="mark-as-read")
+
+    # Connection icons
+    mobile_connection_off_icon = LazyElement(Button, accessibility_id="conn-button-mobile-sync-off")
+    mobile_connection_on_icon = LazyElement(Button, accessibility_id="conn-button-mobile-sync")
+    connection_offline_icon = LazyElement(Button, accessibility_id="conn-button-offline")
+
+    # Sync using mobile data bottom sheet
+    continue_syncing_button = LazyElement(Button, accessibility_id="mobile-network-continue-syncing")
+    stop_syncing_button = LazyElement(Button, accessibility_id="mobile-network-stop-syncing")
+    remember_my_choice_checkbox = LazyElement(CheckBox, accessibility_id=":checkbox-on")
+
+    # Connection status bottom sheet
+    connected_to_n_peers_text = LazyElement(Text, accessibility_id="connected-to-n-peers")
+    connected_to_node_text = LazyElement(Text, accessibility_id="connected-to-mailserver")
+    waiting_for_wi_fi = LazyElement(Text, accessibility_id="waiting-wi-fi")
+    use_mobile_data_switch = LazyElement(Button, accessibility_id="mobile-network-use-mobile")
+    connection_settings_button = LazyElement(Button, accessibility_id="settings")
+    not_connected_to_node_text = LazyElement(Text, accessibility_id="not-connected-nodes")
+    not_connected_to_peers_text = LazyElement(Text, accessibility_id="not-connected-to-peers")
+
+    # New UI
+    new_chat_button = LazyElement(Button, accessibility_id="new-chat-button")
+    discover_communities_button = LazyElement(Button, accessibility_id="communities-home-discover-card")
+
+    # New UI bottom sheet
+    start_a_new_chat_bottom_sheet_button = LazyElement(Button, accessibility_id="start-a-new-chat")
+    add_a_contact_chat_bottom_sheet_button = LazyElement(Button, accessibility_id="add-a-contact")
+    setup_chat_button = LazyElement(Button, accessibility_id="next-button")
+
+    # Activity centre
+    all_activity_tab_button = LazyElement(ActivityTabButton, translation_id="all")
+    mention_activity_tab_button = LazyElement(ActivityTabButton, accessibility_id="tab-mention")
+    reply_activity_tab_button = LazyElement(ActivityTabButton, accessibility_id="tab-reply")
+    activity_notification_swipe_button = LazyElement(Button, accessibility_id="notification-swipe")
+    activity_unread_filter_button = LazyElement(Button, accessibility_id="selector-filter")
+    more_options_activity_button = LazyElement(Button, accessibility_id="activity-center-open-more")
+    mark_all_read_activity_button = LazyElement(Button, translation_id="mark-all-notifications-as-read")
+
+    # Share tab
+    link_to_profile_text = LazyElement(
+        Text, xpath="(//*[@content-desc='link-to-profile']/preceding-sibling::*[1]/android.widget.TextView)[1]")
+
+    # Discover communities
+    community_card_item = LazyElement(BaseElement, accessibility_id="community-card-item")
 
     def wait_for_syncing_complete(self):
         self.driver.info('Waiting for syncing to complete')
+        syncing = self.element_by_text_part('Syncing')
         while True:
             try:
-                sync = self.element_by_text_part('Syncing').wait_for_element(10)
-                self.driver.info(sync.text)
+                self.driver.info(syncing.wait_for_element(10).text)
+                syncing.wait_for_absence_of_element(10)
             except TimeoutException:
-                break
+                if not syncing.find_elements():
+                    break
 
     def get_chat(self, username, community=False, community_channel=False, wait_time=10):
         if community:
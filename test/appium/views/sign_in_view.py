@@ -1,12 +1,15 @@
 import base64
 import os
+import time
 
 from selenium.common.exceptions import NoSuchElementException
 
-from tests import common_password, appium_root_project_path
+from support.account_snapshots import AccountSnapshots, SnapshotRecipe, get_persona
+from tests import common_password, appium_root_project_path, for_each_device, driver_metrics, test_suite_data
 from tests.base_test_case import get_app_path
 from views.base_element import Button, EditBox, Text
 from views.base_view import BaseView
+from views.dbs.recipes import recipes
 
 
 class MultiAccountButton(Button):
@@ -334,9 +337,11 @@ class SignInView(BaseView):
         self.driver.info('## Importing database is finished!', device=False)
         return self.get_home_view()
 
-    def export_db(self, seed_phrase, file_to_export='export.db', password=common_password):
+    def export_db(self, seed_phrase, file_to_export='export.db', password=common_password, prepare=None):
         self.driver.info('## Export database', device=False)
         home = self.recover_access(passphrase=seed_phrase, password=password)
+        if prepare:
+            prepare(home)
         profile = home.profile_button.click()
         full_path_to_file = os.path.join(appium_root_project_path, 'views/dbs/%s' % file_to_export)
         profile.logout()
@@ -347,14 +352,68 @@ class SignInView(BaseView):
         self.element_by_text('Export unencrypted').wait_and_click(40)
         self.element_by_text('Export unencrypted').wait_for_invisibility_of_element(40)
         file_base_64 = self.driver.pull_file('%s/export.db' % get_app_path())
-        try:
-            with open(full_path_to_file, "wb") as f:
-                f.write(base64.b64decode(file_base_64))
-        except Exception as e:
-            print(str(e))
+        # write errors are raised, so snapshot is not saved to manifest without DB
+        with open(full_path_to_file, "wb") as f:
+            f.write(base64.b64decode(file_base_64))
         self.driver.info('## Exporting database is finished!', device=False)
 
+    def restore_snapshot(self, name, password=common_password):
+        # account state from views/dbs/recipes.py, snapshot is (re)generated by this run if it's stale
+        snapshots = AccountSnapshots(build=test_suite_data.apk_name)
+        recipe = recipes[name]
+        seed_phrase = get_persona(recipe.user)['passphrase']
+        if snapshots.is_fresh(recipe):
+            return self.import_db(seed_phrase, snapshots.get_folder(name), password)
+        self.driver.info("## Snapshot '%s' is stale, generating it" % name, device=False)
+        self.generate_snapshot(snapshots, recipe, password)
+        return self.sign_in(password)
+
+    def generate_snapshot(self, snapshots: AccountSnapshots, recipe: SnapshotRecipe, password=common_password):
+        def prepare(home):
+            for step, kwargs in recipe.steps:
+                step(home, **kwargs)
+
+        snapshots.prepare(recipe.name)
+        self.export_db(get_persona(recipe.user)['passphrase'], snapshots.get_db_path(recipe.name), password, prepare)
+        snapshots.save(recipe)
+
     def get_user(self, username):
         self.driver.info("Getting username card by '%s'" % username)
         expected_element = UserProfileElement(self.driver, username)
         return expected_element if expected_element.is_element_displayed(10) else self.driver.fail("User is not found!")
+
+
+def onboard_devices(sign_in_views, users=None, get_public_keys=False, timeout=900):
+    """
+    Creates (or recovers, if user has `passphrase`) multiaccounts on all devices concurrently,
+    so group setup takes as long as the slowest device instead of the sum. `users` are kwargs of
+    create_user/recover_access per device; onboarding duration of every device is logged and
+    added to driver metrics as `onboarding`.
+
+    usage:
+
+    self.homes, self.public_keys = onboard_devices(
+        self.sign_in_views, [{'username': 'admin'}, {'passphrase': user['passphrase']}], get_public_keys=True)
+
+    """
+    users = users if users else [dict() for _ in sign_in_views]
+    users_by_view = {id(sign_in): user for sign_in, user in zip(sign_in_views, users)}
+
+    def onboard(sign_in):
+        user = dict(users_by_view[id(sign_in)])
+        start_time = time.time()
+        if 'passphrase' in user:
+            home = sign_in.recover_access(**user)
+        else:
+            home = sign_in.create_user(**user)
+        public_key = home.get_public_key() if get_public_keys else None
+        duration = time.time() - start_time
+        sign_in.driver.info("Onboarding is finished in %s seconds" % round(duration))
+        driver_metrics.record('onboarding', sign_in.driver.device_number, duration)
+        return home, public_key
+
+    start_time = time.time()
+    results = for_each_device(onboard, sign_in_views, timeout=timeout, name='onboarding')
+    sign_in_views[0].driver.info("Onboarding of %s devices took %s seconds" % (
+        len(sign_in_views), round(time.time() - start_time)), device=False)
+    return [home for home, _ in results], [public_key for _, public_key in results]
@@ -1,4 +1,4 @@
-import time
+from selenium.common.exceptions import TimeoutException
 
 from views.base_element import EditBox, Button, BaseElement
 from views.base_view import BaseView
@@ -44,11 +44,10 @@ class BaseWebView(BaseView):
 
     def wait_for_d_aap_to_load(self, wait_time=35):
         self.driver.info("Waiting %ss for dapp to load" % wait_time)
-        counter = 0
-        while self.progress_bar_icon.is_element_displayed(5):
-            time.sleep(1)
-            counter += 1
-            if counter > wait_time:
+        if self.progress_bar_icon.is_element_displayed(5):
+            try:
+                self.progress_bar_icon.wait_for_absence_of_element(wait_time)
+            except TimeoutException:
                 self.driver.fail("Page is not loaded during %s seconds" % wait_time)
 
     def open_in_webview(self):